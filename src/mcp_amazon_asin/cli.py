@@ -1,27 +1,24 @@
 #!/usr/bin/env python3
 """
 CLI for local testing of Amazon ASIN utilities
+
+Scraping engines are imported inside the commands that use them, so the CLI
+starts without loading Playwright or aiohttp.
 """
 
 import asyncio
 import inspect
 import json
 import logging
-import os
 import sys
 
 import click
 
-from .utils.dp import extract_dp
-from .utils.prompt import chat_with_gemini
-from .utils.search import (
-    extract_refinements,
-    extract_search_asin,
-    extract_themed_products,
-    get_seller_recommendations,
-)
-from .utils.setup import setup_playwright
-from .utils.utils import load_prompt_template, save_to_temp_file
+from .utils import DP_ENGINES
+from .utils.lifecycle import shutdown_resources
+
+# What each line of `batch` input is
+BATCH_KINDS = ("product", "search", "refinements")
 
 
 @click.group()
@@ -41,7 +38,19 @@ def cli(log_level):
         level=numeric_level,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
-    setup_playwright()
+
+
+@cli.command("install-browser")
+def install_browser():
+    """Download the Chromium build used for scraping, if it is missing"""
+    from .utils.setup import setup_playwright
+
+    try:
+        setup_playwright()
+        click.echo("Chromium is installed.")
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
 
 
 @cli.command()
@@ -51,14 +60,22 @@ def cli(log_level):
     default="cache",
     help="Cache folder for JSON data (use 'none' to disable)",
 )
-async def product(asin: str, cache_folder: str):
+@click.option(
+    "--engine",
+    type=click.Choice(DP_ENGINES),
+    default="auto",
+    help="Scraping engine: plain HTTP, headless browser, or HTTP with browser fallback",
+)
+async def product(asin: str, cache_folder: str, engine: str):
     """Get product information by ASIN"""
+    from .utils.dp import extract_dp
+
     try:
         # Convert 'none' string to None to disable caching
         cache_param = (
             None if cache_folder and cache_folder.lower() == "none" else cache_folder
         )
-        result = await extract_dp(asin, cache_folder=cache_param)
+        result = await extract_dp(asin, cache_folder=cache_param, engine=engine)
         # Always output as JSON
         click.echo(json.dumps(result, indent=2, ensure_ascii=False))
     except Exception as e:
@@ -74,14 +91,21 @@ async def product(asin: str, cache_folder: str):
     default="cache",
     help="Cache folder for JSON data (use 'none' to disable)",
 )
-async def search(query: str, limit: int, cache_folder: str):
+@click.option(
+    "--screenshots/--no-screenshots",
+    default=False,
+    help="Save a PNG of every result card to the cache folder",
+)
+async def search(query: str, limit: int, cache_folder: str, screenshots: bool):
     """Search Amazon products"""
+    from .utils.search import extract_search_asin
+
     try:
         # Convert 'none' string to None to disable caching
         cache_param = (
             None if cache_folder and cache_folder.lower() == "none" else cache_folder
         )
-        results = await extract_search_asin(query, limit, cache_param)
+        results = await extract_search_asin(query, limit, cache_param, screenshots)
         # Always output as JSON
         click.echo(json.dumps(results, indent=2, ensure_ascii=False))
     except Exception as e:
@@ -93,20 +117,34 @@ async def search(query: str, limit: int, cache_folder: str):
 @click.argument("query")
 @click.option("--limit", default=50, help="Number of products to fetch details for")
 @click.option(
+    "--concurrency",
     "--batch-size",
+    "concurrency",
     default=10,
-    help="Number of products to process in parallel per batch",
+    help="Maximum number of product pages fetched at the same time",
+)
+@click.option(
+    "--rate-limit",
+    type=float,
+    default=None,
+    help="Maximum requests per second to Amazon (default: no limit)",
 )
 @click.option(
     "--cache-folder",
     default="cache",
     help="Cache folder for JSON data (use 'none' to disable)",
 )
-async def theme(query: str, limit: int, batch_size: int, cache_folder: str):
+async def theme(
+    query: str, limit: int, concurrency: int, rate_limit: float | None, cache_folder: str
+):
     """Get themed product recommendations"""
+    from .utils.search import extract_themed_products
+
     try:
         # Call the extract_themed_products function from search.py
-        products = await extract_themed_products(query, limit, batch_size, cache_folder)
+        products = await extract_themed_products(
+            query, limit, concurrency, cache_folder, rate_limit
+        )
 
         # Output the list of detailed products
         click.echo(json.dumps(products, indent=2, ensure_ascii=False))
@@ -124,12 +162,14 @@ async def theme(query: str, limit: int, batch_size: int, cache_folder: str):
 )
 async def refinements(query: str, cache_folder: str):
     """Get available refinement categories for search query"""
+    from .utils.search import extract_refinements
+
     try:
         # Convert 'none' string to None to disable caching
         cache_param = (
             None if cache_folder and cache_folder.lower() == "none" else cache_folder
         )
-        categories = await extract_refinements(query)
+        categories = await extract_refinements(query, cache_param)
         # Always output as JSON
         click.echo(json.dumps(categories, indent=2, ensure_ascii=False))
     except Exception as e:
@@ -141,7 +181,17 @@ async def refinements(query: str, cache_folder: str):
 @click.argument("query")
 @click.option("--product-limit", default=10, help="Number of products to analyze")
 @click.option(
-    "--batch-size", default=5, help="Number of products to process in parallel"
+    "--concurrency",
+    "--batch-size",
+    "concurrency",
+    default=5,
+    help="Maximum number of product pages fetched at the same time",
+)
+@click.option(
+    "--rate-limit",
+    type=float,
+    default=None,
+    help="Maximum requests per second to Amazon (default: no limit)",
 )
 @click.option(
     "--cache-folder",
@@ -149,9 +199,15 @@ async def refinements(query: str, cache_folder: str):
     help="Cache folder for JSON data (use 'none' to disable)",
 )
 async def seller_recommendation(
-    query: str, product_limit: int, batch_size: int, cache_folder: str
+    query: str,
+    product_limit: int,
+    concurrency: int,
+    rate_limit: float | None,
+    cache_folder: str,
 ):
     """Get seller recommendations based on the query"""
+    from .utils.search import get_seller_recommendations
+
     try:
         # Convert 'none' string to None to disable caching
         cache_param = (
@@ -160,7 +216,9 @@ async def seller_recommendation(
         
         # Get seller recommendations using the function from search.py
         click.echo("Generating seller recommendations...", err=True)
-        result = await get_seller_recommendations(query, product_limit, batch_size, cache_param)
+        result = await get_seller_recommendations(
+            query, product_limit, concurrency, cache_param, rate_limit
+        )
         
         # Display the results
         click.echo("\nSeller Recommendations:")
@@ -171,6 +229,261 @@ async def seller_recommendation(
         sys.exit(1)
 
 
+def _read_batch_items(input_file) -> list[str]:
+    """Distinct non-empty lines of a batch input, skipping `#` comments"""
+    items = (line.strip() for line in input_file)
+    return list(dict.fromkeys(item for item in items if item and not item.startswith("#")))
+
+
+@cli.command()
+@click.argument("input_file", metavar="[FILE]", type=click.File("r", encoding="utf-8"), default="-")
+@click.option(
+    "--kind",
+    type=click.Choice(BATCH_KINDS),
+    default="product",
+    help="What each input line is: an ASIN (product) or a query (search, refinements)",
+)
+@click.option(
+    "--concurrency",
+    default=8,
+    help="Maximum number of items processed at the same time",
+)
+@click.option(
+    "--rate-limit",
+    type=float,
+    default=None,
+    help="Maximum page requests per second to Amazon (default: no limit)",
+)
+@click.option("--limit", default=100, help="Number of results per search query")
+@click.option(
+    "--engine",
+    type=click.Choice(DP_ENGINES),
+    default="auto",
+    help="Scraping engine for product pages",
+)
+@click.option(
+    "--cache-folder",
+    default="cache",
+    help="Cache folder for JSON data (use 'none' to disable)",
+)
+async def batch(
+    input_file,
+    kind: str,
+    concurrency: int,
+    rate_limit: float | None,
+    limit: int,
+    engine: str,
+    cache_folder: str,
+):
+    """Process ASINs or queries read from FILE (or stdin), one per line
+
+    Every item runs on one event loop with a shared browser pool, HTTP session
+    and cache. One JSON object per item is printed as soon as it completes.
+    Exits with status 1 if any item failed.
+    """
+    items = _read_batch_items(input_file)
+    # Convert 'none' string to None to disable caching
+    cache_param = None if cache_folder and cache_folder.lower() == "none" else cache_folder
+    processed = len(items)
+    failures = 0
+
+    if kind == "product":
+        from .utils.dp import extract_dp_many
+
+        async def emit_product(completed, total, message, entry):
+            click.echo(json.dumps(entry, ensure_ascii=False))
+
+        entries = await extract_dp_many(
+            items, concurrency, cache_folder, engine, rate_limit, emit_product
+        )
+        # ASINs are de-duplicated case-insensitively
+        processed = len(entries)
+        failures = sum("error" in entry for entry in entries)
+    else:
+        from .utils.scheduler import HostRateLimiter, run_concurrently
+        from .utils.search import extract_refinements, extract_search_asin
+
+        # Every query's page loads share one limiter
+        rate_limiter = HostRateLimiter(rate_limit)
+
+        async def run_query(query: str):
+            if kind == "search":
+                return await extract_search_asin(query, limit, cache_param, rate_limit=rate_limiter)
+            return await extract_refinements(query, cache_param, rate_limiter)
+
+        async for job in run_concurrently(items, run_query, concurrency):
+            if job.error is not None:
+                failures += 1
+                entry = {"query": job.item, "error": str(job.error)}
+            else:
+                entry = {"query": job.item, kind: job.result}
+            click.echo(json.dumps(entry, ensure_ascii=False))
+
+    click.echo(f"Processed {processed} items, {failures} failed", err=True)
+    if failures:
+        sys.exit(1)
+
+
+@cli.group()
+def cache():
+    """Maintain the persistent cache"""
+
+
+@cache.command()
+@click.option("--cache-folder", default="cache", help="Cache folder to migrate")
+def migrate(cache_folder: str):
+    """Import legacy one-JSON-file-per-ASIN cache files into the cache store"""
+    from .utils.cache import close_cache_backends, migrate_cache
+
+    try:
+        count = migrate_cache(cache_folder)
+        click.echo(f"Imported {count} entries into {cache_folder}")
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    finally:
+        close_cache_backends()
+
+
+@cache.command()
+@click.option("--cache-folder", default="cache", help="Cache folder to compact")
+def compact(cache_folder: str):
+    """Remove expired entries and reclaim disk space"""
+    from .utils.cache import close_cache_backends, compact_cache
+
+    try:
+        removed = compact_cache(cache_folder)
+        click.echo(f"Removed {removed} expired entries from {cache_folder}")
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    finally:
+        close_cache_backends()
+
+
+@cli.group()
+def queue():
+    """Distribute scrape jobs to worker processes through a shared job queue"""
+
+
+def _open_queue(cache_folder: str, queue_path: str | None):
+    """Open the job queue, which only makes sense together with a shared cache"""
+    from .utils.jobqueue import open_job_queue
+
+    if not cache_folder or cache_folder.lower() == "none":
+        raise click.UsageError("Queued jobs write their results to the cache folder")
+    return open_job_queue(cache_folder, queue_path)
+
+
+@queue.command()
+@click.argument("input_file", metavar="[FILE]", type=click.File("r", encoding="utf-8"), default="-")
+@click.option(
+    "--kind",
+    type=click.Choice(("product", "search")),
+    default="product",
+    help="What each input line is: an ASIN (product) or a search query (search)",
+)
+@click.option("--limit", default=100, help="Number of results per search query")
+@click.option("--cache-folder", default="cache", help="Shared cache folder the workers fill")
+@click.option(
+    "--queue",
+    "queue_path",
+    default=None,
+    help="Job queue file shared by all workers (default: jobs.sqlite3 in the cache folder)",
+)
+def enqueue(input_file, kind: str, limit: int, cache_folder: str, queue_path: str | None):
+    """Queue one job per ASIN or query read from FILE (or stdin)"""
+    from .utils.worker import enqueue_jobs
+
+    job_queue = _open_queue(cache_folder, queue_path)
+    try:
+        created, skipped = enqueue_jobs(job_queue, kind, _read_batch_items(input_file), limit)
+        click.echo(f"Queued {created} jobs, {skipped} already pending")
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    finally:
+        job_queue.close()
+
+
+@queue.command()
+@click.option("--processes", default=1, help="Number of worker processes to start")
+@click.option("--concurrency", default=4, help="Maximum number of jobs in flight per process")
+@click.option(
+    "--rate-limit",
+    type=float,
+    default=None,
+    help="Maximum requests per second to Amazon per process (default: no limit)",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(DP_ENGINES),
+    default="auto",
+    help="Scraping engine for product pages",
+)
+@click.option("--drain", is_flag=True, help="Exit once no job is left instead of waiting for more")
+@click.option("--cache-folder", default="cache", help="Shared cache folder results are written to")
+@click.option(
+    "--queue",
+    "queue_path",
+    default=None,
+    help="Job queue file shared by all workers (default: jobs.sqlite3 in the cache folder)",
+)
+def worker(
+    processes: int,
+    concurrency: int,
+    rate_limit: float | None,
+    engine: str,
+    drain: bool,
+    cache_folder: str,
+    queue_path: str | None,
+):
+    """Process queued jobs, writing the results to the shared cache"""
+    from .utils.jobqueue import job_queue_path
+    from .utils.worker import run_worker_processes
+
+    # Create the queue file before several workers open it at once
+    _open_queue(cache_folder, queue_path).close()
+    try:
+        stats = run_worker_processes(
+            processes,
+            job_queue_path(cache_folder, queue_path),
+            cache_folder,
+            concurrency=concurrency,
+            engine=engine,
+            rate_limit=rate_limit,
+            drain=drain,
+        )
+        click.echo(f"Finished {stats['done']} jobs, {stats['errors']} failed attempts", err=True)
+    except KeyboardInterrupt:
+        click.echo("Stopped; unfinished jobs are retried once their leases expire", err=True)
+
+
+@queue.command()
+@click.option("--cache-folder", default="cache", help="Shared cache folder the workers fill")
+@click.option(
+    "--queue",
+    "queue_path",
+    default=None,
+    help="Job queue file shared by all workers (default: jobs.sqlite3 in the cache folder)",
+)
+def status(cache_folder: str, queue_path: str | None):
+    """Show the number of jobs in each state"""
+    job_queue = _open_queue(cache_folder, queue_path)
+    try:
+        click.echo(json.dumps(job_queue.counts(), indent=2))
+    finally:
+        job_queue.close()
+
+
+async def _run_and_shutdown(callback, *args, **kwargs):
+    """Run an async command, then close the shared browser pool, HTTP clients and cache"""
+    try:
+        return await callback(*args, **kwargs)
+    finally:
+        await shutdown_resources()
+
+
 def main():
     # Convert async commands to sync
     for _, cmd in cli.commands.items():
@@ -178,7 +491,7 @@ def main():
             original_callback = cmd.callback
             cmd.callback = (
                 lambda *args, callback=original_callback, **kwargs: asyncio.run(
-                    callback(*args, **kwargs)
+                    _run_and_shutdown(callback, *args, **kwargs)
                 )
             )
 
@@ -17,6 +17,7 @@ pyproject.toml file).
 """
 
 import os
+from typing import NamedTuple
 
 from dotenv import load_dotenv
 
@@ -69,3 +70,119 @@ def get_gemini_model() -> str:
     """
     load_dotenv(DEFAULT_ENV_FILE)
     return os.getenv("GEMINI_MODEL", "gemini-pro")
+
+
+class GeminiConfig(NamedTuple):
+    """Everything needed to call the Gemini API"""
+
+    api_key: str
+    api_url: str
+    model: str
+
+
+def load_gemini_config() -> GeminiConfig:
+    """
+    Load the Gemini API key, URL and model with a single read of the .env file.
+
+    Returns:
+        The Gemini settings, with the same defaults as the individual getters
+
+    Raises:
+        ValueError: If the API key is not found in environment variables
+    """
+    load_dotenv(DEFAULT_ENV_FILE)
+    api_key = os.getenv("GEMINI_API_KEY")
+
+    if not api_key or api_key == "your_api_key_here":
+        raise ValueError(
+            "Gemini API key not found. Please set the GEMINI_API_KEY "
+            "environment variable in your .env file."
+        )
+
+    return GeminiConfig(
+        api_key=api_key,
+        api_url=os.getenv("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1beta"),
+        model=os.getenv("GEMINI_MODEL", "gemini-pro"),
+    )
+
+
+def get_browser_pool_size() -> int:
+    """
+    Get the number of warm Chromium instances kept by the browser pool.
+
+    Returns:
+        The pool size as an integer, defaults to 2 if not set
+    """
+    load_dotenv(DEFAULT_ENV_FILE)
+    return int(os.getenv("BROWSER_POOL_SIZE", "2"))
+
+
+def get_browser_max_pages() -> int:
+    """
+    Get the number of pages a pooled browser serves before it is recycled.
+
+    Returns:
+        The page limit as an integer, defaults to 50 if not set
+    """
+    load_dotenv(DEFAULT_ENV_FILE)
+    return int(os.getenv("BROWSER_MAX_PAGES", "50"))
+
+
+def get_blocking_profile() -> str:
+    """
+    Get the request blocking profile applied to scraping pages.
+
+    Returns:
+        "off", "light" (images, fonts, media, ads and trackers) or "strict"
+        (also stylesheets), defaults to "light" if not set
+    """
+    load_dotenv(DEFAULT_ENV_FILE)
+    return os.getenv("BLOCKING_PROFILE", "light").lower()
+
+
+def get_cache_backend() -> str:
+    """
+    Get the name of the persistent cache backend.
+
+    Returns:
+        "sqlite" (single file per cache folder) or "json" (one file per key),
+        defaults to "sqlite" if not set
+    """
+    load_dotenv(DEFAULT_ENV_FILE)
+    return os.getenv("CACHE_BACKEND", "sqlite").lower()
+
+
+def get_search_cache_sort_tokens() -> bool:
+    """
+    Whether cached search results are shared between queries that only differ
+    in word order.
+
+    Returns:
+        True if SEARCH_CACHE_SORT_TOKENS is set to a true value, defaults to False
+    """
+    load_dotenv(DEFAULT_ENV_FILE)
+    return os.getenv("SEARCH_CACHE_SORT_TOKENS", "false").lower() in ("1", "true", "yes")
+
+
+def get_max_concurrent_tool_calls() -> int:
+    """
+    Get the number of tool calls the MCP server works on at the same time,
+    across all connected clients.
+
+    Returns:
+        The limit as an integer, defaults to 16 if not set
+    """
+    load_dotenv(DEFAULT_ENV_FILE)
+    return int(os.getenv("MAX_CONCURRENT_TOOL_CALLS", "16"))
+
+
+def get_amazon_rate_limit() -> float | None:
+    """
+    Get the request rate to Amazon shared by all tool calls of the MCP server.
+
+    Returns:
+        Requests per second per host, or None (no limit) if AMAZON_RATE_LIMIT is not set
+    """
+    load_dotenv(DEFAULT_ENV_FILE)
+    value = os.getenv("AMAZON_RATE_LIMIT")
+    return float(value) if value else None
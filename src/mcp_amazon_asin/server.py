@@ -3,10 +3,20 @@
 Amazon ASIN MCP Server
 
 This server provides tools to fetch product information from Amazon using ASIN.
+The scraping engines are imported when a tool first needs them, so the server
+can answer the MCP handshake and list_tools without loading Playwright or aiohttp.
+
+It serves one client over stdin/stdout by default, or many clients at once over
+streamable HTTP (`--transport http`). All clients share the browser pool, caches
+and Amazon rate limit, and admission control bounds the tool calls in flight.
 """
 
+import argparse
 import asyncio
+import contextlib
+import importlib
 import json
+import logging
 from typing import Any
 
 import mcp.types as types
@@ -15,10 +25,32 @@ from mcp.server.models import InitializationOptions
 import mcp.server.stdio
 from pydantic import BaseModel, Field
 
+from . import config
+from .utils.lifecycle import shutdown_resources
+from .utils.scheduler import AdmissionLimiter, HostRateLimiter, ProgressCallback
+from .utils.setup import chromium_installed
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of ASINs accepted by get_products_from_asins
+MAX_BATCH_ASINS = 50
+
+# Product pages fetched at the same time for get_products_from_asins
+BATCH_CONCURRENCY = 8
 
-from .utils.setup import setup_playwright
-from .utils.search import extract_search_asin, get_seller_recommendations
-from .utils.dp import extract_dp
+# How long a tool call waits for a free slot before it is rejected as busy
+ADMISSION_TIMEOUT_SECONDS = 120
+
+# Where the streamable HTTP transport is served
+HTTP_ENDPOINT_PATH = "/mcp"
+
+# Fields of a partial result (or of its "product") repeated in progress messages
+PROGRESS_PARTIAL_FIELDS = ("asin", "title", "price", "rating", "error", "categories")
+
+# Longest partial result JSON appended to a progress message; longer ones are left out
+MAX_PROGRESS_PARTIAL_CHARS = 2000
 
 
 class ASINInput(BaseModel):
@@ -27,6 +59,17 @@ class ASINInput(BaseModel):
     asin: str = Field(..., description="Amazon Standard Identification Number (ASIN)")
 
 
+class BatchASINInput(BaseModel):
+    """Input for looking up several ASINs at once"""
+
+    asins: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_ASINS,
+        description="Amazon Standard Identification Numbers (ASINs)",
+    )
+
+
 class SearchInput(BaseModel):
     """Input for Amazon product search"""
 
@@ -36,6 +79,28 @@ class SearchInput(BaseModel):
 # Create server instance
 server: Server = Server("mcp-amazon-product")
 
+# Shared by every client; created from the .env settings on first use
+_admission: AdmissionLimiter | None = None
+_rate_limiter: HostRateLimiter | None = None
+
+
+def _get_admission() -> AdmissionLimiter:
+    """Return the limiter bounding tool calls in flight across all clients"""
+    global _admission
+    if _admission is None:
+        _admission = AdmissionLimiter(
+            config.get_max_concurrent_tool_calls(), ADMISSION_TIMEOUT_SECONDS
+        )
+    return _admission
+
+
+def _get_rate_limiter() -> HostRateLimiter:
+    """Return the Amazon rate limiter shared by all tool calls"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = HostRateLimiter(config.get_amazon_rate_limit())
+    return _rate_limiter
+
 
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
@@ -55,6 +120,23 @@ async def handle_list_tools() -> list[types.Tool]:
                 "required": ["asin"],
             },
         ),
+        types.Tool(
+            name="get_products_from_asins",
+            description="Get product information from Amazon for several ASINs in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "asins": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "minItems": 1,
+                        "maxItems": MAX_BATCH_ASINS,
+                        "description": "Amazon Standard Identification Numbers (ASINs) to look up",
+                    }
+                },
+                "required": ["asins"],
+            },
+        ),
         types.Tool(
             name="search_amazon",
             description="Search for products on Amazon and get a list of ASINs",
@@ -86,21 +168,9 @@ async def handle_list_tools() -> list[types.Tool]:
     ]
 
 
-@server.call_tool()
-async def handle_call_tool(
-    name: str, arguments: dict[str, Any] | None
-) -> list[types.TextContent]:
-    """Handle tool calls"""
-    if not arguments:
-        raise ValueError("Missing arguments")
-
-    if name == "get_product_info_from_asin":
-        try:
-            asin_input = ASINInput(**arguments)
-            product_data = await extract_dp(asin_input.asin)
-
-            # Format the response
-            response = f"""**Product Information for ASIN: {product_data['asin']}**
+def _format_product(product_data: dict[str, Any]) -> str:
+    """Format product details as the markdown returned by the product tools"""
+    response = f"""**Product Information for ASIN: {product_data['asin']}**
 
 **Title:** {product_data['title'] or 'Not available'}
 
@@ -119,14 +189,77 @@ async def handle_call_tool(
 **Key Features:**
 """
 
-            if product_data["features"]:
-                for feature in product_data["features"]:
-                    response += f"• {feature}\n"
-            else:
-                response += "No features available\n"
+    if product_data["features"]:
+        for feature in product_data["features"]:
+            response += f"• {feature}\n"
+    else:
+        response += "No features available\n"
+
+    if product_data["image"]:
+        response += f"\n**Product Image:** {product_data['image']}"
+
+    return response
+
 
-            if product_data["image"]:
-                response += f"\n**Product Image:** {product_data['image']}"
+def _progress_callback() -> ProgressCallback | None:
+    """
+    Forward pipeline progress of the current tool call as MCP progress notifications.
+
+    The first line of each message describes the step. When the step has a partial
+    result, a second line carries a compact JSON summary of it, capped at
+    MAX_PROGRESS_PARTIAL_CHARS; the full records arrive in the tool result.
+
+    Returns:
+        A callback, or None if the client did not ask for progress
+    """
+    ctx = server.request_context
+    progress_token = ctx.meta.progressToken if ctx.meta else None
+    if progress_token is None:
+        return None
+
+    async def report(completed: int, total: int | None, message: str, partial: Any) -> None:
+        summary = _summarize_partial(partial)
+        text = message if summary is None else f"{message}\n{summary}"
+        await ctx.session.send_progress_notification(
+            progress_token, completed, total, text, related_request_id=str(ctx.request_id)
+        )
+        logger.debug(f"Progress {completed}/{total}: {message}")
+
+    return report
+
+
+def _summarize_partial(partial: Any) -> str | None:
+    """Compact JSON of the identifying fields of a partial result, or None if too large"""
+    if partial is None:
+        return None
+    if isinstance(partial, dict):
+        fields = {**partial, **(partial.get("product") or {})}
+        partial = {key: fields[key] for key in PROGRESS_PARTIAL_FIELDS if key in fields}
+    text = json.dumps(partial, ensure_ascii=False, separators=(",", ":"))
+    return text if len(text) <= MAX_PROGRESS_PARTIAL_CHARS else None
+
+
+@server.call_tool()
+async def handle_call_tool(
+    name: str, arguments: dict[str, Any] | None
+) -> list[types.TextContent]:
+    """Handle tool calls, holding an admission slot while the tool runs"""
+    async with _get_admission().slot():
+        return await _call_tool(name, arguments)
+
+
+async def _call_tool(name: str, arguments: dict[str, Any] | None) -> list[types.TextContent]:
+    if not arguments:
+        raise ValueError("Missing arguments")
+
+    if name == "get_product_info_from_asin":
+        try:
+            from .utils.dp import extract_dp
+
+            asin_input = ASINInput(**arguments)
+            product_data = await extract_dp(asin_input.asin, rate_limiter=_get_rate_limiter())
+
+            response = _format_product(product_data)
 
             return [types.TextContent(type="text", text=response)]
 
@@ -136,10 +269,45 @@ async def handle_call_tool(
                     type="text", text=f"Error fetching product information: {str(e)}"
                 )
             ]
+    elif name == "get_products_from_asins":
+        try:
+            from .utils.dp import extract_dp_many
+
+            batch_input = BatchASINInput(**arguments)
+            outcomes = await extract_dp_many(
+                batch_input.asins,
+                concurrency=BATCH_CONCURRENCY,
+                rate_limit=_get_rate_limiter(),
+                on_progress=_progress_callback(),
+            )
+
+            # One section per ASIN; failures are reported next to the successes
+            sections = []
+            for outcome in outcomes:
+                if "error" in outcome:
+                    sections.append(
+                        f"**Product Information for ASIN: {outcome['asin']}**\n\n"
+                        f"Error fetching product information: {outcome['error']}"
+                    )
+                else:
+                    sections.append(_format_product(outcome["product"]))
+            failed = sum(1 for outcome in outcomes if "error" in outcome)
+            summary = f"**Fetched {len(outcomes) - failed} of {len(outcomes)} products.**"
+            return [types.TextContent(type="text", text="\n\n---\n\n".join([summary, *sections]))]
+        except Exception as e:
+            return [
+                types.TextContent(
+                    type="text", text=f"Error fetching product information: {str(e)}"
+                )
+            ]
     elif name == "search_amazon":
         try:
+            from .utils.search import extract_search_asin
+
             search_input = SearchInput(**arguments)
-            results = await extract_search_asin(search_input.query)
+            results = await extract_search_asin(
+                search_input.query, rate_limit=_get_rate_limiter()
+            )
 
             if not results:
                 return [
@@ -167,8 +335,14 @@ async def handle_call_tool(
             ]
     elif name == "get_recommendations":
         try:
+            from .utils.search import get_seller_recommendations
+
             search_input = SearchInput(**arguments)
-            results = await get_seller_recommendations(search_input.query)
+            results = await get_seller_recommendations(
+                search_input.query,
+                rate_limit=_get_rate_limiter(),
+                on_progress=_progress_callback(),
+            )
 
             if not results:
                 return [
@@ -189,25 +363,131 @@ async def handle_call_tool(
         raise ValueError(f"Unknown tool: {name}")
 
 
-async def main():
-    """Main entry point"""
-    # Run the server using stdin/stdout streams
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="mcp-amazon-product",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
-                ),
-            ),
+async def _prewarm() -> None:
+    """Load the engines, launch the first browser and set up the Gemini client"""
+    # Import in a worker thread so the event loop keeps serving the handshake
+    for module in ("mcp_amazon_asin.utils.search", "mcp_amazon_asin.utils.prompt"):
+        await asyncio.to_thread(importlib.import_module, module)
+    from .utils.browser import get_browser_pool
+    from .utils.prompt import get_gemini_client
+
+    # Load the Gemini settings once; recommendations then reuse the client's connections
+    try:
+        get_gemini_client()
+    except ValueError as e:
+        logger.debug(f"Gemini client not configured, recommendations are unavailable: {e}")
+
+    if not chromium_installed():
+        logger.warning(
+            "Chromium is not installed; pages that need a browser will fail. "
+            "Run 'amazon-asin-cli install-browser' once to install it."
         )
+        return
+    try:
+        await get_browser_pool().start()
+        logger.debug("Browser pool pre-warmed")
+    except Exception as e:
+        logger.warning(f"Could not pre-warm the browser pool: {e}")
+
+
+def _initialization_options() -> InitializationOptions:
+    return InitializationOptions(
+        server_name="mcp-amazon-product",
+        server_version="0.1.0",
+        capabilities=server.get_capabilities(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={},
+        ),
+    )
 
 
-if __name__ == "__main__":
-    setup_playwright()
+async def _serve_stdio() -> None:
+    """Serve a single client over stdin/stdout"""
+    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+        await server.run(read_stream, write_stream, _initialization_options())
+
+
+def create_http_app():
+    """
+    Build the ASGI app serving MCP over streamable HTTP at HTTP_ENDPOINT_PATH.
+
+    Every client gets its own MCP session; tool calls from all sessions run in
+    this process and share its engines.
+
+    Returns:
+        A Starlette application that runs the session manager during its lifespan
+        and closes the shared resources when it ends
+    """
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.routing import Mount
+
+    session_manager = StreamableHTTPSessionManager(app=server)
+
+    async def handle_streamable_http(scope, receive, send) -> None:
+        await session_manager.handle_request(scope, receive, send)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            yield
+        # uvicorn re-raises the stop signal once it has shut down, which cancels
+        # main() before its own cleanup could run
+        await shutdown_resources()
+
+    return Starlette(
+        routes=[Mount(HTTP_ENDPOINT_PATH, app=handle_streamable_http)],
+        lifespan=lifespan,
+    )
+
+
+async def _serve_http(host: str, port: int) -> None:
+    """Serve any number of clients over streamable HTTP until interrupted"""
+    import uvicorn
+
+    logger.info(f"Serving MCP over HTTP at http://{host}:{port}{HTTP_ENDPOINT_PATH}/")
+    http_server = uvicorn.Server(uvicorn.Config(create_http_app(), host=host, port=port))
+    await http_server.serve()
+
+
+async def main(transport: str = "stdio", host: str = "127.0.0.1", port: int = 8000):
+    """
+    Main entry point
+
+    Args:
+        transport: "stdio" for a single client, or "http" for many clients
+        host: Interface the HTTP transport listens on
+        port: Port the HTTP transport listens on
+    """
+    # Warm up in the background instead of delaying the MCP handshake
+    prewarm = asyncio.create_task(_prewarm())
+
+    try:
+        if transport == "http":
+            await _serve_http(host, port)
+        else:
+            await _serve_stdio()
+    finally:
+        # Close the shared browsers, HTTP clients and cache so nothing outlives the server
+        prewarm.cancel()
+        await asyncio.gather(prewarm, return_exceptions=True)
+        await shutdown_resources()
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Amazon ASIN MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=("stdio", "http"),
+        default="stdio",
+        help="Serve one client over stdin/stdout, or many clients over streamable HTTP",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="HTTP port to listen on")
+    return parser.parse_args(argv)
 
-    asyncio.run(main())
+
+if __name__ == "__main__":
+    args = _parse_args()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(main(args.transport, args.host, args.port))
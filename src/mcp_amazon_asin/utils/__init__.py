@@ -1,7 +1,33 @@
 from urllib.parse import quote_plus
 
-def get_amazon_search_page_url(query: str) -> str:
-    return f"https://www.amazon.com/s?k={quote_plus(query)}"
+# User agent sent with every request to avoid bot detection
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/91.0.4472.124 Safari/537.36"
+)
+
+# Supported detail page scraping engines (kept here so the CLI can list them
+# without importing the engines):
+# - "http": fetch the HTML without a browser and parse it statically
+# - "browser": render the page in pooled headless Chromium
+# - "auto": try "http" first and fall back to "browser" if required fields are missing
+DP_ENGINES = ("auto", "http", "browser")
+
+def normalize_query(query: str, sort_tokens: bool = False) -> str:
+    """
+    Canonical form of a search query: lowercase with collapsed whitespace.
+
+    With sort_tokens, word order is ignored too ("red shoes" == "shoes red").
+    """
+    tokens = query.lower().split()
+    if sort_tokens:
+        tokens.sort()
+    return " ".join(tokens)
+
+def get_amazon_search_page_url(query: str, page: int = 1) -> str:
+    url = f"https://www.amazon.com/s?k={quote_plus(query)}"
+    return f"{url}&page={page}" if page > 1 else url
 
 def get_amazon_detail_page_url(asin: str) -> str:
     return f"https://www.amazon.com/dp/{asin}"
@@ -0,0 +1,153 @@
+"""
+Request blocking profiles for scraping pages.
+
+The extractors only read text and attributes, so images, fonts, video, ad frames
+and third-party trackers are downloaded for nothing. A profile decides which
+requests a page aborts; every aborted request is counted per page together with
+an estimate of the bytes it would have transferred.
+"""
+
+import logging
+import re
+from typing import NamedTuple
+
+from playwright.async_api import BrowserContext, Request, Route
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Typical transfer size per blocked resource type, used to estimate bytes saved;
+# blocked requests never start, so their real size is unknown
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 30_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 60_000,
+    "script": 80_000,
+    "document": 50_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+# Ad, metrics and tracking endpoints that never carry product data
+TRACKER_URL_PATTERNS = (
+    r"amazon-adsystem\.com",
+    r"aax-[a-z-]+\.amazon",
+    r"fls-[a-z]+\.amazon\.com",
+    r"unagi(-[a-z]+)?\.amazon\.com",
+    r"/uedata",
+    r"/1/batch/1/OP/",
+    r"doubleclick\.net",
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+)
+
+
+class BlockingProfile(NamedTuple):
+    """Which requests a scraping page aborts"""
+
+    # Playwright resource types to abort (image, font, media, ...)
+    resource_types: frozenset[str]
+    # Abort requests whose URL matches any of these regular expressions
+    url_patterns: tuple[str, ...] = ()
+    # Abort documents loaded into iframes (ads, widgets); the main page always loads
+    block_subframes: bool = False
+
+    def blocks(self, request: Request) -> bool:
+        """Whether the request should be aborted under this profile"""
+        if request.resource_type in self.resource_types:
+            return True
+        if self.block_subframes and request.resource_type == "document":
+            try:
+                if request.frame.parent_frame is not None:
+                    return True
+            except Exception:
+                # Service worker requests have no frame
+                pass
+        return any(re.search(pattern, request.url) for pattern in self.url_patterns)
+
+
+BLOCKING_PROFILES = {
+    "off": BlockingProfile(frozenset()),
+    "light": BlockingProfile(
+        frozenset({"image", "media", "font"}), TRACKER_URL_PATTERNS, block_subframes=True
+    ),
+    "strict": BlockingProfile(
+        frozenset({"image", "media", "font", "stylesheet", "texttrack", "manifest", "websocket"}),
+        TRACKER_URL_PATTERNS,
+        block_subframes=True,
+    ),
+}
+
+# Totals over every page that used a profile
+_stats = {"pages": 0, "blocked_requests": 0, "estimated_bytes_saved": 0}
+_blocked_by_type: dict[str, int] = {}
+
+
+class PageBlockStats:
+    """Requests blocked for a single page"""
+
+    def __init__(self):
+        self.blocked_requests = 0
+        self.estimated_bytes_saved = 0
+        self.by_type: dict[str, int] = {}
+
+    def record(self, request: Request) -> None:
+        self.blocked_requests += 1
+        self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(
+            request.resource_type, DEFAULT_ESTIMATED_BYTES
+        )
+        self.by_type[request.resource_type] = self.by_type.get(request.resource_type, 0) + 1
+
+    def report(self) -> None:
+        """Log the page totals and add them to the process-wide stats"""
+        _stats["pages"] += 1
+        _stats["blocked_requests"] += self.blocked_requests
+        _stats["estimated_bytes_saved"] += self.estimated_bytes_saved
+        for resource_type, count in self.by_type.items():
+            _blocked_by_type[resource_type] = _blocked_by_type.get(resource_type, 0) + count
+        logger.debug(
+            f"Blocked {self.blocked_requests} requests on page "
+            f"(~{self.estimated_bytes_saved // 1024} KiB saved): {self.by_type}"
+        )
+
+
+async def install_blocking(context: BrowserContext, profile_name: str) -> PageBlockStats | None:
+    """
+    Abort the requests a profile blocks for every page of a context.
+
+    Args:
+        context: A freshly created BrowserContext
+        profile_name: Key into BLOCKING_PROFILES
+
+    Returns:
+        Stats collected for the context, or None if the profile blocks nothing
+    """
+    if profile_name not in BLOCKING_PROFILES:
+        raise ValueError(
+            f"Unknown blocking profile '{profile_name}'. Expected one of {tuple(BLOCKING_PROFILES)}."
+        )
+    profile = BLOCKING_PROFILES[profile_name]
+    if not profile.resource_types and not profile.url_patterns and not profile.block_subframes:
+        return None
+
+    stats = PageBlockStats()
+
+    async def handle(route: Route) -> None:
+        if profile.blocks(route.request):
+            stats.record(route.request)
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
+    return stats
+
+
+def get_blocking_stats() -> dict:
+    """
+    Return request blocking totals recorded so far.
+
+    Returns:
+        Pages, blocked requests, estimated bytes saved and blocked requests by type
+    """
+    return {**_stats, "by_type": dict(_blocked_by_type)}
@@ -0,0 +1,208 @@
+"""
+Process-wide pool of warm Chromium browsers.
+
+Launching Chromium takes seconds, so instead of starting a browser for every
+scrape the pool keeps a few instances alive for the lifetime of the process and
+hands out short-lived BrowserContexts from them. Browsers are health-checked on
+every checkout and recycled after serving a configurable number of pages.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+from mcp_amazon_asin import config
+from mcp_amazon_asin.utils import USER_AGENT
+from mcp_amazon_asin.utils.blocking import install_blocking
+from mcp_amazon_asin.utils.setup import chromium_installed
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class _PooledBrowser:
+    """Bookkeeping for a single browser owned by the pool"""
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.pages_served = 0
+        self.active_contexts = 0
+        self.retired = False
+
+    def is_healthy(self) -> bool:
+        return not self.retired and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Hands out BrowserContexts from a small set of long-lived Chromium instances.
+
+    Args:
+        size: Maximum number of Chromium instances kept alive
+        max_pages_per_browser: Recycle a browser after it has served this many pages
+        max_contexts_per_browser: Maximum concurrent contexts per browser; together
+            with ``size`` this caps memory under concurrent requests
+        headless: Whether to launch Chromium in headless mode
+        blocking_profile: Default request blocking profile for pages (see BLOCKING_PROFILES)
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages_per_browser: int = 50,
+        max_contexts_per_browser: int = 4,
+        headless: bool = True,
+        blocking_profile: str = "off",
+    ):
+        self.size = max(1, size)
+        self.max_pages_per_browser = max(1, max_pages_per_browser)
+        self.max_contexts_per_browser = max(1, max_contexts_per_browser)
+        self.headless = headless
+        self.blocking_profile = blocking_profile
+
+        self._playwright: Playwright | None = None
+        self._browsers: list[_PooledBrowser] = []
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(self.size * self.max_contexts_per_browser)
+        self._closed = False
+
+    async def start(self) -> None:
+        """Start the Playwright driver and launch the first browser"""
+        async with self._lock:
+            await self._ensure_playwright()
+            if not self._browsers:
+                self._browsers.append(await self._launch())
+
+    async def _ensure_playwright(self) -> Playwright:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def _launch(self) -> _PooledBrowser:
+        playwright = await self._ensure_playwright()
+        try:
+            browser = await playwright.chromium.launch(headless=self.headless)
+        except Exception as e:
+            if not chromium_installed():
+                raise RuntimeError(
+                    "Chromium is not installed. Run 'amazon-asin-cli install-browser' first."
+                ) from e
+            raise
+        logger.debug(f"Launched pooled browser ({len(self._browsers) + 1}/{self.size})")
+        return _PooledBrowser(browser)
+
+    async def _close_browser(self, pooled: _PooledBrowser) -> None:
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled browser: {e}")
+
+    async def _checkout(self) -> _PooledBrowser:
+        """Pick the least busy healthy browser, launching or replacing one if needed"""
+        async with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+
+            # Drop browsers that crashed or were disconnected
+            for pooled in [b for b in self._browsers if not b.browser.is_connected()]:
+                logger.debug("Dropping disconnected browser from pool")
+                self._browsers.remove(pooled)
+
+            healthy = [b for b in self._browsers if b.is_healthy()]
+            idle = [b for b in healthy if b.active_contexts < self.max_contexts_per_browser]
+
+            # Retired browsers still draining their contexts do not count against the size
+            if not idle and len(healthy) < self.size:
+                pooled = await self._launch()
+                self._browsers.append(pooled)
+            else:
+                pooled = min(idle or healthy, key=lambda b: b.active_contexts)
+
+            pooled.active_contexts += 1
+            pooled.pages_served += 1
+            if pooled.pages_served >= self.max_pages_per_browser:
+                # Stop handing this browser out; it is closed once its last context ends
+                logger.debug(f"Recycling browser after {pooled.pages_served} pages")
+                pooled.retired = True
+            return pooled
+
+    async def _checkin(self, pooled: _PooledBrowser) -> None:
+        async with self._lock:
+            pooled.active_contexts -= 1
+            should_close = pooled.retired and pooled.active_contexts == 0
+            if should_close and pooled in self._browsers:
+                self._browsers.remove(pooled)
+        if should_close:
+            await self._close_browser(pooled)
+
+    @asynccontextmanager
+    async def context(self, blocking_profile: str | None = None) -> AsyncIterator[BrowserContext]:
+        """
+        Borrow a fresh BrowserContext from one of the pooled browsers.
+
+        Args:
+            blocking_profile: Request blocking profile for the context's pages
+                (defaults to the pool's profile)
+        """
+        async with self._slots:
+            pooled = await self._checkout()
+            try:
+                context = await pooled.browser.new_context(user_agent=USER_AGENT)
+                block_stats = None
+                try:
+                    block_stats = await install_blocking(
+                        context, blocking_profile or self.blocking_profile
+                    )
+                    yield context
+                finally:
+                    await context.close()
+                    if block_stats is not None:
+                        block_stats.report()
+            finally:
+                await self._checkin(pooled)
+
+    @asynccontextmanager
+    async def page(self, blocking_profile: str | None = None) -> AsyncIterator[Page]:
+        """Borrow a new page in its own BrowserContext"""
+        async with self.context(blocking_profile) as context:
+            yield await context.new_page()
+
+    async def close(self) -> None:
+        """Close every browser and stop the Playwright driver"""
+        async with self._lock:
+            self._closed = True
+            browsers, self._browsers = self._browsers, []
+            playwright, self._playwright = self._playwright, None
+
+        for pooled in browsers:
+            await self._close_browser(pooled)
+        if playwright is not None:
+            await playwright.stop()
+        logger.debug("Browser pool closed")
+
+
+# Process-wide pool, created lazily on first use
+_pool: BrowserPool | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, creating it on first use"""
+    global _pool
+    if _pool is None or _pool._closed:
+        _pool = BrowserPool(
+            size=config.get_browser_pool_size(),
+            max_pages_per_browser=config.get_browser_max_pages(),
+            blocking_profile=config.get_blocking_profile(),
+        )
+    return _pool
+
+
+async def shutdown_browser_pool() -> None:
+    """Close the process-wide browser pool if it was ever started"""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
@@ -1,24 +1,228 @@
 """
 Cache utilities for storing and retrieving data.
+
+Lookups go through a bounded in-memory LRU tier first and fall back to the
+persistent backend of the cache folder (see cache_store.py), which by default is
+a single SQLite file.
 """
 
+import asyncio
 import json
 import logging
-import os
 import time
+from collections import OrderedDict
 from typing import Any
 
+from mcp_amazon_asin import config
+from mcp_amazon_asin.utils.cache_store import (
+    CACHE_BACKENDS,
+    CacheBackend,
+    JsonDirBackend,
+    migrate_json_dir,
+)
+
 # Configure logger
 logger = logging.getLogger(__name__)
 
 # Cache expiration time in seconds (24 hour)
 CACHE_EXPIRATION_SECONDS = 3600 * 24
 
+# Entries whose last write is older than this are removed by compact_cache (8 days),
+# which leaves room for records with longer per-field TTLs than the default
+CACHE_RETENTION_SECONDS = 3600 * 24 * 8
+
+# Bounds for the in-memory tier
+MEMORY_CACHE_MAX_ENTRIES = 2048
+MEMORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# How long the background writer waits to batch up concurrent saves
+WRITE_COALESCE_SECONDS = 0.05
+
+# How long a failed lookup is remembered before it is retried (1 minute)
+NEGATIVE_CACHE_SECONDS = 60
+
+
+class MemoryCache:
+    """
+    Bounded LRU cache evicting by entry count and approximate size in bytes.
+
+    Entries are JSON-compatible dicts; their size is the length of their JSON
+    encoding, which the disk tier computes anyway.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MEMORY_CACHE_MAX_ENTRIES,
+        max_bytes: int = MEMORY_CACHE_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Any, tuple[dict[str, Any], int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Any, data: dict[str, Any], size: int) -> None:
+        self.delete(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (data, size)
+        self.size_bytes += size
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key: Any) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[1]
+
+    def items(self) -> list[tuple[Any, dict[str, Any]]]:
+        """Snapshot of the (key, data) pairs, least recently used first"""
+        return [(key, data) for key, (data, _) in self._entries.items()]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+
+# Process-wide in-memory tier, keyed on (cache_folder, key)
+_memory_cache = MemoryCache()
+
+# Recent failures, keyed on (cache_folder, key): (expiry time, failure details)
+_failures: dict[tuple[str, str], tuple[float, dict[str, Any]]] = {}
+
+# Lookup counters reported by get_cache_stats()
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "negative_hits": 0}
+
+# Open persistent backends by cache folder
+_backends: dict[str, CacheBackend] = {}
+
+
+def get_cache_backend(cache_folder: str) -> CacheBackend:
+    """
+    Return the persistent backend for a cache folder, opening it on first use.
+
+    Args:
+        cache_folder: Folder where cache is stored
+
+    Returns:
+        The backend selected by the CACHE_BACKEND setting
+    """
+    backend = _backends.get(cache_folder)
+    if backend is None:
+        name = config.get_cache_backend()
+        if name not in CACHE_BACKENDS:
+            raise ValueError(
+                f"Unsupported cache backend '{name}'. Expected one of {list(CACHE_BACKENDS)}."
+            )
+        backend = _backends[cache_folder] = CACHE_BACKENDS[name](cache_folder)
+    return backend
+
+
+def close_cache_backends() -> None:
+    """Close every open persistent backend"""
+    for backend in _backends.values():
+        backend.close()
+    _backends.clear()
+
+
+def _is_valid(
+    key: str,
+    cached_data: dict[str, Any],
+    required_fields: list[str] | None,
+    max_age: int | None = None,
+) -> bool:
+    """Check that cached data has not expired and contains the required fields"""
+    # Check if timestamp exists and is within expiration period
+    if "timestamp" not in cached_data:
+        return False
+
+    age = int(time.time()) - cached_data["timestamp"]
+    if age > (CACHE_EXPIRATION_SECONDS if max_age is None else max_age):
+        logger.debug(f"Cache expired for {key} (age: {age} seconds)")
+        return False
+
+    # Validate all required fields are present if specified
+    if required_fields:
+        for field in required_fields:
+            if field not in cached_data or cached_data[field] is None:
+                logger.debug(f"Cache invalid for {key}: missing field {field}")
+                return False
+
+    logger.debug(f"Using cached data for {key} (age: {age} seconds)")
+    return True
+
+
+def _get_from_memory(
+    key: str, cache_folder: str, required_fields: list[str] | None, max_age: int | None
+) -> tuple[bool, dict[str, Any] | None]:
+    """
+    Look a key up in the in-memory tier and in writes not yet flushed to disk.
+
+    Returns:
+        (resolved, data); when resolved is False the persistent tier must be read
+    """
+    memory_key = (cache_folder, key)
+    cached_data = _memory_cache.get(memory_key)
+    if cached_data is None:
+        pending = _writer.pending(cache_folder, key) if _writer else None
+        if pending is None:
+            return False, None
+        cached_data = json.loads(pending)
+
+    if _is_valid(key, cached_data, required_fields, max_age):
+        _stats["memory_hits"] += 1
+        return True, dict(cached_data)
+    # Other processes (queue workers) may have written a fresher record to the
+    # shared store, so read it and replace the memory copy
+    return False, None
+
+
+def _accept_from_backend(
+    key: str,
+    cache_folder: str,
+    text: str | None,
+    required_fields: list[str] | None,
+    max_age: int | None,
+) -> dict[str, Any] | None:
+    """Validate text read from the persistent tier and promote it to memory"""
+    if text is None:
+        _stats["misses"] += 1
+        return None
+
+    try:
+        cached_data = json.loads(text)
+    except Exception as e:
+        logger.error(f"Error reading cache for {key}: {e!s}")
+        _stats["misses"] += 1
+        return None
+
+    # Keep the record in memory even if this caller finds it too old
+    _memory_cache.put((cache_folder, key), cached_data, len(text))
+    if not _is_valid(key, cached_data, required_fields, max_age):
+        _stats["misses"] += 1
+        return None
+
+    _stats["disk_hits"] += 1
+    return dict(cached_data)
+
 
 def get_from_cache(
     key: str,
     cache_folder: str,
     required_fields: list[str] | None = None,
+    max_age: int | None = None,
 ) -> dict[str, Any] | None:
     """
     Retrieve data from cache if it exists and is valid.
@@ -27,6 +231,7 @@ def get_from_cache(
         key: The cache key (e.g., ASIN)
         cache_folder: Folder where cache is stored
         required_fields: List of fields that must be present for cache to be valid
+        max_age: Maximum age in seconds (defaults to CACHE_EXPIRATION_SECONDS)
 
     Returns:
         The cached data if valid, None otherwise
@@ -34,44 +239,45 @@ def get_from_cache(
     if not cache_folder:
         return None
 
-    os.makedirs(cache_folder, exist_ok=True)
-    json_path = f"{cache_folder}/{key}.json"
+    resolved, cached_data = _get_from_memory(key, cache_folder, required_fields, max_age)
+    if resolved:
+        return cached_data
 
-    if not os.path.exists(json_path):
+    try:
+        text = get_cache_backend(cache_folder).get(key)
+    except Exception as e:
+        logger.error(f"Error reading cache for {key}: {e!s}")
+        _stats["misses"] += 1
         return None
+    return _accept_from_backend(key, cache_folder, text, required_fields, max_age)
 
-    try:
-        with open(json_path) as f:
-            cached_data = json.load(f)
-
-        # Check if timestamp exists and is within expiration period
-        if "timestamp" in cached_data:
-            cache_time = cached_data["timestamp"]
-            current_time = int(time.time())
-
-            if current_time - cache_time <= CACHE_EXPIRATION_SECONDS:
-                # Validate all required fields are present if specified
-                if required_fields:
-                    for field in required_fields:
-                        if field not in cached_data or cached_data[field] is None:
-                            logger.debug(
-                                f"Cache invalid for {key}: missing field {field}"
-                            )
-                            return None
-
-                logger.debug(
-                    f"Using cached data for {key} (age: {current_time - cache_time} seconds)"
-                )
-                return cached_data
-            else:
-                logger.debug(
-                    f"Cache expired for {key} (age: {current_time - cache_time} seconds)"
-                )
 
+async def aget_from_cache(
+    key: str,
+    cache_folder: str,
+    required_fields: list[str] | None = None,
+    max_age: int | None = None,
+) -> dict[str, Any] | None:
+    """
+    Async variant of get_from_cache that never blocks the event loop on disk I/O.
+
+    Memory hits return immediately; persistent reads run in a worker thread.
+    """
+    if not cache_folder:
+        return None
+
+    resolved, cached_data = _get_from_memory(key, cache_folder, required_fields, max_age)
+    if resolved:
+        return cached_data
+
+    try:
+        backend = get_cache_backend(cache_folder)
+        text = await asyncio.to_thread(backend.get, key)
     except Exception as e:
         logger.error(f"Error reading cache for {key}: {e!s}")
-
-    return None
+        _stats["misses"] += 1
+        return None
+    return _accept_from_backend(key, cache_folder, text, required_fields, max_age)
 
 
 def save_to_cache(
@@ -93,14 +299,247 @@ def save_to_cache(
     if not cache_folder:
         return False
 
-    os.makedirs(cache_folder, exist_ok=True)
-    json_path = f"{cache_folder}/{key}.json"
-
     try:
-        with open(json_path, "w") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        backend = get_cache_backend(cache_folder)
+        text = json.dumps(data, indent=backend.indent, ensure_ascii=False)
+        backend.set(key, text, int(data.get("timestamp", time.time())))
+        _memory_cache.put((cache_folder, key), dict(data), len(text))
+        _failures.pop((cache_folder, key), None)
         logger.debug(f"Saved {key} to cache")
         return True
     except Exception as e:
         logger.error(f"Error saving cache for {key}: {e!s}")
         return False
+
+
+class CacheWriter:
+    """
+    Background writer that coalesces saves and flushes them off the event loop.
+
+    Saves to the same key before a flush are merged, and each flush writes one
+    batch per cache folder from a worker thread. If the event loop ends first and
+    cancels the writer, the remaining saves are written synchronously. Failed
+    writes are raised from the next flush().
+    """
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self._pending: dict[tuple[str, str], tuple[str, int]] = {}
+        self._flushing: dict[tuple[str, str], tuple[str, int]] = {}
+        self._task: asyncio.Task | None = None
+        self._error: Exception | None = None
+
+    def pending(self, cache_folder: str, key: str) -> str | None:
+        """JSON text saved for key but not yet written to disk"""
+        entry = self._pending.get((cache_folder, key)) or self._flushing.get((cache_folder, key))
+        return entry[0] if entry else None
+
+    def submit(self, cache_folder: str, key: str, text: str, timestamp: int) -> None:
+        self._pending[(cache_folder, key)] = (text, timestamp)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    @staticmethod
+    def _batches(
+        entries: dict[tuple[str, str], tuple[str, int]],
+    ) -> dict[str, list[tuple[str, str, int]]]:
+        """Group entries into one (key, text, timestamp) batch per cache folder"""
+        batches: dict[str, list[tuple[str, str, int]]] = {}
+        for (cache_folder, key), (text, timestamp) in entries.items():
+            batches.setdefault(cache_folder, []).append((key, text, timestamp))
+        return batches
+
+    def _record_error(self, cache_folder: str, error: Exception) -> None:
+        logger.error(f"Error flushing cache to {cache_folder}: {error!s}")
+        self._error = self._error or error
+
+    async def _run(self) -> None:
+        try:
+            while self._pending:
+                # Give concurrent saves a moment to pile up into one batch
+                await asyncio.sleep(WRITE_COALESCE_SECONDS)
+                self._flushing, self._pending = self._pending, {}
+
+                for cache_folder, entries in self._batches(self._flushing).items():
+                    try:
+                        backend = get_cache_backend(cache_folder)
+                        await asyncio.to_thread(backend.set_many, entries)
+                        logger.debug(f"Flushed {len(entries)} cache entries to {cache_folder}")
+                    except Exception as e:
+                        self._record_error(cache_folder, e)
+                self._flushing = {}
+        except asyncio.CancelledError:
+            # The loop is ending (asyncio.run cancels leftover tasks); write what is left
+            self._write_remaining()
+            raise
+
+    def _write_remaining(self) -> None:
+        """Synchronously write the batch in progress and every queued save"""
+        remaining = {**self._flushing, **self._pending}
+        self._flushing, self._pending = {}, {}
+        for cache_folder, entries in self._batches(remaining).items():
+            try:
+                get_cache_backend(cache_folder).set_many(entries)
+                logger.debug(f"Wrote {len(entries)} cache entries to {cache_folder} on shutdown")
+            except Exception as e:
+                self._record_error(cache_folder, e)
+
+    async def flush(self) -> None:
+        """
+        Wait until every submitted save has been written.
+
+        Raises:
+            The first error a write has hit since the last flush
+        """
+        while self._task is not None and not self._task.done():
+            await asyncio.shield(self._task)
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+
+# Writer for the running event loop, created on first async save
+_writer: CacheWriter | None = None
+
+
+async def asave_to_cache(
+    key: str,
+    data: dict[str, Any],
+    cache_folder: str,
+) -> bool:
+    """
+    Async variant of save_to_cache that queues the disk write in the background.
+
+    The data is visible to lookups immediately; call flush_cache() before the
+    event loop ends to make sure it reached disk.
+
+    Returns:
+        True if the save was queued, False if caching is disabled or failed
+    """
+    global _writer
+    if not cache_folder:
+        return False
+
+    try:
+        backend = get_cache_backend(cache_folder)
+        text = json.dumps(data, indent=backend.indent, ensure_ascii=False)
+    except Exception as e:
+        logger.error(f"Error saving cache for {key}: {e!s}")
+        return False
+
+    if _writer is None or _writer.loop is not asyncio.get_running_loop():
+        _writer = CacheWriter()
+    _writer.submit(cache_folder, key, text, int(data.get("timestamp", time.time())))
+    _memory_cache.put((cache_folder, key), dict(data), len(text))
+    _failures.pop((cache_folder, key), None)
+    logger.debug(f"Queued {key} for saving to cache")
+    return True
+
+
+async def flush_cache() -> None:
+    """
+    Wait for queued cache writes from asave_to_cache to reach disk.
+
+    Raises:
+        The first error a queued write has hit since the last flush
+    """
+    if _writer is not None and _writer.loop is asyncio.get_running_loop():
+        await _writer.flush()
+
+
+def save_failure_to_cache(key: str, failure: dict[str, Any], cache_folder: str) -> None:
+    """
+    Remember that a lookup failed so it is not retried for NEGATIVE_CACHE_SECONDS.
+
+    Failures are only kept in memory.
+
+    Args:
+        key: The cache key (e.g., ASIN)
+        failure: Details to hand back to callers, e.g. the incomplete record
+        cache_folder: Folder where cache is stored
+    """
+    if not cache_folder:
+        return
+    now = time.monotonic()
+    if len(_failures) >= MEMORY_CACHE_MAX_ENTRIES:
+        # Drop expired failures so the table stays bounded
+        for expired in [k for k, (expires, _) in _failures.items() if expires < now]:
+            del _failures[expired]
+    _failures[(cache_folder, key)] = (now + NEGATIVE_CACHE_SECONDS, failure)
+
+
+def get_failure_from_cache(key: str, cache_folder: str) -> dict[str, Any] | None:
+    """
+    Return the details of a recent failed lookup, if any.
+
+    Args:
+        key: The cache key (e.g., ASIN)
+        cache_folder: Folder where cache is stored
+
+    Returns:
+        The failure details saved by save_failure_to_cache, or None
+    """
+    if not cache_folder:
+        return None
+    entry = _failures.get((cache_folder, key))
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        del _failures[(cache_folder, key)]
+        return None
+    _stats["negative_hits"] += 1
+    return entry[1]
+
+
+def get_cache_stats() -> dict[str, int]:
+    """
+    Return cache counters for the current process.
+
+    Returns:
+        Hit and miss counters plus the size of the in-memory tier
+    """
+    return {
+        **_stats,
+        "memory_entries": len(_memory_cache),
+        "memory_bytes": _memory_cache.size_bytes,
+        "memory_evictions": _memory_cache.evictions,
+        "negative_entries": len(_failures),
+    }
+
+
+def compact_cache(cache_folder: str) -> int:
+    """
+    Remove entries older than CACHE_RETENTION_SECONDS and reclaim their space.
+
+    Args:
+        cache_folder: Folder where cache is stored
+
+    Returns:
+        The number of entries removed
+    """
+    backend = get_cache_backend(cache_folder)
+    older_than = int(time.time()) - CACHE_RETENTION_SECONDS
+    removed = backend.purge_expired(older_than)
+    backend.compact()
+    # Evict the memory copies of the purged entries; the rest stay warm
+    for key, data in _memory_cache.items():
+        if key[0] == cache_folder and data.get("timestamp", older_than) < older_than:
+            _memory_cache.delete(key)
+    logger.debug(f"Removed {removed} expired entries from {cache_folder}")
+    return removed
+
+
+def migrate_cache(cache_folder: str) -> int:
+    """
+    Import the legacy one-JSON-file-per-key layout of a folder into its backend.
+
+    Args:
+        cache_folder: Folder where cache is stored
+
+    Returns:
+        The number of entries imported
+    """
+    backend = get_cache_backend(cache_folder)
+    if isinstance(backend, JsonDirBackend):
+        return 0
+    return migrate_json_dir(cache_folder, backend)
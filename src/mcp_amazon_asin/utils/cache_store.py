@@ -0,0 +1,226 @@
+"""
+Persistent storage backends for the cache.
+
+Backends store opaque JSON text per key together with the record timestamp, so
+expiry can be indexed without parsing values. The default backend keeps every
+entry of a cache folder in a single SQLite file; the legacy backend writes one
+JSON file per key.
+"""
+
+import glob
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# File name of the SQLite store inside the cache folder
+SQLITE_FILENAME = "cache.sqlite3"
+
+
+class CacheBackend(ABC):
+    """Interface implemented by every persistent cache backend"""
+
+    # JSON indentation used when serializing values for this backend
+    indent: int | None = None
+
+    @abstractmethod
+    def get(self, key: str) -> str | None:
+        """Return the stored JSON text for key, or None"""
+
+    @abstractmethod
+    def set(self, key: str, text: str, timestamp: int) -> None:
+        """Atomically store JSON text for key"""
+
+    def set_many(self, entries: list[tuple[str, str, int]]) -> None:
+        """Store several (key, text, timestamp) entries"""
+        for key, text, timestamp in entries:
+            self.set(key, text, timestamp)
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove key if present"""
+
+    @abstractmethod
+    def keys(self) -> list[str]:
+        """Return every stored key"""
+
+    @abstractmethod
+    def purge_expired(self, older_than: int) -> int:
+        """Remove entries whose timestamp is older than the given Unix time"""
+
+    # Optional hooks: backends with no space to reclaim or handles to release keep the no-ops
+    def compact(self) -> None:  # noqa: B027
+        """Reclaim space left behind by deleted entries"""
+
+    def close(self) -> None:  # noqa: B027
+        """Release any open handles"""
+
+
+class JsonDirBackend(CacheBackend):
+    """One pretty-printed `{key}.json` file per entry (the original layout)"""
+
+    indent = 2
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}.json")
+
+    def get(self, key: str) -> str | None:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, text: str, timestamp: int) -> None:
+        os.makedirs(self.folder, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def keys(self) -> list[str]:
+        return [
+            os.path.basename(path)[: -len(".json")]
+            for path in glob.glob(os.path.join(glob.escape(self.folder), "*.json"))
+        ]
+
+    def purge_expired(self, older_than: int) -> int:
+        removed = 0
+        for key in self.keys():
+            try:
+                timestamp = json.loads(self.get(key) or "{}").get("timestamp", 0)
+            except ValueError:
+                timestamp = 0
+            if timestamp < older_than:
+                self.delete(key)
+                removed += 1
+        return removed
+
+
+class SqliteBackend(CacheBackend):
+    """All entries of a cache folder in one SQLite file, with expiry indexed"""
+
+    def __init__(self, folder: str):
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, SQLITE_FILENAME)
+        # Lookups run in asyncio.to_thread and writes in the cache writer's thread,
+        # all on this one connection, so each statement holds the lock
+        self._lock = threading.Lock()
+        # Queue workers on several machines may share the folder; WAL needs shared
+        # memory on one host, so the file uses a rollback journal instead
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=TRUNCATE")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, timestamp INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_timestamp ON entries (timestamp)"
+        )
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, text: str, timestamp: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, timestamp) VALUES (?, ?, ?)",
+                (key, text, timestamp),
+            )
+
+    def set_many(self, entries: list[tuple[str, str, int]]) -> None:
+        """Store several entries in one transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (key, value, timestamp) VALUES (?, ?, ?)",
+                    entries,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM entries")]
+
+    def purge_expired(self, older_than: int) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM entries WHERE timestamp < ?", (older_than,))
+        return cursor.rowcount
+
+    def compact(self) -> None:
+        with self._lock:
+            self._conn.execute("VACUUM")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Available backends by name
+CACHE_BACKENDS = {"sqlite": SqliteBackend, "json": JsonDirBackend}
+
+
+def migrate_json_dir(folder: str, target: CacheBackend) -> int:
+    """
+    Import every `{key}.json` file of a legacy cache folder into another backend.
+
+    The JSON files are left in place; delete them once the import is verified.
+
+    Args:
+        folder: Legacy cache folder
+        target: Backend to import into
+
+    Returns:
+        The number of entries imported
+    """
+    source = JsonDirBackend(folder)
+    entries = []
+    for key in source.keys():
+        text = source.get(key)
+        try:
+            data = json.loads(text) if text else None
+        except ValueError:
+            logger.error(f"Skipping unreadable cache file for {key}")
+            continue
+        if not isinstance(data, dict):
+            continue
+        # Store compactly; indentation only helped humans reading single files
+        entries.append((key, json.dumps(data, ensure_ascii=False), int(data.get("timestamp", 0))))
+
+    target.set_many(entries)
+    logger.debug(f"Imported {len(entries)} entries from {folder}")
+    return len(entries)
@@ -1,23 +1,262 @@
+import asyncio
+import functools
 import logging
 import time
 
-from playwright.async_api import async_playwright
-
-from mcp_amazon_asin.utils import get_amazon_detail_page_url
-from mcp_amazon_asin.utils.cache import get_from_cache, save_to_cache
+from mcp_amazon_asin.utils import DP_ENGINES, get_amazon_detail_page_url
+from mcp_amazon_asin.utils.browser import get_browser_pool
+from mcp_amazon_asin.utils.cache import (
+    aget_from_cache,
+    asave_to_cache,
+    get_failure_from_cache,
+    save_failure_to_cache,
+)
+from mcp_amazon_asin.utils.fetch import fetch_html
 from mcp_amazon_asin.utils.fields import (
     ALL_PRODUCT_FIELDS,
     OPTIONAL_PRODUCT_FIELDS,
+    PRODUCT_FIELD_CLASSES,
+    PRODUCT_FIELD_SELECTORS,
     PRODUCT_FIELDS,
     REQUIRED_PRODUCT_FIELDS,
+    VOLATILE_PRODUCT_FIELDS,
 )
+from mcp_amazon_asin.utils.htmlparse import compile_selector, parse_html, select_each
+from mcp_amazon_asin.utils.readiness import wait_until_ready
+from mcp_amazon_asin.utils.scheduler import (
+    HostRateLimiter,
+    ProgressCallback,
+    ProgressTracker,
+    as_rate_limiter,
+    run_concurrently,
+)
+from mcp_amazon_asin.utils.singleflight import SingleFlight
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# How long each field class of a cached product stays fresh
+PRODUCT_FIELD_TTL_SECONDS = {
+    "stable": 3600 * 24 * 7,  # title, rating, features, image: 7 days
+    "volatile": 3600 * 6,  # price, seller and delivery: 6 hours
+}
+
+# How long past its TTL a field class may still be served while it is refreshed
+# in the background; older records are refreshed before returning
+PRODUCT_STALE_GRACE_SECONDS = 3600 * 24
+
+# Oldest cached record worth reading at all
+_MAX_PRODUCT_AGE_SECONDS = max(PRODUCT_FIELD_TTL_SECONDS.values()) + PRODUCT_STALE_GRACE_SECONDS
+
+# Coalesces concurrent scrapes of the same ASIN
+_dp_flight = SingleFlight()
+
+# Background refreshes in flight, kept referenced until they finish
+_background_refreshes: set[asyncio.Task] = set()
+
+# (asin, cache_folder) of background refreshes that are scheduled or running
+_pending_refreshes: set[tuple[str, str]] = set()
+
+# Stale-while-revalidate refreshes allowed to scrape at once; the rest wait their turn
+BACKGROUND_REFRESH_CONCURRENCY = 2
+
+# Semaphore bounding background refreshes, with the event loop it belongs to
+_background_slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+# Selector table in the shape expected by _EXTRACT_FIELDS_JS
+_FIELD_SELECTOR_SPECS = {
+    field: spec._asdict() for field, spec in PRODUCT_FIELD_SELECTORS.items()
+}
+
+# Reads every field described by the selector table in a single page.evaluate
+_EXTRACT_FIELDS_JS = """
+(specs) => {
+    const result = {};
+    for (const [field, spec] of Object.entries(specs)) {
+        if (spec.multiple) {
+            result[field] = Array.from(
+                document.querySelectorAll(spec.selector), (el) => el.textContent
+            );
+            continue;
+        }
+        const el = document.querySelector(spec.selector);
+        if (!el) {
+            result[field] = null;
+        } else if (spec.attribute) {
+            result[field] = el.getAttribute(spec.attribute);
+        } else {
+            result[field] = el.textContent;
+        }
+    }
+    return result;
+}
+"""
+
+# Selectors compiled once for the static parser
+_COMPILED_FIELD_SELECTORS = {
+    field: compile_selector(spec.selector) for field, spec in PRODUCT_FIELD_SELECTORS.items()
+}
+
+
+def parse_dp_html(html: str, fields: list[str] | None = None) -> dict:
+    """
+    Extract the raw product fields from detail page HTML without a browser.
+
+    Args:
+        html: The detail page HTML
+        fields: Only extract these fields (default: every field in the selector table)
+
+    Returns:
+        Mapping of field name to the raw text, attribute value or list of texts,
+        or None when the field is not on the page
+    """
+    specs = {
+        field: spec
+        for field, spec in PRODUCT_FIELD_SELECTORS.items()
+        if fields is None or field in fields
+    }
+    # One walk of the tree matches every selector
+    matches = select_each(
+        parse_html(html),
+        {field: _COMPILED_FIELD_SELECTORS[field] for field in specs},
+        first_only=[field for field, spec in specs.items() if not spec.multiple],
+    )
+    raw = {}
+    for field, spec in specs.items():
+        if spec.multiple:
+            raw[field] = [element.text_content() for element in matches[field]]
+            continue
+        element = matches[field][0] if matches[field] else None
+        if element is None:
+            raw[field] = None
+        elif spec.attribute:
+            raw[field] = element.get_attribute(spec.attribute)
+        else:
+            raw[field] = element.text_content()
+    return raw
+
+
+async def _scrape_dp_http(url: str, fields: list[str] | None = None) -> dict:
+    """Fetch a detail page over plain HTTP and parse it statically"""
+    html = await fetch_html(url)
+    # Parsing a full page takes long enough to stall other requests on the loop
+    return await asyncio.to_thread(parse_dp_html, html, fields)
+
+
+async def _scrape_dp_browser(url: str, fields: list[str] | None = None) -> dict:
+    """Render a detail page in a pooled browser and read the raw fields"""
+    specs = _FIELD_SELECTOR_SPECS
+    if fields is not None:
+        specs = {field: spec for field, spec in specs.items() if field in fields}
+
+    async with get_browser_pool().page() as page:
+        await page.goto(url, timeout=60000)
+        await wait_until_ready(page, "dp")
+
+        # One round trip for every field; missing elements come back as null
+        try:
+            return await page.evaluate(_EXTRACT_FIELDS_JS, specs)
+        except Exception as e:
+            logger.debug(f"Field extraction failed for {url}: {e}")
+            return {}
+
+
+def _build_product_data(asin: str, url: str, raw: dict) -> dict:
+    """Normalize raw scraped values into a product record"""
+
+    def clean(value):
+        return value.strip() if value and value.strip() else None
+
+    return {
+        PRODUCT_FIELDS.asin: asin,
+        PRODUCT_FIELDS.url: url,
+        PRODUCT_FIELDS.title: clean(raw.get(PRODUCT_FIELDS.title)),
+        PRODUCT_FIELDS.price: clean(raw.get(PRODUCT_FIELDS.price)),
+        PRODUCT_FIELDS.rating: clean(raw.get(PRODUCT_FIELDS.rating)),
+        PRODUCT_FIELDS.features: [
+            b.strip() for b in raw.get(PRODUCT_FIELDS.features) or [] if b.strip()
+        ],
+        PRODUCT_FIELDS.image: raw.get(PRODUCT_FIELDS.image),
+        PRODUCT_FIELDS.sold_by: clean(raw.get(PRODUCT_FIELDS.sold_by)),
+        PRODUCT_FIELDS.delivery_date: clean(raw.get(PRODUCT_FIELDS.delivery_date)),
+        PRODUCT_FIELDS.delivering_to: clean(raw.get(PRODUCT_FIELDS.delivering_to)),
+    }
+
+
+def _missing_required_fields(product_data: dict, fields: list[str] | None = None) -> list[str]:
+    return [
+        field
+        for field in REQUIRED_PRODUCT_FIELDS
+        if (fields is None or field in fields) and product_data.get(field) is None
+    ]
+
+
+async def _scrape_dp(
+    asin: str,
+    url: str,
+    engine: str,
+    rate_limiter: HostRateLimiter | None = None,
+    fields: list[str] | None = None,
+) -> dict:
+    """Scrape a detail page with the requested engine, optionally only some fields"""
+    if engine not in DP_ENGINES:
+        raise ValueError(f"Unsupported engine '{engine}'. Expected one of {DP_ENGINES}.")
+
+    if engine in ("auto", "http"):
+        if rate_limiter:
+            await rate_limiter.wait(url)
+        try:
+            product_data = _build_product_data(asin, url, await _scrape_dp_http(url, fields))
+        except Exception as e:
+            if engine == "http":
+                raise
+            logger.debug(f"HTTP fetch failed for {asin}: {e}")
+        else:
+            missing = _missing_required_fields(product_data, fields)
+            if engine == "http" or not missing:
+                return product_data
+            logger.debug(f"HTTP engine missed {missing} for {asin}, falling back to browser")
+
+    if rate_limiter:
+        await rate_limiter.wait(url)
+    return _build_product_data(asin, url, await _scrape_dp_browser(url, fields))
+
+
+def _stale_field_classes(product_data: dict) -> tuple[list[str], list[str]]:
+    """
+    Split the field classes of a cached product by freshness.
+
+    Returns:
+        (stale, expired): classes past their TTL but within the grace period,
+        and classes past the grace period
+    """
+    now = int(time.time())
+    timestamps = product_data.get("field_timestamps") or {}
+    stale, expired = [], []
+    for name, ttl in PRODUCT_FIELD_TTL_SECONDS.items():
+        # Records written before per-field TTLs only have the overall timestamp
+        age = now - timestamps.get(name, product_data.get("timestamp", 0))
+        if age > ttl + PRODUCT_STALE_GRACE_SECONDS:
+            expired.append(name)
+        elif age > ttl:
+            stale.append(name)
+    return stale, expired
+
+
+def _fields_to_refresh(field_classes: list[str]) -> list[str] | None:
+    """Fields to re-extract for the given classes; None means the whole record"""
+    if field_classes == ["volatile"]:
+        return VOLATILE_PRODUCT_FIELDS
+    return None
+
 
 async def extract_dp(
-    asin: str, cache_folder: str = "cache", verbose: bool = False
+    asin: str,
+    cache_folder: str = "cache",
+    verbose: bool = False,
+    engine: str = "auto",
+    rate_limiter: HostRateLimiter | None = None,
+    use_failure_cache: bool = True,
 ) -> dict:
     """Fetch product details from Amazon using ASIN
 
@@ -25,12 +264,18 @@ async def extract_dp(
         asin: Amazon Standard Identification Number
         cache_folder: Folder to store cached data (use 'none' to disable)
         verbose: Deprecated parameter, kept for backward compatibility
+        engine: Scraping engine, one of "auto", "http" or "browser"
+        rate_limiter: Optional limiter applied before every request to Amazon
+        use_failure_cache: Answer with a recent failure of this ASIN instead of
+            scraping again (callers with their own retry schedule turn this off)
     """
 
     url = get_amazon_detail_page_url(asin)
 
-    # Check cache if enabled
-    cached_data = get_from_cache(asin, cache_folder, REQUIRED_PRODUCT_FIELDS)
+    # Check cache if enabled; freshness is decided per field class below
+    cached_data = await aget_from_cache(
+        asin, cache_folder, REQUIRED_PRODUCT_FIELDS, max_age=_MAX_PRODUCT_AGE_SECONDS
+    )
     if cached_data:
         # Log if optional fields are missing in cached data
         for field in OPTIONAL_PRODUCT_FIELDS:
@@ -38,91 +283,67 @@ async def extract_dp(
                 logger.debug(
                     f"Note: optional field '{field}' is empty for {asin} in cache"
                 )
-        return cached_data
-
-    logger.debug(f"Fetching data for {asin} from Amazon (cache not used)")
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-
-        # Set user agent to avoid blocking
-        await page.set_extra_http_headers(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/91.0.4472.124 Safari/537.36"
-            }
-        )
-
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(2000)
 
-        try:
-            title = await page.locator("span#productTitle").text_content()
-        except Exception:
-            title = None
-
-        try:
-            price = await page.locator(
-                "span.a-price span.a-offscreen"
-            ).first.text_content()
-        except Exception:
-            price = None
+        stale, expired = _stale_field_classes(cached_data)
+        if not stale and not expired:
+            return cached_data
 
-        try:
-            rating = await page.locator("span.a-icon-alt").first.text_content()
-        except Exception:
-            rating = None
-
-        try:
-            bullets = await page.locator(
-                "#feature-bullets ul li span"
-            ).all_text_contents()
-        except Exception:
-            bullets = []
+        if expired:
+            logger.debug(f"Cached {asin} is too old to serve ({expired}), refreshing")
+            refresh = functools.partial(
+                _refresh_dp,
+                asin,
+                url,
+                cache_folder,
+                engine,
+                rate_limiter,
+                cached_data,
+                _fields_to_refresh(stale + expired),
+            )
+            return await _dp_flight.do((asin, cache_folder), refresh)
 
-        try:
-            images = await page.locator("img#landingImage").get_attribute("src")
-        except Exception:
-            images = None
+        # Serve the stale record now and refresh it in the background, once per ASIN
+        key = (asin, cache_folder)
+        if key not in _pending_refreshes:
+            logger.debug(f"Serving stale {stale} fields for {asin} while refreshing")
+            _pending_refreshes.add(key)
+            task = asyncio.ensure_future(
+                _background_refresh(asin, url, cache_folder, engine, rate_limiter)
+            )
+            _background_refreshes.add(task)
+            task.add_done_callback(functools.partial(_finish_background_refresh, key))
+        return cached_data
 
-        try:
-            sold_by = await page.locator(
-                "#merchant-info a, #sellerProfileTriggerId, [data-feature-name='merchant'] a"
-            ).first.text_content()
-        except Exception:
-            sold_by = None
+    # Don't hammer Amazon for an ASIN that just failed
+    failure = get_failure_from_cache(asin, cache_folder) if use_failure_cache else None
+    if failure:
+        logger.debug(f"Recent fetch of {asin} failed, not retrying yet")
+        if "error" in failure:
+            raise ValueError(failure["error"])
+        return failure["product"]
 
-        try:
-            delivery_date = await page.locator(
-                "#mir-layout-DELIVERY_BLOCK span[data-csa-c-type='element']"
-            ).first.text_content()
-        except Exception:
-            delivery_date = None
+    # Concurrent lookups of the same ASIN share a single scrape
+    return await _dp_flight.do(
+        (asin, cache_folder),
+        lambda: _fetch_and_cache_dp(asin, url, cache_folder, engine, rate_limiter),
+    )
 
-        try:
-            delivering_to = await page.locator(
-                "#glow-ingress-line1, #contextualIngressPt"
-            ).first.text_content()
-        except Exception:
-            delivering_to = None
 
-        await browser.close()
+async def _fetch_and_cache_dp(
+    asin: str,
+    url: str,
+    cache_folder: str,
+    engine: str,
+    rate_limiter: HostRateLimiter | None,
+) -> dict:
+    """Scrape a detail page, complete the record and cache it when valid"""
+    logger.debug(f"Fetching data for {asin} from Amazon (cache not used, engine: {engine})")
 
-    # Prepare the data dictionary with all required fields
-    product_data = {
-        PRODUCT_FIELDS.asin: asin,
-        PRODUCT_FIELDS.url: url,
-        PRODUCT_FIELDS.title: title.strip() if title else None,
-        PRODUCT_FIELDS.price: price.strip() if price else None,
-        PRODUCT_FIELDS.rating: rating.strip() if rating else None,
-        PRODUCT_FIELDS.features: [b.strip() for b in bullets if b.strip()],
-        PRODUCT_FIELDS.image: images,
-        PRODUCT_FIELDS.sold_by: sold_by.strip() if sold_by else None,
-        PRODUCT_FIELDS.delivery_date: delivery_date.strip() if delivery_date else None,
-        PRODUCT_FIELDS.delivering_to: delivering_to.strip() if delivering_to else None,
-    }
+    try:
+        product_data = await _scrape_dp(asin, url, engine, rate_limiter)
+    except Exception as e:
+        save_failure_to_cache(asin, {"error": f"Fetching {asin} failed: {e!s}"}, cache_folder)
+        raise
 
     # Flag to determine if we should cache the data
     should_cache = True
@@ -145,13 +366,155 @@ async def extract_dp(
                 f"Note: optional field '{field}' is empty for {asin}, but caching is still allowed"
             )
 
-    # Add timestamp for cache expiration
+    # Add timestamps for cache expiration, overall and per field class
     product_data["timestamp"] = int(time.time())
+    product_data["field_timestamps"] = dict.fromkeys(
+        PRODUCT_FIELD_CLASSES, product_data["timestamp"]
+    )
 
     # Save to cache if enabled
     if should_cache and cache_folder:
-        save_to_cache(asin, product_data, cache_folder)
+        await asave_to_cache(asin, product_data, cache_folder)
     else:
         logger.debug(f"Skipping cache for {asin} due to missing critical fields")
+        save_failure_to_cache(asin, {"product": product_data}, cache_folder)
 
     return product_data
+
+
+async def _refresh_dp(
+    asin: str,
+    url: str,
+    cache_folder: str,
+    engine: str,
+    rate_limiter: HostRateLimiter | None,
+    cached_data: dict,
+    fields: list[str] | None,
+) -> dict:
+    """Re-extract some fields of a cached product, or all of them if fields is None"""
+    if fields is None:
+        return await _fetch_and_cache_dp(asin, url, cache_folder, engine, rate_limiter)
+
+    logger.debug(f"Refreshing {fields} for {asin}")
+    refreshed = await _scrape_dp(asin, url, engine, rate_limiter, fields)
+    missing = _missing_required_fields(refreshed, fields)
+    if missing:
+        # Partial page; a full scrape decides whether the product is still valid
+        logger.debug(f"Partial refresh of {asin} missed {missing}, doing a full fetch")
+        return await _fetch_and_cache_dp(asin, url, cache_folder, engine, rate_limiter)
+
+    now = int(time.time())
+    product_data = {**cached_data, **{field: refreshed[field] for field in fields}}
+    product_data["timestamp"] = now
+    product_data["field_timestamps"] = {
+        **dict.fromkeys(PRODUCT_FIELD_CLASSES, cached_data.get("timestamp", now)),
+        **(cached_data.get("field_timestamps") or {}),
+        **{
+            name: now
+            for name, class_fields in PRODUCT_FIELD_CLASSES.items()
+            if set(class_fields) <= set(fields)
+        },
+    }
+    await asave_to_cache(asin, product_data, cache_folder)
+    return product_data
+
+
+async def _background_refresh(
+    asin: str,
+    url: str,
+    cache_folder: str,
+    engine: str,
+    rate_limiter: HostRateLimiter | None,
+) -> dict | None:
+    """Refresh the stale fields of a cached product once a background slot is free"""
+    global _background_slots
+    loop = asyncio.get_running_loop()
+    if _background_slots is None or _background_slots[0] is not loop:
+        _background_slots = (loop, asyncio.Semaphore(BACKGROUND_REFRESH_CONCURRENCY))
+    async with _background_slots[1]:
+        # A foreground lookup may have refreshed the record while this one waited
+        cached_data = await aget_from_cache(
+            asin, cache_folder, REQUIRED_PRODUCT_FIELDS, max_age=_MAX_PRODUCT_AGE_SECONDS
+        )
+        if not cached_data:
+            return None
+        stale, expired = _stale_field_classes(cached_data)
+        if not stale and not expired:
+            logger.debug(f"Cached {asin} was refreshed meanwhile, skipping")
+            return cached_data
+
+        refresh = functools.partial(
+            _refresh_dp,
+            asin,
+            url,
+            cache_folder,
+            engine,
+            rate_limiter,
+            cached_data,
+            _fields_to_refresh(stale + expired),
+        )
+        return await _dp_flight.do((asin, cache_folder), refresh)
+
+
+def _finish_background_refresh(key: tuple[str, str], task: asyncio.Task) -> None:
+    _pending_refreshes.discard(key)
+    _background_refreshes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background product refresh failed: {task.exception()!s}")
+
+
+async def wait_for_background_refreshes() -> None:
+    """Wait for stale-while-revalidate refreshes started by extract_dp to finish"""
+    while _background_refreshes:
+        await asyncio.gather(*list(_background_refreshes), return_exceptions=True)
+
+
+async def extract_dp_many(
+    asins: list[str],
+    concurrency: int = 10,
+    cache_folder: str = "cache",
+    engine: str = "auto",
+    rate_limit: float | HostRateLimiter | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> list[dict]:
+    """
+    Fetch product details for several ASINs through one concurrency-limited pipeline.
+
+    Duplicate ASINs are fetched once, cached products are reused, and a failure
+    for one ASIN does not affect the others.
+
+    Args:
+        asins: Amazon Standard Identification Numbers
+        concurrency: Maximum number of product pages fetched at the same time
+        cache_folder: Folder to store cached data (use 'none' to disable)
+        engine: Scraping engine, one of "auto", "http" or "browser"
+        rate_limit: Maximum requests per second to Amazon, or a limiter shared with
+            other calls (None for no limit)
+        on_progress: Called as each ASIN finishes, with its entry as the partial result
+
+    Returns:
+        One entry per distinct ASIN, in input order, with "asin" and either
+        "product" or "error"
+    """
+    if cache_folder and cache_folder.lower() == "none":
+        cache_folder = None
+
+    unique_asins = list(dict.fromkeys(asin.strip().upper() for asin in asins if asin.strip()))
+    rate_limiter = as_rate_limiter(rate_limit)
+    progress = ProgressTracker(on_progress, total=len(unique_asins))
+
+    async def fetch(asin: str) -> dict:
+        return await extract_dp(
+            asin, cache_folder=cache_folder, engine=engine, rate_limiter=rate_limiter
+        )
+
+    outcomes = {}
+    async for job in run_concurrently(unique_asins, fetch, concurrency):
+        if job.error is not None:
+            logger.debug(f"Failed to fetch product {job.item}: {job.error!s}")
+            outcomes[job.item] = {"asin": job.item, "error": str(job.error)}
+            await progress.advance(f"Failed to fetch product {job.item}", outcomes[job.item])
+        else:
+            outcomes[job.item] = {"asin": job.item, "product": job.result}
+            await progress.advance(f"Fetched product {job.item}", outcomes[job.item])
+    return [outcomes[asin] for asin in unique_asins]
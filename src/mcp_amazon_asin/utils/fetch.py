@@ -0,0 +1,69 @@
+"""
+Browserless HTTP fetching over a shared, pooled aiohttp session.
+"""
+
+import logging
+
+import aiohttp
+
+from mcp_amazon_asin.utils import USER_AGENT
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Total time allowed for a single page fetch, in seconds
+FETCH_TIMEOUT_SECONDS = 30
+
+# Maximum number of simultaneous connections held by the shared session
+MAX_CONNECTIONS = 20
+
+# Headers that make a plain HTTP client look like a regular browser visit
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Process-wide session, created lazily on first use
+_session: aiohttp.ClientSession | None = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared HTTP session, creating it on first use"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=FETCH_TIMEOUT_SECONDS),
+            headers=DEFAULT_HEADERS,
+        )
+    return _session
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session if it was ever opened"""
+    global _session
+    session, _session = _session, None
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def fetch_html(url: str) -> str:
+    """
+    Fetch a page and return its HTML.
+
+    Args:
+        url: The page URL
+
+    Returns:
+        The response body as text
+
+    Raises:
+        ValueError: If the server does not answer with HTTP 200
+    """
+    async with get_http_session().get(url) as response:
+        if response.status != 200:
+            raise ValueError(f"Fetching {url} failed with status {response.status}")
+        html = await response.text()
+    logger.debug(f"Fetched {len(html)} characters from {url}")
+    return html
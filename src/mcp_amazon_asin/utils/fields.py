@@ -2,6 +2,8 @@
 Common field definitions for product data
 """
 
+from typing import NamedTuple
+
 
 class ProductFields:
     """Class to define product field names as attributes"""
@@ -52,3 +54,45 @@ OPTIONAL_PRODUCT_FIELDS = [
     PRODUCT_FIELDS.delivery_date,
     PRODUCT_FIELDS.delivering_to,
 ]
+
+# Fields that go stale quickly: the price plus every optional (offer and delivery) field
+VOLATILE_PRODUCT_FIELDS = [PRODUCT_FIELDS.price, *OPTIONAL_PRODUCT_FIELDS]
+
+# Fields that rarely change once a product is listed
+STABLE_PRODUCT_FIELDS = [
+    field for field in REQUIRED_PRODUCT_FIELDS if field not in VOLATILE_PRODUCT_FIELDS
+]
+
+# Field classes that are cached with their own TTL
+PRODUCT_FIELD_CLASSES = {
+    "stable": STABLE_PRODUCT_FIELDS,
+    "volatile": VOLATILE_PRODUCT_FIELDS,
+}
+
+
+class FieldSelector(NamedTuple):
+    """How to read one product field from a detail page"""
+
+    # CSS selector; with several comma-separated alternatives the first match wins
+    selector: str
+    # Read this attribute instead of the element text
+    attribute: str | None = None
+    # Collect every match instead of only the first one
+    multiple: bool = False
+
+
+# Detail page selectors for every field that is scraped from the page
+PRODUCT_FIELD_SELECTORS = {
+    PRODUCT_FIELDS.title: FieldSelector("span#productTitle"),
+    PRODUCT_FIELDS.price: FieldSelector("span.a-price span.a-offscreen"),
+    PRODUCT_FIELDS.rating: FieldSelector("span.a-icon-alt"),
+    PRODUCT_FIELDS.features: FieldSelector("#feature-bullets ul li span", multiple=True),
+    PRODUCT_FIELDS.image: FieldSelector("img#landingImage", attribute="src"),
+    PRODUCT_FIELDS.sold_by: FieldSelector(
+        "#merchant-info a, #sellerProfileTriggerId, [data-feature-name='merchant'] a"
+    ),
+    PRODUCT_FIELDS.delivery_date: FieldSelector(
+        "#mir-layout-DELIVERY_BLOCK span[data-csa-c-type='element']"
+    ),
+    PRODUCT_FIELDS.delivering_to: FieldSelector("#glow-ingress-line1, #contextualIngressPt"),
+}
@@ -0,0 +1,262 @@
+"""
+Minimal static HTML parser with precompiled CSS selectors.
+
+Builds a lightweight element tree with the standard library HTML parser and
+matches the small CSS subset used by our extractors: type, ``#id``, ``.class``
+and ``[attr]`` / ``[attr=value]`` compound selectors joined by descendant
+(`` ``) or child (``>``) combinators, plus comma-separated selector groups.
+"""
+
+import re
+from collections.abc import Collection
+from html.parser import HTMLParser
+
+# Elements that never have children or an end tag
+VOID_ELEMENTS = frozenset(
+    [
+        "area", "base", "br", "col", "embed", "hr", "img", "input",
+        "link", "meta", "param", "source", "track", "wbr",
+    ]
+)
+
+
+class Element:
+    """A parsed HTML element"""
+
+    __slots__ = ("attrs", "children", "classes", "parent", "tag")
+
+    def __init__(self, tag: str, attrs: dict[str, str], parent: "Element | None" = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = frozenset(attrs.get("class", "").split())
+        self.parent = parent
+        self.children: list[Element | str] = []
+
+    def iter(self):
+        """Yield every descendant element in document order"""
+        stack = [child for child in reversed(self.children) if isinstance(child, Element)]
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(
+                child for child in reversed(element.children) if isinstance(child, Element)
+            )
+
+    def text_content(self) -> str:
+        """Concatenated text of this element and its descendants, like DOM textContent"""
+        parts: list[str] = []
+        stack: list[Element | str] = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return "".join(parts)
+
+    def get_attribute(self, name: str) -> str | None:
+        return self.attrs.get(name)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document", {})
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(tag, {k: v or "" for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(element)
+        if tag not in VOID_ELEMENTS:
+            self._stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        element = Element(tag, {k: v or "" for k, v in attrs}, self._stack[-1])
+        self._stack[-1].children.append(element)
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element; stray end tags are ignored
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                return
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Element:
+    """Parse an HTML document into an element tree and return its root"""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+_COMPOUND_RE = re.compile(
+    r"""
+    (?P<tag>[a-zA-Z][\w-]*|\*)
+    |\#(?P<id>[\w-]+)
+    |\.(?P<cls>[\w-]+)
+    |\[\s*(?P<attr>[\w-]+)\s*(?:=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?\]
+    """,
+    re.VERBOSE,
+)
+
+
+class _Compound:
+    """A compound selector such as ``span.a-price[data-x='1']``"""
+
+    __slots__ = ("attrs", "classes", "id", "tag")
+
+    def __init__(self, text: str):
+        self.tag: str | None = None
+        self.id: str | None = None
+        self.classes: set[str] = set()
+        self.attrs: list[tuple[str, str | None]] = []
+
+        pos = 0
+        while pos < len(text):
+            match = _COMPOUND_RE.match(text, pos)
+            if not match:
+                raise ValueError(f"Unsupported selector syntax: {text!r}")
+            if match["tag"] and match["tag"] != "*":
+                self.tag = match["tag"].lower()
+            elif match["id"]:
+                self.id = match["id"]
+            elif match["cls"]:
+                self.classes.add(match["cls"])
+            elif match["attr"]:
+                value = next(
+                    (v for v in (match["dq"], match["sq"], match["bare"]) if v is not None),
+                    None,
+                )
+                self.attrs.append((match["attr"], value))
+            pos = match.end()
+
+    def matches(self, element: Element) -> bool:
+        if self.tag is not None and element.tag != self.tag:
+            return False
+        if self.id is not None and element.attrs.get("id") != self.id:
+            return False
+        if self.classes and not self.classes <= element.classes:
+            return False
+        for name, value in self.attrs:
+            actual = element.attrs.get(name)
+            if actual is None or (value is not None and actual != value):
+                return False
+        return True
+
+
+class CompiledSelector:
+    """A selector group parsed once and matched many times"""
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        # Each alternative is a list of (combinator, compound) pairs, left to right
+        self._alternatives: list[list[tuple[str, _Compound]]] = []
+        for part in selector.split(","):
+            tokens = re.sub(r"\s*>\s*", " > ", part.strip()).split()
+            if not tokens:
+                raise ValueError(f"Empty selector in {selector!r}")
+            chain: list[tuple[str, _Compound]] = []
+            combinator = " "
+            for token in tokens:
+                if token == ">":
+                    combinator = ">"
+                    continue
+                chain.append((combinator, _Compound(token)))
+                combinator = " "
+            self._alternatives.append(chain)
+
+    @staticmethod
+    def _matches_chain(element: Element, chain: list[tuple[str, _Compound]], index: int) -> bool:
+        combinator, compound = chain[index]
+        if not compound.matches(element):
+            return False
+        if index == 0:
+            return True
+        ancestor = element.parent
+        while ancestor is not None:
+            if CompiledSelector._matches_chain(ancestor, chain, index - 1):
+                return True
+            if combinator == ">":
+                return False
+            ancestor = ancestor.parent
+        return False
+
+    def matches(self, element: Element) -> bool:
+        return any(
+            self._matches_chain(element, chain, len(chain) - 1) for chain in self._alternatives
+        )
+
+    def select(self, root: Element) -> list[Element]:
+        """All matching descendants of root, in document order"""
+        return [element for element in root.iter() if self.matches(element)]
+
+    def select_one(self, root: Element) -> Element | None:
+        """The first matching descendant of root in document order, if any"""
+        return next((element for element in root.iter() if self.matches(element)), None)
+
+
+def compile_selector(selector: str) -> CompiledSelector:
+    """Compile a CSS selector group for repeated matching"""
+    return CompiledSelector(selector)
+
+
+def _index_key(compound: _Compound) -> tuple[str, str] | None:
+    """The most selective id, class or tag an element must have to match compound"""
+    if compound.id is not None:
+        return ("id", compound.id)
+    if compound.classes:
+        return ("class", min(compound.classes))
+    if compound.tag is not None:
+        return ("tag", compound.tag)
+    return None
+
+
+def select_each(
+    root: Element, selectors: dict[str, CompiledSelector], first_only: Collection[str] = ()
+) -> dict[str, list[Element]]:
+    """
+    Match several selectors in a single walk of the tree.
+
+    Selector alternatives are indexed by the id, class or tag their last compound
+    requires, so each element is only checked against alternatives it could match.
+
+    Args:
+        root: Element whose descendants are matched
+        selectors: Compiled selectors by name
+        first_only: Names whose selector stops matching after its first element
+
+    Returns:
+        Matching elements in document order, by selector name
+    """
+    index: dict[tuple[str, str] | None, list[tuple[str, list[tuple[str, _Compound]]]]] = {}
+    for name, selector in selectors.items():
+        for chain in selector._alternatives:
+            index.setdefault(_index_key(chain[-1][1]), []).append((name, chain))
+
+    matches: dict[str, list[Element]] = {name: [] for name in selectors}
+    done: set[str] = set()
+    for element in root.iter():
+        keys: list[tuple[str, str] | None] = [None, ("tag", element.tag)]
+        element_id = element.attrs.get("id")
+        if element_id:
+            keys.append(("id", element_id))
+        keys.extend(("class", cls) for cls in element.classes)
+
+        matched: set[str] = set()
+        for key in keys:
+            for name, chain in index.get(key, ()):
+                if name in matched or name in done:
+                    continue
+                if CompiledSelector._matches_chain(element, chain, len(chain) - 1):
+                    matched.add(name)
+        for name in matched:
+            matches[name].append(element)
+            if name in first_only:
+                done.add(name)
+        if len(done) == len(selectors):
+            break
+    return matches
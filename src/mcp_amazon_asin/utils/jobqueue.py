@@ -0,0 +1,273 @@
+"""
+Persistent work queue for distributing scrape jobs across processes and machines.
+
+Jobs are leased rather than popped: a worker that dies mid-job loses its lease
+when it expires and the job becomes available again. Failed jobs are retried with
+exponential backoff up to a maximum number of attempts, and enqueueing a job that
+is already queued or running returns the existing one. The default queue is a
+SQLite file that every worker with access to it can share; other brokers can
+implement the JobQueue interface.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, NamedTuple
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# File name of the SQLite queue inside the cache folder
+JOB_QUEUE_FILENAME = "jobs.sqlite3"
+
+# How long a leased job belongs to its worker before others may take it over
+JOB_LEASE_SECONDS = 300
+
+# Attempts per job, and the delay before the first retry (doubling on each further retry)
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BACKOFF_SECONDS = 30
+
+# Job states; queued and leased jobs count as pending for de-duplication
+JOB_STATUSES = ("queued", "leased", "done", "failed")
+
+
+class Job(NamedTuple):
+    """A job handed to a worker"""
+
+    id: int
+    kind: str
+    key: str
+    payload: dict[str, Any]
+    attempts: int
+
+
+class JobQueue(ABC):
+    """Interface implemented by every job queue"""
+
+    @abstractmethod
+    def enqueue(
+        self, kind: str, key: str, payload: dict[str, Any], max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> tuple[int, bool]:
+        """
+        Add a job unless a job with the same kind and key is already pending.
+
+        Returns:
+            (job id, whether a new job was created)
+        """
+
+    @abstractmethod
+    def lease(
+        self, worker_id: str, limit: int = 1, lease_seconds: int = JOB_LEASE_SECONDS
+    ) -> list[Job]:
+        """Claim up to `limit` available jobs for a worker"""
+
+    @abstractmethod
+    def extend(self, job_id: int, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> bool:
+        """Renew a lease for another `lease_seconds`; False if the worker no longer holds it"""
+
+    @abstractmethod
+    def complete(self, job_id: int, worker_id: str) -> bool:
+        """Mark a leased job as done; False if the worker no longer holds the lease"""
+
+    @abstractmethod
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """Schedule a retry of a leased job, or mark it failed after its last attempt"""
+
+    @abstractmethod
+    def counts(self) -> dict[str, int]:
+        """Number of jobs in each status"""
+
+    # Optional hook: queues without open handles keep the no-op
+    def close(self) -> None:  # noqa: B027
+        """Release any open handles"""
+
+
+class SqliteJobQueue(JobQueue):
+    """
+    Job queue stored in one SQLite file shared by all workers.
+
+    Every state change runs in an immediate transaction, so concurrent workers in
+    other processes never lease the same job. The file uses a rollback journal so
+    it can live on a network filesystem, which must support POSIX file locks.
+
+    Args:
+        path: Location of the SQLite file
+        retry_backoff: Delay before the first retry of a failed job
+    """
+
+    def __init__(self, path: str, retry_backoff: float = JOB_RETRY_BACKOFF_SECONDS):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.retry_backoff = retry_backoff
+        # Workers call the queue through asyncio.to_thread; the lock keeps their
+        # transactions on the shared connection from interleaving
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        # WAL only works between processes on one host, so workers on other
+        # machines sharing the file rely on a rollback journal
+        self._conn.execute("PRAGMA journal_mode=TRUNCATE")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, key TEXT NOT NULL, "
+            "payload TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "max_attempts INTEGER NOT NULL, available_at REAL NOT NULL, "
+            "lease_owner TEXT, lease_expires REAL, error TEXT, updated_at REAL NOT NULL)"
+        )
+        # At most one pending job per kind and key
+        self._conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS jobs_pending_key ON jobs (kind, key) "
+            "WHERE status IN ('queued', 'leased')"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_available ON jobs (status, available_at)"
+        )
+
+    def _transaction(self, work):
+        """Run work(connection) in an immediate transaction under the lock"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(
+        self, kind: str, key: str, payload: dict[str, Any], max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> tuple[int, bool]:
+        def work(conn):
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE kind = ? AND key = ? AND status IN ('queued', 'leased')",
+                (kind, key),
+            ).fetchone()
+            if row:
+                return row[0], False
+            now = time.time()
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, key, payload, status, max_attempts, available_at, "
+                "updated_at) VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                (kind, key, json.dumps(payload, ensure_ascii=False), max_attempts, now, now),
+            )
+            return cursor.lastrowid, True
+
+        return self._transaction(work)
+
+    def lease(
+        self, worker_id: str, limit: int = 1, lease_seconds: int = JOB_LEASE_SECONDS
+    ) -> list[Job]:
+        def work(conn):
+            now = time.time()
+            # Jobs whose worker died on their last attempt are not handed out again
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Lease expired on the last attempt', "
+                "lease_owner = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires <= ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            rows = conn.execute(
+                "SELECT id, kind, key, payload, attempts FROM jobs "
+                "WHERE (status = 'queued' AND available_at <= ?) "
+                "OR (status = 'leased' AND lease_expires <= ?) "
+                "ORDER BY available_at, id LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                [(worker_id, now + lease_seconds, now, row[0]) for row in rows],
+            )
+            return [
+                Job(job_id, kind, key, json.loads(payload), attempts + 1)
+                for job_id, kind, key, payload, attempts in rows
+            ]
+
+        return self._transaction(work)
+
+    def extend(self, job_id: int, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> bool:
+        def work(conn):
+            now = time.time()
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(work)
+
+    def complete(self, job_id: int, worker_id: str) -> bool:
+        def work(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, error = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time(), job_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(work)
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        def work(conn):
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (job_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return False
+            attempts, max_attempts = row
+            now = time.time()
+            if attempts >= max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', lease_owner = NULL, error = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (error, now, job_id),
+                )
+            else:
+                delay = self.retry_backoff * 2 ** (attempts - 1)
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', lease_owner = NULL, error = ?, "
+                    "available_at = ?, updated_at = ? WHERE id = ?",
+                    (error, now + delay, now, job_id),
+                )
+            return True
+
+        return self._transaction(work)
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return {status: 0 for status in JOB_STATUSES} | dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def job_queue_path(cache_folder: str, path: str | None = None) -> str:
+    """Location of the SQLite job queue used with a cache folder"""
+    return path or os.path.join(cache_folder, JOB_QUEUE_FILENAME)
+
+
+def open_job_queue(cache_folder: str, path: str | None = None) -> JobQueue:
+    """
+    Open the job queue used with a cache folder.
+
+    Args:
+        cache_folder: Cache folder the workers write results to
+        path: SQLite file to use instead of JOB_QUEUE_FILENAME in the cache folder
+
+    Returns:
+        The queue
+    """
+    return SqliteJobQueue(job_queue_path(cache_folder, path))
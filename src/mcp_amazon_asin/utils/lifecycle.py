@@ -0,0 +1,37 @@
+"""
+Shutdown of process-wide resources.
+
+Engine modules (browser pool, HTTP session, Gemini client, cache) are imported
+lazily, so shutdown only touches the ones that were actually loaded instead of
+importing everything just to close nothing.
+"""
+
+import sys
+
+
+async def shutdown_resources() -> None:
+    """Finish pending work and close every shared resource that was created"""
+    modules = sys.modules
+
+    dp = modules.get("mcp_amazon_asin.utils.dp")
+    if dp is not None:
+        await dp.wait_for_background_refreshes()
+
+    browser = modules.get("mcp_amazon_asin.utils.browser")
+    if browser is not None:
+        await browser.shutdown_browser_pool()
+
+    fetch = modules.get("mcp_amazon_asin.utils.fetch")
+    if fetch is not None:
+        await fetch.close_http_session()
+
+    prompt = modules.get("mcp_amazon_asin.utils.prompt")
+    if prompt is not None:
+        await prompt.close_gemini_client()
+
+    cache = modules.get("mcp_amazon_asin.utils.cache")
+    if cache is not None:
+        try:
+            await cache.flush_cache()
+        finally:
+            cache.close_cache_backends()
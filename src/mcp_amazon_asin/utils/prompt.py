@@ -1,23 +1,203 @@
 """
 Utilities for interacting with the Google Gemini API.
+
+Calls go through a long-lived GeminiClient that keeps its connections alive
+between requests, loads its configuration once, and retries rate-limited or
+failed requests with exponential backoff. Responses can be cached by the hash
+of everything that determines them.
 """
 
 import asyncio
+import hashlib
 import json
-from typing import Dict, Any
+import logging
+import random
+import time
 
 import aiohttp
 
 from mcp_amazon_asin import config
+from mcp_amazon_asin.utils.cache import aget_from_cache, asave_to_cache
+from mcp_amazon_asin.utils.singleflight import SingleFlight
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Generation settings sent with every prompt (maximized output length)
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "topK": 40,
+    "topP": 0.95,
+    "maxOutputTokens": 8192,  # Maximum allowed for most models
+}
+
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_ONLY_HIGH"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_ONLY_HIGH"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_ONLY_HIGH"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_ONLY_HIGH"},
+]
+
+# Generation can take a while for long answers; connecting should not
+REQUEST_TIMEOUT_SECONDS = 180
+CONNECT_TIMEOUT_SECONDS = 10
 
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# How long a cached model response is reused for an identical request
+RESPONSE_CACHE_SECONDS = 3600 * 24
+
+# Coalesces identical prompts sent at the same time
+_response_flight = SingleFlight()
+
+
+class GeminiClient:
+    """
+    Pooled, retrying client for the Gemini generateContent API.
 
-async def chat_with_gemini(prompt: str) -> str:
+    Args:
+        gemini_config: API settings (loaded from .env when omitted)
+        max_retries: Retries after the first attempt for retryable failures
+        backoff_base: Delay before the first retry; doubles on each further retry
+    """
+
+    def __init__(
+        self,
+        gemini_config: config.GeminiConfig | None = None,
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = BACKOFF_BASE_SECONDS,
+    ):
+        self.config = gemini_config or config.load_gemini_config()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(
+                    total=REQUEST_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS
+                ),
+            )
+        return self._session
+
+    def _backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to wait before retry number `attempt` (starting at 0)"""
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX_SECONDS)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base * 2**attempt, BACKOFF_MAX_SECONDS)
+        # Jitter keeps concurrent callers from retrying in lockstep
+        return delay * random.uniform(0.5, 1.0)
+
+    async def generate(self, prompt: str) -> str:
+        """
+        Send a prompt to the configured model and return the response text.
+
+        Args:
+            prompt: The text prompt to send to the model
+
+        Returns:
+            The text response from the model
+
+        Raises:
+            ValueError: If the API request fails after all retries
+        """
+        url = f"{self.config.api_url}/models/{self.config.model}:generateContent"
+        payload = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": GENERATION_CONFIG,
+            "safetySettings": SAFETY_SETTINGS,
+        }
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with self._get_session().post(
+                    url, json=payload, params={"key": self.config.api_key}
+                ) as response:
+                    if response.status == 200:
+                        response_data = await response.json()
+                        break
+                    error_text = await response.text()
+                    if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                        raise ValueError(
+                            f"API request failed with status {response.status}: {error_text}"
+                        )
+                    retry_after = response.headers.get("Retry-After")
+                    logger.debug(f"Gemini returned {response.status}, retrying")
+            except (aiohttp.ClientConnectionError, TimeoutError) as e:
+                if attempt == self.max_retries:
+                    raise ValueError(f"API request failed: {e!r}") from e
+                logger.debug(f"Gemini request failed ({e!r}), retrying")
+
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        # Extract the response text from the API response
+        try:
+            return response_data["candidates"][0]["content"]["parts"][0]["text"]
+        except (KeyError, IndexError) as e:
+            raise ValueError(
+                f"Failed to parse API response: {e}\nInput:{prompt}\nResponse: {json.dumps(response_data)}"
+            )
+
+    async def close(self) -> None:
+        """Close the pooled connections"""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+# Process-wide client, created lazily on first use
+_client: GeminiClient | None = None
+
+
+def get_gemini_client() -> GeminiClient:
+    """Return the shared Gemini client, creating it (and loading its config) on first use"""
+    global _client
+    if _client is None:
+        _client = GeminiClient()
+    return _client
+
+
+async def close_gemini_client() -> None:
+    """Close the shared Gemini client if it was ever created"""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.close()
+
+
+def response_cache_key(model: str, prompt: str) -> str:
+    """Content-addressed cache key for a request: model, generation settings and prompt"""
+    request = {
+        "model": model,
+        "generationConfig": GENERATION_CONFIG,
+        "safetySettings": SAFETY_SETTINGS,
+        "prompt": prompt,
+    }
+    digest = hashlib.sha256(
+        json.dumps(request, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return f"llm-{digest[:32]}"
+
+
+async def chat_with_gemini(prompt: str, cache_folder: str | None = None) -> str:
     """
     Send a prompt to the Gemini API and get a response.
     Uses the model specified in the config.
 
     Args:
         prompt: The text prompt to send to the model
+        cache_folder: Reuse responses to identical requests from this cache folder
+            for RESPONSE_CACHE_SECONDS (None or 'none' to always call the API)
 
     Returns:
         The text response from the model
@@ -25,51 +205,24 @@ async def chat_with_gemini(prompt: str) -> str:
     Raises:
         ValueError: If the API request fails
     """
-    api_key = config.get_gemini_api_key()
-    api_url = config.get_gemini_api_url()
-    model = config.get_gemini_model()
-
-    # Construct the full API URL
-    url = f"{api_url}/models/{model}:generateContent?key={api_key}"
-
-    # Prepare the request payload with maximized settings
-    payload = {
-        "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {
-            "temperature": 0.7,
-            "topK": 40,
-            "topP": 0.95,
-            "maxOutputTokens": 8192,  # Maximum allowed for most models
-        },
-        "safetySettings": [
-            {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_ONLY_HIGH"},
-            {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_ONLY_HIGH"},
-            {
-                "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                "threshold": "BLOCK_ONLY_HIGH",
-            },
-            {
-                "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                "threshold": "BLOCK_ONLY_HIGH",
-            },
-        ],
-    }
+    if cache_folder and cache_folder.lower() == "none":
+        cache_folder = None
 
-    # Send the request to the API
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json=payload) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                raise ValueError(
-                    f"API request failed with status {response.status}: {error_text}"
-                )
+    client = get_gemini_client()
+    key = response_cache_key(client.config.model, prompt)
 
-            response_data = await response.json()
+    cached = await aget_from_cache(key, cache_folder, ["response"], RESPONSE_CACHE_SECONDS)
+    if cached is not None:
+        logger.debug(f"Using cached model response {key}")
+        return cached["response"]
 
-            # Extract the response text from the API response
-            try:
-                return response_data["candidates"][0]["content"]["parts"][0]["text"]
-            except (KeyError, IndexError) as e:
-                raise ValueError(
-                    f"Failed to parse API response: {e}\nInput:{prompt}\nResponse: {json.dumps(response_data)}"
-                )
+    async def generate() -> str:
+        response = await client.generate(prompt)
+        await asave_to_cache(
+            key,
+            {"model": client.config.model, "response": response, "timestamp": int(time.time())},
+            cache_folder,
+        )
+        return response
+
+    return await _response_flight.do((key, cache_folder), generate)
@@ -0,0 +1,146 @@
+"""
+Compact serialization of scraped data for LLM prompts.
+
+Products are projected to the fields the model actually uses and written as a
+pipe-separated table instead of indented JSON; refinement groups become one
+de-duplicated line each. The finished prompt is kept under a token budget by
+dropping the lowest-ranked products first.
+"""
+
+import logging
+import re
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Product columns included in prompts, in table order
+PROMPT_PRODUCT_FIELDS = ["asin", "title", "price", "rating", "sold_by", "features"]
+
+# Only the first few bullet points say anything the title does not
+MAX_FEATURES_PER_PRODUCT = 3
+MAX_FEATURE_CHARS = 160
+MAX_TITLE_CHARS = 200
+
+# Sidebar controls that are not refinements
+REFINEMENT_NOISE = frozenset({"see more", "see less", "see all", "clear", "any"})
+
+# Default prompt size limit; rough estimate of 4 characters per token
+PROMPT_TOKEN_BUDGET = 8000
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budget checks (no tokenizer round trip)"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _clean(value, max_chars: int | None = None) -> str:
+    """Single-line cell text without the column separator"""
+    text = " ".join(str(value).split()).replace("|", "/")
+    if max_chars and len(text) > max_chars:
+        text = text[: max_chars - 1].rstrip() + "…"
+    return text
+
+
+def _product_row(product: dict) -> str:
+    cells = []
+    for field in PROMPT_PRODUCT_FIELDS:
+        value = product.get(field)
+        if not value:
+            cells.append("-")
+        elif field == "features":
+            features = value[:MAX_FEATURES_PER_PRODUCT]
+            cells.append("; ".join(_clean(feature, MAX_FEATURE_CHARS) for feature in features))
+        elif field == "rating":
+            # "4.5 out of 5 stars" -> "4.5/5"
+            match = re.match(r"([\d.]+) out of (\d+)", str(value))
+            cells.append(f"{match[1]}/{match[2]}" if match else _clean(value))
+        elif field == "title":
+            cells.append(_clean(value, MAX_TITLE_CHARS))
+        else:
+            cells.append(_clean(value))
+    return "|".join(cells)
+
+
+def format_products(products: list[dict]) -> str:
+    """
+    Encode products as a header line plus one pipe-separated row per product.
+
+    Args:
+        products: Product details, best ranked first
+
+    Returns:
+        The table text
+    """
+    return "\n".join(["|".join(PROMPT_PRODUCT_FIELDS), *(_product_row(p) for p in products)])
+
+
+def format_refinements(refinements: list[dict]) -> str:
+    """
+    Encode refinement groups as `type: option, option, ...` lines.
+
+    Options are de-duplicated case-insensitively, sidebar controls are dropped,
+    and groups repeating an earlier group's options are skipped.
+
+    Args:
+        refinements: Refinement groups with type and refinements
+
+    Returns:
+        One line per distinct group
+    """
+    lines = []
+    seen_groups = set()
+    for group in refinements:
+        seen_options = set()
+        options = []
+        for option in group.get("refinements", []):
+            key = _clean(option).lower()
+            if not key or key in REFINEMENT_NOISE or key in seen_options:
+                continue
+            seen_options.add(key)
+            options.append(_clean(option))
+        group_key = frozenset(seen_options)
+        if not options or group_key in seen_groups:
+            continue
+        seen_groups.add(group_key)
+        lines.append(f"{group.get('type', 'refinements')}: {', '.join(options)}")
+    return "\n".join(lines)
+
+
+def build_prompt(
+    template: str,
+    query: str,
+    products: list[dict],
+    refinements: list[dict],
+    token_budget: int = PROMPT_TOKEN_BUDGET,
+) -> str:
+    """
+    Fill a prompt template with compactly encoded products and refinements.
+
+    Args:
+        template: Template with {query}, {refinements_str} and {products_str} fields
+        query: The search query
+        products: Product details, best ranked first
+        refinements: Refinement groups from the search page sidebar
+        token_budget: Estimated token limit; lowest-ranked products are dropped to fit
+
+    Returns:
+        The formatted prompt
+    """
+    refinements_str = format_refinements(refinements)
+    base = template.format(query=query, refinements_str=refinements_str, products_str="")
+    header = "|".join(PROMPT_PRODUCT_FIELDS)
+    rows = [_product_row(product) for product in products]
+
+    # Each row costs its length plus a newline; drop from the end until it fits
+    available = token_budget * CHARS_PER_TOKEN - len(base) - len(header)
+    kept = len(rows)
+    size = sum(len(row) + 1 for row in rows)
+    while kept and size > available:
+        kept -= 1
+        size -= len(rows[kept]) + 1
+    if kept < len(rows):
+        logger.debug(f"Dropped {len(rows) - kept} lowest-ranked products to fit the prompt budget")
+
+    products_str = "\n".join([header, *rows[:kept]])
+    return template.format(query=query, refinements_str=refinements_str, products_str=products_str)
@@ -0,0 +1,67 @@
+"""
+Readiness strategies that replace fixed post-navigation sleeps.
+
+Each extractor waits only until the elements it actually reads are attached to
+the DOM (or Amazon's bot check page shows up), bounded by a per-extractor
+timeout. How long every wait took is logged at debug level.
+"""
+
+import logging
+import time
+from typing import NamedTuple
+
+from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Present on Amazon's captcha page; waiting any longer there is pointless
+BLOCKED_PAGE_SELECTOR = "form[action*='validateCaptcha']"
+
+
+class ReadinessStrategy(NamedTuple):
+    """What an extractor waits for after navigation"""
+
+    # The page is ready as soon as any of these selectors is attached
+    selectors: tuple[str, ...]
+    # Give up waiting after this many milliseconds and extract whatever is there
+    timeout_ms: int
+
+
+READINESS_STRATEGIES = {
+    "dp": ReadinessStrategy(("#productTitle",), timeout_ms=10000),
+    "search": ReadinessStrategy(("div.s-main-slot [data-asin]",), timeout_ms=10000),
+}
+
+
+async def wait_until_ready(page: Page, name: str) -> float:
+    """
+    Wait until the page is ready for the named extractor.
+
+    A timeout is not an error: the extractor still runs and reports missing fields.
+
+    Args:
+        page: The page that has just been navigated
+        name: Key into READINESS_STRATEGIES
+
+    Returns:
+        The number of seconds spent waiting
+    """
+    strategy = READINESS_STRATEGIES[name]
+    selector = ", ".join((*strategy.selectors, BLOCKED_PAGE_SELECTOR))
+
+    start = time.perf_counter()
+    timed_out = False
+    try:
+        await page.locator(selector).first.wait_for(state="attached", timeout=strategy.timeout_ms)
+    except PlaywrightTimeoutError:
+        timed_out = True
+    elapsed = time.perf_counter() - start
+
+    if timed_out:
+        logger.debug(f"Page not ready for '{name}' after {elapsed:.2f}s, extracting anyway")
+    else:
+        logger.debug(f"Page ready for '{name}' after {elapsed:.2f}s")
+    return elapsed
+
@@ -0,0 +1,188 @@
+"""
+Sliding-window work scheduling for scrape jobs.
+
+Instead of running jobs in lockstep batches, a fixed number of workers pull from
+a shared queue so a slow page only occupies its own slot. Results are yielded in
+completion order. A per-host rate limiter spaces out requests to the same site,
+and a progress tracker reports each completed step to an optional callback.
+An admission limiter bounds how many requests a long-running server works on
+at once.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any, NamedTuple
+from urllib.parse import urlsplit
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """
+    Limits how often requests are started against each host.
+
+    Args:
+        requests_per_second: Maximum request rate per host; None or 0 disables limiting
+    """
+
+    def __init__(self, requests_per_second: float | None = None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot: dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        """Sleep until a request to the URL's host may start"""
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        # Reserve the next free slot before sleeping so concurrent callers queue up
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def as_rate_limiter(rate_limit: float | HostRateLimiter | None) -> HostRateLimiter:
+    """
+    Use a shared limiter as is, or create one for a per-call rate.
+
+    Args:
+        rate_limit: A limiter shared with other calls, or requests per second (None for no limit)
+
+    Returns:
+        The limiter to wait on before each request
+    """
+    if isinstance(rate_limit, HostRateLimiter):
+        return rate_limit
+    return HostRateLimiter(rate_limit)
+
+
+# Called as steps complete with (completed, total, message, partial result or None)
+ProgressCallback = Callable[[int, int | None, str, Any], Awaitable[None]]
+
+
+class ProgressTracker:
+    """
+    Counts completed pipeline steps and reports each one to a callback.
+
+    Args:
+        callback: Receives every update; None makes the tracker a no-op
+        total: Expected number of steps, if already known
+    """
+
+    def __init__(self, callback: ProgressCallback | None = None, total: int | None = None):
+        self.callback = callback
+        self.total = total
+        self.completed = 0
+
+    async def advance(self, message: str, partial: Any = None) -> None:
+        """Mark one step as done"""
+        self.completed += 1
+        if self.callback is None:
+            return
+        try:
+            await self.callback(self.completed, self.total, message, partial)
+        except Exception as e:
+            # A broken progress consumer must not fail the work itself
+            logger.debug(f"Progress callback failed: {e}")
+
+
+class AdmissionLimiter:
+    """
+    Bounds how many requests are worked on at the same time.
+
+    Requests beyond the limit wait for a free slot; a request still waiting
+    after `timeout` seconds is rejected instead of queueing without bound.
+
+    Args:
+        limit: Maximum number of requests in flight
+        timeout: Seconds a request may wait for a slot (None to wait indefinitely)
+    """
+
+    def __init__(self, limit: int, timeout: float | None = None):
+        self.limit = max(1, limit)
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold one slot for the duration of the block.
+
+        Raises:
+            RuntimeError: If no slot became free within the timeout
+        """
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except TimeoutError:
+            raise RuntimeError(
+                f"Server busy: {self.in_flight} requests in flight and {self.waiting - 1} "
+                f"waiting, try again later"
+            ) from None
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+class JobResult(NamedTuple):
+    """Outcome of one scheduled job"""
+
+    item: Any
+    result: Any = None
+    error: BaseException | None = None
+
+
+async def run_concurrently(
+    items: Iterable[Any],
+    worker: Callable[[Any], Awaitable[Any]],
+    concurrency: int = 10,
+) -> AsyncIterator[JobResult]:
+    """
+    Run worker over items with at most `concurrency` jobs in flight.
+
+    Args:
+        items: The inputs to process
+        worker: Coroutine function called once per item
+        concurrency: Maximum number of jobs running at the same time
+
+    Yields:
+        A JobResult per item, in completion order; failures carry the exception
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+    total = queue.qsize()
+    results: asyncio.Queue[JobResult] = asyncio.Queue()
+
+    async def run_worker() -> None:
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                results.put_nowait(JobResult(item, await worker(item)))
+            except Exception as e:
+                results.put_nowait(JobResult(item, error=e))
+
+    workers = [asyncio.create_task(run_worker()) for _ in range(min(max(1, concurrency), total))]
+    try:
+        for _ in range(total):
+            yield await results.get()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
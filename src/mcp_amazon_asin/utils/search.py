@@ -1,211 +1,566 @@
 import asyncio
-import json
+import functools
+import hashlib
 import logging
 import os
-from playwright.async_api import async_playwright
-from mcp_amazon_asin.utils import get_amazon_search_page_url
+import time
+from collections.abc import AsyncIterator
+
+from mcp_amazon_asin.config import get_search_cache_sort_tokens
+from mcp_amazon_asin.utils import get_amazon_search_page_url, normalize_query
+from mcp_amazon_asin.utils.browser import get_browser_pool
+from mcp_amazon_asin.utils.cache import aget_from_cache, asave_to_cache
 from mcp_amazon_asin.utils.dp import extract_dp
 from mcp_amazon_asin.utils.prompt import chat_with_gemini
+from mcp_amazon_asin.utils.prompt_builder import build_prompt
+from mcp_amazon_asin.utils.readiness import wait_until_ready
+from mcp_amazon_asin.utils.scheduler import (
+    HostRateLimiter,
+    ProgressCallback,
+    ProgressTracker,
+    as_rate_limiter,
+    run_concurrently,
+)
+from mcp_amazon_asin.utils.singleflight import SingleFlight
 from mcp_amazon_asin.utils.utils import load_prompt_template, save_to_temp_file
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
-async def extract_search_asin(
-    query: str, limit: int = 100, cache_folder: str = "cache"
-) -> list[dict]:
-    """Extracts search result summaries for a given Amazon search query (fast version)"""
-    url = get_amazon_search_page_url(query)
+# Coalesce concurrent loads of the same search page
+_search_flight = SingleFlight()
+
+# How long search results and refinement sidebars stay cached
+SEARCH_CACHE_SECONDS = 3600 * 6
+
+# Result pages loaded at the same time when a limit spans several pages
+SEARCH_PAGE_CONCURRENCY = 4
+
+# Subfolder of the cache folder that receives search result screenshots
+SCREENSHOT_SUBFOLDER = "screenshots"
+
+# Maximum number of result screenshots captured at the same time
+SCREENSHOT_CONCURRENCY = 4
+
+# Reads every search result card in one page.evaluate
+_EXTRACT_RESULTS_JS = """
+({withRects}) => {
+    const cards = document.querySelectorAll(
+        "div.s-main-slot div[data-asin][data-index][role='listitem']"
+    );
+    const results = [];
+    for (const el of cards) {
+        const asin = el.getAttribute('data-asin')?.trim();
+        if (!asin) continue;
+
+        const index = el.getAttribute('data-index');
+        const span = el.querySelector('a h2 span');
+
+        // Sponsored check
+        const sponsorEl = el.querySelector("span.a-declarative span, span.a-declarative");
+        const sponsored = sponsorEl && sponsorEl.textContent.trim().startsWith("Sponsored");
+
+        const result = {
+            asin: asin,
+            index: index ? parseInt(index) : null,
+            title: span ? span.textContent.trim() : null,
+            sponsored: sponsored || false
+        };
+        if (withRects) {
+            // Document coordinates, so the clip works without scrolling
+            const rect = el.getBoundingClientRect();
+            result.rect = {
+                x: rect.left + window.scrollX,
+                y: rect.top + window.scrollY,
+                width: rect.width,
+                height: rect.height
+            };
+        }
+        results.push(result);
+    }
+    return results;
+}
+"""
+
+# Reads the refinement sidebar as {type, refinements} pairs
+_EXTRACT_REFINEMENTS_JS = """
+() => {
+    const refinementPairs = [];
+    const refinementSection = document.querySelector('#s-refinements');
+
+    if (refinementSection) {
+        // Target the specific structure: #s-refinements > .a-section.a-spacing-double-large > div
+        const sections = refinementSection.querySelectorAll('.a-section.a-spacing-double-large > div');
+
+        sections.forEach(div => {
+            const id = div.id;
+            const innerText = div.innerText?.trim();
+            if (id && id.trim().length > 0 && innerText) {
+                const textLines = innerText.split('\\n').map(line => line.trim()).filter(line => line.length > 0);
+                refinementPairs.push({
+                    type: id.trim(),
+                    refinements: textLines
+                });
+            }
+        });
+    }
 
-    logger.debug(f"Searching Amazon for '{query}' (limit: {limit})")
+    return refinementPairs;
+}
+"""
+
+# Highest page number shown in the pagination strip (1 if there is none)
+_EXTRACT_PAGE_COUNT_JS = """
+() => {
+    let pageCount = 1;
+    for (const el of document.querySelectorAll('.s-pagination-strip .s-pagination-item')) {
+        const number = parseInt(el.textContent.trim(), 10);
+        if (!isNaN(number)) pageCount = Math.max(pageCount, number);
+    }
+    return pageCount;
+}
+"""
 
-    # Handle cache_folder parameter (used for screenshots)
-    if cache_folder and cache_folder.lower() == "none":
-        cache_folder = None
 
-    # Create cache directory if it doesn't exist
-    if cache_folder:
-        os.makedirs(cache_folder, exist_ok=True)
+@functools.lru_cache(maxsize=1)
+def _search_cache_sort_tokens() -> bool:
+    """SEARCH_CACHE_SORT_TOKENS, read once instead of re-reading .env for every key"""
+    return get_search_cache_sort_tokens()
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
 
-        # Set user agent to avoid bot detection
-        await page.set_extra_http_headers(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/91.0.4472.124 Safari/537.36"
-            }
-        )
+def _normalize_search_query(query: str) -> str:
+    """Query form shared by the cache key and the in-flight key of a search page"""
+    return normalize_query(query, sort_tokens=_search_cache_sort_tokens())
 
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(2000)
 
-        results = []
+def _search_cache_key(kind: str, query: str, page: int = 1) -> str:
+    """File-name safe cache key for a search page view of a normalized query"""
+    digest = hashlib.sha1(_normalize_search_query(query).encode("utf-8")).hexdigest()[:16]
+    return f"{kind}-{digest}" if page == 1 else f"{kind}-{digest}-p{page}"
 
-        base = page.locator(
-            "div.s-main-slot div[data-asin][data-index][role='listitem']"
-        )
-        count = await base.count()
 
-        for i in range(min(count, limit)):
-            item = base.nth(i)
+async def _save_result_screenshots(page, results: list[dict], screenshot_folder: str) -> None:
+    """Capture each result card by clipping the page, a bounded number at a time"""
+    semaphore = asyncio.Semaphore(SCREENSHOT_CONCURRENCY)
+
+    async def capture(result: dict) -> None:
+        rect = result.pop("rect", None)
+        if not rect or not rect["width"] or not rect["height"]:
+            return
+        async with semaphore:
             try:
-                data = await item.evaluate(
-                    """
-                    (el) => {
-                        const asin = el.getAttribute('data-asin');
-                        const index = el.getAttribute('data-index');
-                        const span = el.querySelector('a h2 span');
-                        const title = span ? span.textContent.trim() : null;
-
-                        // Sponsored check
-                        const sponsorEl = el.querySelector("span.a-declarative span, span.a-declarative");
-                        const sponsored = sponsorEl && sponsorEl.textContent.trim().startsWith("Sponsored");
-
-
-                        return {
-                            asin: asin?.trim() || null,
-                            index: index ? parseInt(index) : null,
-                            title: title,
-                            sponsored: sponsored || false
-                        };
-                    }
-                    """
+                await page.screenshot(
+                    path=f"{screenshot_folder}/{result['asin']}.png", clip=rect, full_page=True
                 )
-                if data and data.get("asin"):
-                    # Save screenshot if cache_folder is specified
-                    if cache_folder and data.get("asin"):
-                        try:
-                            await item.screenshot(
-                                path=f"{cache_folder}/{data['asin']}.png"
-                            )
-                            logger.debug(f"Saved screenshot for {data['asin']}")
-                        except Exception as e:
-                            logger.debug(
-                                f"Failed to save screenshot for {data['asin']}: {e}"
-                            )
-                            # Continue if screenshot fails
-
-                    results.append(data)
-            except Exception:
-                continue
+                logger.debug(f"Saved screenshot for {result['asin']}")
+            except Exception as e:
+                # Continue if screenshot fails
+                logger.debug(f"Failed to save screenshot for {result['asin']}: {e}")
 
-        await browser.close()
-        logger.debug(f"Found {len(results)} results for '{query}'")
-        return results
+    await asyncio.gather(*[capture(result) for result in results])
 
 
-async def extract_refinements(query: str) -> list[dict]:
-    """Extracts available refinement categories from Amazon search page sidebar"""
-    logger.debug(f"Extracting refinement categories for '{query}'")
+async def extract_search_page(
+    query: str,
+    limit: int = 100,
+    cache_folder: str = "cache",
+    screenshots: bool = False,
+    page: int = 1,
+    rate_limit: float | HostRateLimiter | None = None,
+) -> dict:
+    """
+    Load a search page once and read both its result cards and refinement sidebar.
+
+    Args:
+        query: The search query
+        limit: Maximum number of results to screenshot (every card is read)
+        cache_folder: Cache folder for the page data; screenshots go to its screenshots/ subfolder (use 'none' to disable)
+        screenshots: Save a PNG of each of the first `limit` result cards
+        page: Result page number, starting at 1
+        rate_limit: Maximum requests per second to Amazon, or a limiter shared with
+            other calls (None for no limit)
 
-    """Extracts available refinement categories from Amazon search page sidebar (fast version)"""
-    url = get_amazon_search_page_url(query)
+    Returns:
+        Dictionary with "results" (asin, index, page, title, sponsored),
+        "refinements" (type, refinements) and "page_count"
+    """
+    # Handle cache_folder parameter
+    if cache_folder and cache_folder.lower() == "none":
+        cache_folder = None
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+    # Screenshots are only written when there is a folder to put them in
+    screenshots = bool(screenshots and cache_folder)
 
-        # Set user agent to avoid bot detection
-        await page.set_extra_http_headers(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/91.0.4472.124 Safari/537.36"
-            }
+    # Screenshots need the live page, so they always load it
+    if not screenshots:
+        cached = await aget_from_cache(
+            _search_cache_key("search", query, page),
+            cache_folder,
+            ["results", "refinements", "page_count"],
+            SEARCH_CACHE_SECONDS,
         )
+        if cached is not None:
+            return {
+                "results": cached["results"],
+                "refinements": cached["refinements"],
+                "page_count": cached["page_count"],
+            }
+
+    # Concurrent loads of the same page are shared, whichever view asked for them
+    key = (_normalize_search_query(query), page, cache_folder, limit if screenshots else None)
+    return await _search_flight.do(
+        key,
+        lambda: _scrape_search_page(
+            query, limit, cache_folder, screenshots, page, as_rate_limiter(rate_limit)
+        ),
+    )
+
+
+async def _scrape_search_page(
+    query: str,
+    limit: int,
+    cache_folder: str | None,
+    screenshots: bool,
+    page_number: int,
+    rate_limiter: HostRateLimiter | None = None,
+) -> dict:
+    """Navigate to a search page once and extract result cards and the sidebar"""
+    url = get_amazon_search_page_url(query, page_number)
+
+    logger.debug(f"Loading search page {page_number} for '{query}'")
+
+    # Keep images out of the cache store itself
+    screenshot_folder = os.path.join(cache_folder, SCREENSHOT_SUBFOLDER) if screenshots else None
+    if screenshot_folder:
+        os.makedirs(screenshot_folder, exist_ok=True)
 
+    # Wait for the rate limit before taking a page out of the pool
+    if rate_limiter:
+        await rate_limiter.wait(url)
+
+    # Screenshots need images and styles; plain extraction blocks them
+    async with get_browser_pool().page("off" if screenshots else None) as page:
         await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(2000)
+        # The sidebar is rendered with the result slot, so one wait covers both
+        await wait_until_ready(page, "search")
+
+        try:
+            results = await page.evaluate(_EXTRACT_RESULTS_JS, {"withRects": screenshots})
+        except Exception as e:
+            logger.debug(f"Failed to extract search results for '{query}': {e}")
+            results = []
 
         try:
-            refinements = await page.evaluate(
-                """
-                () => {
-                    const refinementPairs = [];
-                    const refinementSection = document.querySelector('#s-refinements');
-                    
-                    if (refinementSection) {
-                        // Target the specific structure: #s-refinements > .a-section.a-spacing-double-large > div
-                        const sections = refinementSection.querySelectorAll('.a-section.a-spacing-double-large > div');
-                        
-                        sections.forEach(div => {
-                            const id = div.id;
-                            const innerText = div.innerText?.trim();
-                            if (id && id.trim().length > 0 && innerText) {
-                                const textLines = innerText.split('\\n').map(line => line.trim()).filter(line => line.length > 0);
-                                refinementPairs.push({
-                                    type: id.trim(),
-                                    refinements: textLines
-                                });
-                            }
-                        });
-                    }
-                    
-                    return refinementPairs;
-                }
-                """
-            )
-        except Exception:
+            refinements = await page.evaluate(_EXTRACT_REFINEMENTS_JS)
+        except Exception as e:
+            logger.debug(f"Failed to extract refinements for '{query}': {e}")
             refinements = []
 
-        await browser.close()
-        logger.debug(f"Found {len(refinements)} refinement categories for '{query}'")
-        return refinements
+        try:
+            page_count = await page.evaluate(_EXTRACT_PAGE_COUNT_JS)
+        except Exception as e:
+            logger.debug(f"Failed to read the page count for '{query}': {e}")
+            page_count = page_number
+
+        if screenshot_folder:
+            await _save_result_screenshots(page, results[:limit], screenshot_folder)
+            for result in results:
+                result.pop("rect", None)
+
+    for result in results:
+        result["page"] = page_number
+
+    logger.debug(
+        f"Found {len(results)} results and {len(refinements)} refinement categories "
+        f"on page {page_number}/{page_count} for '{query}'"
+    )
 
+    # Empty pages are usually blocks or timeouts, so they are not cached
+    if results:
+        await asave_to_cache(
+            _search_cache_key("search", query, page_number),
+            {
+                "query": query,
+                "page": page_number,
+                "page_count": page_count,
+                "results": results,
+                "refinements": refinements,
+                "timestamp": int(time.time()),
+            },
+            cache_folder,
+        )
+    return {"results": results, "refinements": refinements, "page_count": page_count}
 
-async def extract_themed_products(
-    query: str, limit: int = 50, batch_size: int = 10, cache_folder: str = "cache"
+
+async def _paginate_search_results(
+    query: str,
+    limit: int,
+    cache_folder: str | None,
+    screenshots: bool,
+    first_page: dict,
+    rate_limiter: HostRateLimiter | None = None,
 ) -> list[dict]:
     """
-    Get themed product recommendations for a search query.
-    
+    Collect up to `limit` distinct results, loading further pages only as needed.
+
+    Pages after the first are loaded SEARCH_PAGE_CONCURRENCY at a time, and no
+    further window is started once enough distinct ASINs have been seen.
+    """
+    results: list[dict] = []
+    seen: set[str] = set()
+
+    def add(page_results: list[dict]) -> None:
+        # Sponsored cards and reshuffled listings repeat across pages
+        for result in page_results:
+            if len(results) >= limit:
+                return
+            if result["asin"] not in seen:
+                seen.add(result["asin"])
+                results.append(result)
+
+    async def load(page: int) -> dict:
+        return await extract_search_page(
+            query, limit, cache_folder, screenshots, page, rate_limiter
+        )
+
+    add(first_page["results"])
+    page_count = first_page["page_count"]
+    per_page = max(1, len(first_page["results"]))
+    next_page = 2
+
+    while len(results) < limit and next_page <= page_count:
+        # Only load as many pages as the remaining results should need
+        needed = -(-(limit - len(results)) // per_page)
+        last_page = min(page_count, next_page + min(needed, SEARCH_PAGE_CONCURRENCY) - 1)
+        window = list(range(next_page, last_page + 1))
+        next_page = last_page + 1
+
+        pages = {}
+        async for job in run_concurrently(window, load, len(window)):
+            if job.error is not None:
+                logger.debug(f"Failed to load search page {job.item} for '{query}': {job.error!s}")
+                continue
+            pages[job.item] = job.result
+
+        # Merge in page order so the ranking is preserved
+        for page in window:
+            if page in pages:
+                add(pages[page]["results"])
+        if not any(pages.get(page, {}).get("results") for page in window):
+            # Blocked or past the last real page; more requests would not help
+            break
+
+    return results
+
+
+async def extract_search_asin(
+    query: str,
+    limit: int = 100,
+    cache_folder: str = "cache",
+    screenshots: bool = False,
+    rate_limit: float | HostRateLimiter | None = None,
+) -> list[dict]:
+    """
+    Extracts search result summaries for a given Amazon search query (fast version)
+
     Args:
         query: The search query
-        limit: Maximum number of products to fetch details for
-        batch_size: Number of products to process in parallel per batch
-        cache_folder: Cache folder for JSON data (use 'none' to disable)
-        
+        limit: Maximum number of results to return
+        cache_folder: Cache folder for results; screenshots go to its screenshots/ subfolder (use 'none' to disable)
+        screenshots: Save a PNG of every result card
+        rate_limit: Maximum requests per second to Amazon, or a limiter shared with
+            other calls (None for no limit); applies to every page load
+
     Returns:
-        List of detailed product information
+        List of results with asin, index, title and sponsored flag
     """
-    logger.debug(f"Getting themed products for '{query}' (limit: {limit}, batch_size: {batch_size})")
-    
+    logger.debug(f"Searching Amazon for '{query}' (limit: {limit})")
+    # One limiter covers the first page and every further page
+    rate_limiter = as_rate_limiter(rate_limit)
+    first_page = await extract_search_page(query, limit, cache_folder, screenshots, 1, rate_limiter)
+    return await _paginate_search_results(
+        query, limit, cache_folder, screenshots, first_page, rate_limiter
+    )
+
+
+async def extract_refinements(
+    query: str,
+    cache_folder: str = "cache",
+    rate_limit: float | HostRateLimiter | None = None,
+) -> list[dict]:
+    """
+    Extracts available refinement categories from Amazon search page sidebar
+
+    Args:
+        query: The search query
+        cache_folder: Cache folder for the search page data (use 'none' to disable)
+        rate_limit: Maximum requests per second to Amazon, or a limiter shared with
+            other calls (None for no limit)
+
+    Returns:
+        List of refinement groups with type and refinement labels
+    """
+    logger.debug(f"Extracting refinement categories for '{query}'")
+    search_page = await extract_search_page(
+        query, cache_folder=cache_folder, rate_limit=rate_limit
+    )
+    return search_page["refinements"]
+
+
+async def _themed_asins(
+    query: str, limit: int, cache_folder: str | None, rate_limiter: HostRateLimiter
+) -> list[str]:
+    """ASINs of the search results for a query, in search result order"""
+    search_results = await extract_search_asin(query, limit, cache_folder, rate_limit=rate_limiter)
+    return [result["asin"] for result in search_results if result and result["asin"]]
+
+
+async def _iter_product_details(
+    asins: list[str],
+    concurrency: int,
+    cache_folder: str | None,
+    rate_limit: float | HostRateLimiter | None,
+    progress: ProgressTracker | None = None,
+) -> AsyncIterator[dict]:
+    """Fetch product details through a sliding window of workers, in completion order"""
+    progress = progress or ProgressTracker()
+    rate_limiter = as_rate_limiter(rate_limit)
+
+    async def fetch(asin: str) -> dict:
+        return await extract_dp(asin, cache_folder=cache_folder, rate_limiter=rate_limiter)
+
+    async for job in run_concurrently(asins, fetch, concurrency):
+        if job.error is not None:
+            logger.error(f"Failed to fetch product {job.item}: {job.error!s}")
+            await progress.advance(f"Failed to fetch product {job.item}")
+            continue
+        await progress.advance(f"Fetched product {job.item}", job.result)
+        yield job.result
+
+
+async def _themed_products(
+    query: str,
+    limit: int,
+    concurrency: int,
+    cache_folder: str,
+    rate_limit: float | HostRateLimiter | None,
+    on_progress: ProgressCallback | None,
+) -> tuple[list[str], AsyncIterator[dict]]:
+    """Search once, then return the ranked ASINs and a stream of their details"""
+    logger.debug(
+        f"Getting themed products for '{query}' (limit: {limit}, concurrency: {concurrency})"
+    )
+
     # Convert 'none' string to None to disable caching
     cache_param = None if cache_folder and cache_folder.lower() == "none" else cache_folder
 
-    # Step 1: Get search results using the limit parameter
-    search_results = await extract_search_asin(query, limit, cache_param)
+    # The search and the product pages share one limiter
+    rate_limiter = as_rate_limiter(rate_limit)
+    progress = ProgressTracker(on_progress)
+    asins = await _themed_asins(query, limit, cache_param, rate_limiter)
+    progress.total = 1 + len(asins)
+    await progress.advance(f"Found {len(asins)} products for '{query}'")
+    return asins, _iter_product_details(asins, concurrency, cache_param, rate_limiter, progress)
+
+
+async def iter_themed_products(
+    query: str,
+    limit: int = 50,
+    concurrency: int = 10,
+    cache_folder: str = "cache",
+    rate_limit: float | HostRateLimiter | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Stream detailed products for a search query as soon as each one is fetched.
 
-    # Step 2: Get all ASINs and process them in batches
-    asins = [result["asin"] for result in search_results if result and result["asin"]]
+    Args:
+        query: The search query
+        limit: Maximum number of products to fetch details for
+        concurrency: Maximum number of product pages fetched at the same time
+        cache_folder: Cache folder for JSON data (use 'none' to disable)
+        rate_limit: Maximum requests per second to Amazon, or a limiter shared with
+            other calls (None for no limit)
+        on_progress: Called after the search and after each product, with the
+            product as the partial result
+
+    Yields:
+        Detailed product information in completion order; products that fail
+        to load are logged and skipped
+    """
+    _, products = await _themed_products(
+        query, limit, concurrency, cache_folder, rate_limit, on_progress
+    )
+    async for product in products:
+        yield product
+
+
+async def extract_themed_products(
+    query: str,
+    limit: int = 50,
+    concurrency: int = 10,
+    cache_folder: str = "cache",
+    rate_limit: float | HostRateLimiter | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> list[dict]:
+    """
+    Get themed product recommendations for a search query.
 
-    products = []
-    if asins:
-        # Calculate total number of batches
-        total_batches = (len(asins) + batch_size - 1) // batch_size
+    Collects the stream of iter_themed_products and restores the search ranking.
 
-        # Process ASINs in batches
-        for i in range(0, len(asins), batch_size):
-            batch = asins[i : i + batch_size]
-            batch_asins = ", ".join(batch)
-            current_batch = i // batch_size + 1
-            logger.debug(f"Processing batch {current_batch}/{total_batches}: {len(batch)} ASINs [{batch_asins}]")
-            batch_products = await asyncio.gather(
-                *[extract_dp(asin, cache_folder=cache_param) for asin in batch]
-            )
-            products.extend(batch_products)
+    Args:
+        query: The search query
+        limit: Maximum number of products to fetch details for
+        concurrency: Maximum number of product pages fetched at the same time
+        cache_folder: Cache folder for JSON data (use 'none' to disable)
+        rate_limit: Maximum requests per second to Amazon, or a limiter shared with
+            other calls (None for no limit)
+        on_progress: Called after the search and after each product, with the
+            product as the partial result
+
+    Returns:
+        List of detailed product information, in search result order
+    """
+    asins, stream = await _themed_products(
+        query, limit, concurrency, cache_folder, rate_limit, on_progress
+    )
+    products = _rank_products(asins, [product async for product in stream])
 
     logger.debug(f"Found {len(products)} themed products for '{query}'")
     return products
 
 
+def _rank_products(asins: list[str], products: list[dict]) -> list[dict]:
+    """Sort products that arrived in completion order back into the order of asins"""
+    rank = {asin: position for position, asin in reversed(list(enumerate(asins)))}
+    return sorted(products, key=lambda product: rank[product["asin"]])
+
+
+async def _collect_product_details(
+    asins: list[str],
+    concurrency: int,
+    cache_folder: str | None,
+    rate_limit: float | HostRateLimiter | None,
+    progress: ProgressTracker | None = None,
+) -> list[dict]:
+    """Fetch product details for ASINs and return them in the given order"""
+    products = [
+        product
+        async for product in _iter_product_details(
+            asins, concurrency, cache_folder, rate_limit, progress
+        )
+    ]
+    return _rank_products(asins, products)
+
+
 async def get_seller_recommendations(
-    query: str, product_limit: int = 10, batch_size: int = 5, cache_folder: str = "cache"
+    query: str,
+    product_limit: int = 10,
+    concurrency: int = 5,
+    cache_folder: str = "cache",
+    rate_limit: float | HostRateLimiter | None = None,
+    on_progress: ProgressCallback | None = None,
 ) -> dict:
     """
     Get seller recommendations based on the query.
@@ -213,8 +568,12 @@ async def get_seller_recommendations(
     Args:
         query: The search query
         product_limit: Maximum number of products to analyze
-        batch_size: Number of products to process in parallel
+        concurrency: Maximum number of product pages fetched at the same time
         cache_folder: Cache folder for JSON data (use 'none' to disable)
+        rate_limit: Maximum requests per second to Amazon, or a limiter shared with
+            other calls (None for no limit)
+        on_progress: Called after the search, after each product (with the
+            product as the partial result) and after the recommendations
         
     Returns:
         Dictionary containing products, categories, and AI-generated recommendations
@@ -224,31 +583,43 @@ async def get_seller_recommendations(
     # Convert 'none' string to None to disable caching
     cache_param = None if cache_folder and cache_folder.lower() == "none" else cache_folder
     
-    # Run both API calls in parallel
-    logger.debug("Fetching product information and category refinements in parallel...")
-    products, categories = await asyncio.gather(
-        extract_themed_products(query, product_limit, batch_size, cache_param),
-        extract_refinements(query),
+    # One search page load provides both the products to analyze and the categories
+    logger.debug("Fetching search results and category refinements...")
+    rate_limiter = as_rate_limiter(rate_limit)
+    search_page = await extract_search_page(
+        query, product_limit, cache_param, rate_limit=rate_limiter
+    )
+    results = await _paginate_search_results(
+        query, product_limit, cache_param, False, search_page, rate_limiter
+    )
+    asins = [result["asin"] for result in results if result["asin"]]
+    categories = search_page["refinements"]
+
+    # Search, one step per product, then the recommendations
+    progress = ProgressTracker(on_progress, total=len(asins) + 2)
+    await progress.advance(
+        f"Found {len(asins)} products and {len(categories)} categories for '{query}'",
+        {"categories": categories},
+    )
+
+    logger.debug("Fetching product information...")
+    products = await _collect_product_details(
+        asins, concurrency, cache_param, rate_limiter, progress
     )
     
-    # Convert to JSON strings for the prompt
-    products_str = json.dumps(products, indent=2, ensure_ascii=False)
-    refinements_str = json.dumps(categories, indent=2, ensure_ascii=False)
-    
-    # Load the prompt template and format it with the data
+    # Load the prompt template and fill it with compactly encoded data
     prompt_template = load_prompt_template("seller_recommendation")
-    enhanced_prompt = prompt_template.format(
-        query=query, refinements_str=refinements_str, products_str=products_str
-    )
+    enhanced_prompt = build_prompt(prompt_template, query, products, categories)
     logger.debug("Prompt template loaded and formatted")
     
     # Send the enhanced prompt to Gemini
     logger.debug("Generating seller recommendations...")
-    response = await chat_with_gemini(enhanced_prompt)
+    response = await chat_with_gemini(enhanced_prompt, cache_param)
     
     # Save the response to a temporary file
     tmp_file_path = save_to_temp_file(response, prefix="seller_recommendation_")
     logger.debug(f"Response saved to temporary file: {tmp_file_path}")
+    await progress.advance("Generated seller recommendations")
     
     # Return all the data
     return {
@@ -1,25 +1,82 @@
-import importlib.util
+"""
+Playwright browser installation checks.
+
+Startup only probes the filesystem for the Chromium build the installed
+Playwright expects; downloading browsers is an explicit step
+(`amazon-asin-cli install-browser`), never a side effect of starting the server.
+"""
+
+import functools
+import json
 import logging
+import os
 import subprocess
 import sys
+from pathlib import Path
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Browser builds that can serve a headless Chromium launch
+CHROMIUM_BROWSER_NAMES = ("chromium-headless-shell", "chromium")
+
+
+def _browsers_path() -> Path:
+    """Where Playwright keeps downloaded browsers on this platform"""
+    configured = os.getenv("PLAYWRIGHT_BROWSERS_PATH")
+    if configured and configured != "0":
+        return Path(configured).expanduser()
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "ms-playwright"
+    if sys.platform == "win32":
+        return Path(os.getenv("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / "ms-playwright"
+    return Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "ms-playwright"
+
+
+@functools.lru_cache(maxsize=1)
+def chromium_installed() -> bool:
+    """
+    Check, without starting Playwright, whether its Chromium build is installed.
+
+    The result is cached for the life of the process; call
+    chromium_installed.cache_clear() after installing.
+
+    Returns:
+        True if a Chromium build matching the installed Playwright is on disk
+    """
+    try:
+        import playwright
+
+        manifest = Path(playwright.__file__).parent / "driver" / "package" / "browsers.json"
+        revisions = {
+            browser["name"]: browser["revision"]
+            for browser in json.loads(manifest.read_text(encoding="utf-8"))["browsers"]
+        }
+    except Exception as e:
+        logger.debug(f"Could not read the Playwright browser manifest: {e}")
+        return False
+
+    browsers_path = _browsers_path()
+    for name in CHROMIUM_BROWSER_NAMES:
+        if name not in revisions:
+            continue
+        folder = browsers_path / f"{name.replace('-', '_')}-{revisions[name]}"
+        # Playwright writes this marker once a download is complete
+        if (folder / "INSTALLATION_COMPLETE").exists():
+            return True
+    return False
+
 
 def setup_playwright():
-    # Check if playwright is installed
-    if importlib.util.find_spec("playwright") is None:
-        logger.debug("📦 Playwright not found. Installing via pip...")
-        subprocess.run(
-            [sys.executable, "-m", "pip", "install", "playwright"], check=True
-        )
-    else:
-        logger.debug("✅ Playwright already installed.")
+    """Install Playwright's Chromium build unless it is already present"""
+    if chromium_installed():
+        logger.debug("✅ Chromium browser already installed.")
+        return
 
     # Ensure the browser binaries are installed
     try:
-        subprocess.run(["playwright", "install", "chromium"], check=True)
+        subprocess.run([sys.executable, "-m", "playwright", "install", "chromium"], check=True)
+        chromium_installed.cache_clear()
         logger.debug("✅ Chromium browser installed.")
     except subprocess.CalledProcessError:
         logger.error("⚠️ Failed to install Chromium browser. Try manually running:")
@@ -0,0 +1,55 @@
+"""
+In-process request coalescing ("single flight").
+
+Concurrent callers asking for the same key share one in-flight coroutine and all
+receive its result (or exception) instead of each doing the work again.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key"""
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() unless a call with the same key is already in flight, then await it.
+
+        The shared call runs as its own task, so cancelling one caller does not
+        cancel the work for the others.
+
+        Args:
+            key: Identifies equivalent calls
+            fn: Coroutine function producing the result
+
+        Returns:
+            The result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            logger.debug(f"Joining in-flight call for {key!r}")
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        return len(self._calls)
@@ -0,0 +1,227 @@
+"""
+Workers that process scrape jobs from a job queue.
+
+A job runs through the same engines as a direct call (extract_dp or
+extract_search_asin), so its result ends up in the shared cache folder where any
+later call finds it. Each worker keeps a bounded number of jobs in flight on one
+event loop; several worker processes, on one or more machines, scale it out.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import socket
+import uuid
+from collections.abc import Iterable
+
+from mcp_amazon_asin.utils import dp, normalize_query, search
+from mcp_amazon_asin.utils.cache import flush_cache
+from mcp_amazon_asin.utils.fields import REQUIRED_PRODUCT_FIELDS
+from mcp_amazon_asin.utils.jobqueue import JOB_LEASE_SECONDS, Job, JobQueue, SqliteJobQueue
+from mcp_amazon_asin.utils.lifecycle import shutdown_resources
+from mcp_amazon_asin.utils.scheduler import HostRateLimiter
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Kinds of job a worker can run
+JOB_KINDS = ("product", "search")
+
+# How long a worker without work waits before asking the queue again
+WORKER_POLL_SECONDS = 1.0
+
+# Running jobs renew their lease this many times per lease period
+LEASE_RENEWALS_PER_PERIOD = 3
+
+
+def enqueue_jobs(
+    queue: JobQueue, kind: str, items: Iterable[str], limit: int = 100
+) -> tuple[int, int]:
+    """
+    Queue one job per ASIN or search query.
+
+    Args:
+        queue: The job queue
+        kind: "product" for ASINs or "search" for queries
+        items: ASINs or search queries
+        limit: Number of search results per query (search jobs only)
+
+    Returns:
+        (jobs created, items skipped because the same job is already pending)
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind '{kind}'. Expected one of {JOB_KINDS}.")
+
+    created = skipped = 0
+    for item in items:
+        if kind == "product":
+            asin = item.strip().upper()
+            _, is_new = queue.enqueue(kind, asin, {"asin": asin})
+        else:
+            key = f"{normalize_query(item)}|{limit}"
+            _, is_new = queue.enqueue(kind, key, {"query": item, "limit": limit})
+        created += is_new
+        skipped += not is_new
+    return created, skipped
+
+
+async def _run_job(
+    job: Job, cache_folder: str, engine: str, rate_limiter: HostRateLimiter
+) -> None:
+    # Captchas, partial pages and empty searches return without raising but leave
+    # nothing in the cache, so they fail the attempt and go through the retries
+    if job.kind == "product":
+        # Retries follow the queue's backoff, not the shorter-lived failure cache
+        product = await dp.extract_dp(
+            job.payload["asin"],
+            cache_folder=cache_folder,
+            engine=engine,
+            rate_limiter=rate_limiter,
+            use_failure_cache=False,
+        )
+        missing = [field for field in REQUIRED_PRODUCT_FIELDS if product.get(field) is None]
+        if missing:
+            raise ValueError(f"Incomplete product page for {job.key}, missing {missing}")
+    elif job.kind == "search":
+        results = await search.extract_search_asin(
+            job.payload["query"], job.payload["limit"], cache_folder, rate_limit=rate_limiter
+        )
+        if not results:
+            raise ValueError(f"No search results for '{job.payload['query']}'")
+    else:
+        raise ValueError(f"Unknown job kind '{job.kind}'")
+    # A job only counts as done once its result is in the shared cache; a failed
+    # write raises here and the attempt is retried
+    await flush_cache()
+
+
+async def run_worker(
+    queue: JobQueue,
+    cache_folder: str = "cache",
+    concurrency: int = 4,
+    engine: str = "auto",
+    rate_limit: float | None = None,
+    drain: bool = False,
+    worker_id: str | None = None,
+    lease_seconds: int = JOB_LEASE_SECONDS,
+    poll_seconds: float = WORKER_POLL_SECONDS,
+) -> dict[str, int]:
+    """
+    Lease and run jobs until cancelled, or until the queue is empty with `drain`.
+
+    Args:
+        queue: The job queue
+        cache_folder: Shared cache folder the results are written to
+        concurrency: Maximum number of jobs in flight in this worker
+        engine: Scraping engine for product jobs
+        rate_limit: Maximum requests per second to Amazon from this worker
+        drain: Stop once no job is queued or leased anywhere
+        worker_id: Lease owner name (host, process id and a random suffix by default)
+        lease_seconds: How long a job stays leased without renewal; running jobs renew
+            their lease, so only jobs of a worker that died are taken over
+        poll_seconds: How long to wait before asking an empty queue again
+
+    Returns:
+        Counts of jobs done and of failed attempts
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    rate_limiter = HostRateLimiter(rate_limit)
+    stats = {"done": 0, "errors": 0}
+
+    async def keep_leased(job: Job) -> None:
+        # Slow jobs keep their lease; only a dead worker's jobs are taken over
+        while True:
+            await asyncio.sleep(lease_seconds / LEASE_RENEWALS_PER_PERIOD)
+            if not await asyncio.to_thread(queue.extend, job.id, worker_id, lease_seconds):
+                logger.warning(f"Job {job.id} lost its lease while running")
+                return
+
+    async def process(job: Job) -> None:
+        renewal = asyncio.create_task(keep_leased(job))
+        try:
+            try:
+                await _run_job(job, cache_folder, engine, rate_limiter)
+            finally:
+                renewal.cancel()
+        except Exception as e:
+            logger.debug(
+                f"Job {job.id} ({job.kind} {job.key}) attempt {job.attempts} failed: {e!s}"
+            )
+            stats["errors"] += 1
+            await asyncio.to_thread(queue.fail, job.id, worker_id, str(e))
+        else:
+            stats["done"] += 1
+            if not await asyncio.to_thread(queue.complete, job.id, worker_id):
+                logger.warning(f"Job {job.id} finished after its lease was taken over")
+
+    running: set[asyncio.Task] = set()
+    try:
+        while True:
+            free = concurrency - len(running)
+            if free > 0:
+                jobs = await asyncio.to_thread(queue.lease, worker_id, free, lease_seconds)
+                running.update(asyncio.create_task(process(job)) for job in jobs)
+
+            if running:
+                _, running = await asyncio.wait(
+                    running, timeout=poll_seconds, return_when=asyncio.FIRST_COMPLETED
+                )
+                continue
+            if drain:
+                counts = await asyncio.to_thread(queue.counts)
+                if counts["queued"] + counts["leased"] == 0:
+                    break
+            await asyncio.sleep(poll_seconds)
+    finally:
+        # Unfinished jobs are picked up again once their leases expire
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+    logger.debug(f"Worker {worker_id} stopped: {stats}")
+    return stats
+
+
+def _worker_process(queue_path: str, cache_folder: str, options: dict) -> dict[str, int]:
+    """Run one worker on its own event loop, then close its resources"""
+
+    async def run() -> dict[str, int]:
+        queue = SqliteJobQueue(queue_path)
+        try:
+            return await run_worker(queue, cache_folder, **options)
+        finally:
+            queue.close()
+            await shutdown_resources()
+
+    return asyncio.run(run())
+
+
+def run_worker_processes(
+    processes: int, queue_path: str, cache_folder: str = "cache", **options
+) -> dict[str, int]:
+    """
+    Run workers in separate processes, each with its own browser pool and event loop.
+
+    Args:
+        processes: Number of worker processes (1 runs the worker in this process)
+        queue_path: SQLite job queue shared by the workers
+        cache_folder: Shared cache folder the results are written to
+        **options: Passed on to run_worker
+
+    Returns:
+        Counts of jobs done and of failed attempts, summed over all workers
+    """
+    if processes <= 1:
+        return _worker_process(queue_path, cache_folder, options)
+
+    # Spawned processes start clean instead of inheriting this process's state
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(processes, mp_context=context) as executor:
+        futures = [
+            executor.submit(_worker_process, queue_path, cache_folder, options)
+            for _ in range(processes)
+        ]
+        results = [future.result() for future in futures]
+    return {key: sum(result[key] for result in results) for key in ("done", "errors")}
@@ -0,0 +1,48 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+# Runs a page.evaluate script under Node against a minimal fake DOM. Elements are
+# {"text", "id", "attrs", "rect", "children": {selector: [elements]}}; selectors
+# are matched literally, so fixtures list the exact selectors a script queries.
+_NODE_HARNESS = r"""
+const [script, fixture, arg] = JSON.parse(require("fs").readFileSync(0, "utf8"));
+function element(spec) {
+    const children = spec.children || {};
+    return {
+        id: spec.id || "",
+        textContent: spec.text ?? "",
+        innerText: spec.text ?? "",
+        getAttribute: (name) => (spec.attrs || {})[name] ?? null,
+        querySelector: (selector) => (children[selector] || []).map(element)[0] ?? null,
+        querySelectorAll: (selector) => (children[selector] || []).map(element),
+        getBoundingClientRect: () => spec.rect || { left: 0, top: 0, width: 0, height: 0 },
+    };
+}
+globalThis.document = element({ children: fixture });
+globalThis.window = { scrollX: 0, scrollY: 0 };
+const result = eval(`(${script})`)(arg);
+process.stdout.write(JSON.stringify(result ?? null));
+"""
+
+
+@pytest.fixture
+def run_page_script():
+    """Evaluate a page script against a fake DOM fixture (skipped without Node)"""
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("Node.js is needed to run page scripts")
+
+    def run(script, fixture, arg=None):
+        completed = subprocess.run(
+            [node, "-e", _NODE_HARNESS],
+            input=json.dumps([script, fixture, arg]),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(completed.stdout)
+
+    return run
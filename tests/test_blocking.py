@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+from mcp_amazon_asin.utils.blocking import BLOCKING_PROFILES, PageBlockStats
+
+
+def make_request(resource_type, url="https://www.amazon.com/dp/X", subframe=False):
+    frame = SimpleNamespace(parent_frame=object() if subframe else None)
+    return SimpleNamespace(resource_type=resource_type, url=url, frame=frame)
+
+
+def test_light_profile_blocks_heavy_resources_but_not_the_page():
+    profile = BLOCKING_PROFILES["light"]
+
+    assert profile.blocks(make_request("image"))
+    assert profile.blocks(make_request("font"))
+    assert profile.blocks(make_request("script", "https://c.amazon-adsystem.com/aax2/apstag.js"))
+    assert profile.blocks(make_request("document", "https://www.amazon.com/ad", subframe=True))
+    assert not profile.blocks(make_request("document"))
+    assert not profile.blocks(make_request("script", "https://m.media-amazon.com/images/I/app.js"))
+    assert not BLOCKING_PROFILES["off"].blocks(make_request("image"))
+
+
+def test_page_block_stats_estimate_bytes_saved():
+    stats = PageBlockStats()
+    stats.record(make_request("image"))
+    stats.record(make_request("image"))
+    stats.record(make_request("media"))
+
+    assert stats.blocked_requests == 3
+    assert stats.by_type == {"image": 2, "media": 1}
+    assert stats.estimated_bytes_saved > 0
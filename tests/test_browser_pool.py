@@ -0,0 +1,89 @@
+import asyncio
+
+from mcp_amazon_asin.utils.browser import BrowserPool, _PooledBrowser
+
+
+class FakeContext:
+    async def new_page(self):
+        return object()
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected and not self.closed
+
+    async def new_context(self, user_agent=None):
+        return FakeContext()
+
+    async def close(self):
+        self.closed = True
+
+
+def fake_pool(size, max_pages):
+    pool = BrowserPool(size=size, max_pages_per_browser=max_pages)
+    launched = []
+
+    async def launch():
+        launched.append(FakeBrowser())
+        return _PooledBrowser(launched[-1])
+
+    pool._launch = launch
+    return pool, launched
+
+
+def test_browser_is_recycled_after_max_pages():
+    pool, launched = fake_pool(size=1, max_pages=2)
+
+    async def run():
+        for _ in range(3):
+            async with pool.context():
+                pass
+
+    asyncio.run(run())
+
+    assert len(launched) == 2
+    assert launched[0].closed
+    assert not launched[1].closed
+
+
+def test_concurrent_checkouts_replace_draining_browsers():
+    pool, launched = fake_pool(size=1, max_pages=2)
+    peak = 0
+
+    async def borrow():
+        nonlocal peak
+        async with pool.context():
+            peak = max(peak, sum(b.active_contexts for b in pool._browsers))
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(borrow() for _ in range(8)))
+
+    asyncio.run(run())
+
+    assert peak <= pool.max_contexts_per_browser * 2
+    assert len(launched) >= 4
+    assert all(browser.closed for browser in launched[:-1])
+
+
+def test_crashed_browser_is_replaced():
+    pool, launched = fake_pool(size=1, max_pages=50)
+
+    async def run():
+        async with pool.context():
+            pass
+        launched[0].connected = False
+        async with pool.context():
+            pass
+
+    asyncio.run(run())
+
+    assert len(launched) == 2
+    assert [b.browser for b in pool._browsers] == [launched[1]]
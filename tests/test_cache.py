@@ -0,0 +1,157 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from mcp_amazon_asin.utils import cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_memory_tier(monkeypatch):
+    monkeypatch.setattr(cache, "_memory_cache", cache.MemoryCache())
+    monkeypatch.setattr(cache, "_failures", {})
+    monkeypatch.setattr(cache, "_stats", dict.fromkeys(cache._stats, 0))
+    yield
+    cache.close_cache_backends()
+
+
+def test_second_lookup_is_served_from_memory(tmp_path):
+    folder = str(tmp_path)
+    cache.save_to_cache("B0TEST", {"asin": "B0TEST", "timestamp": int(time.time())}, folder)
+    cache._memory_cache.clear()
+
+    assert cache.get_from_cache("B0TEST", folder)["asin"] == "B0TEST"
+    cache.get_cache_backend(folder).delete("B0TEST")
+    assert cache.get_from_cache("B0TEST", folder)["asin"] == "B0TEST"
+
+    stats = cache.get_cache_stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+
+def test_expired_and_incomplete_entries_are_rejected(tmp_path):
+    folder = str(tmp_path)
+    stale = int(time.time()) - cache.CACHE_EXPIRATION_SECONDS - 1
+    cache.save_to_cache("OLD", {"asin": "OLD", "timestamp": stale}, folder)
+    cache.save_to_cache("PART", {"asin": "PART", "title": None, "timestamp": int(time.time())}, folder)
+
+    assert cache.get_from_cache("OLD", folder) is None
+    assert cache.get_from_cache("PART", folder, ["title"]) is None
+    assert cache.get_cache_stats()["misses"] == 2
+
+
+def test_stale_memory_copy_is_refreshed_from_the_shared_store(tmp_path):
+    folder = str(tmp_path)
+    stale = int(time.time()) - cache.CACHE_EXPIRATION_SECONDS - 1
+    cache.save_to_cache("B0TEST", {"asin": "B0TEST", "price": "$1", "timestamp": stale}, folder)
+
+    # Another process writes a fresh record straight to the store
+    fresh = {"asin": "B0TEST", "price": "$2", "timestamp": int(time.time())}
+    cache.get_cache_backend(folder).set("B0TEST", json.dumps(fresh), fresh["timestamp"])
+
+    assert cache.get_from_cache("B0TEST", folder)["price"] == "$2"
+    assert cache.get_from_cache("B0TEST", folder)["price"] == "$2"
+    stats = cache.get_cache_stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+
+def test_memory_tier_evicts_least_recently_used():
+    memory = cache.MemoryCache(max_entries=2, max_bytes=100)
+    memory.put("a", {"k": 1}, 10)
+    memory.put("b", {"k": 2}, 10)
+    memory.get("a")
+    memory.put("c", {"k": 3}, 10)
+    assert memory.get("b") is None and memory.get("a") is not None
+
+    memory.put("big", {"k": 4}, 95)
+    assert len(memory) == 1 and memory.size_bytes == 95
+    assert memory.evictions == 3
+
+
+def test_recent_failures_expire(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+    cache.save_failure_to_cache("B0FAIL", {"error": "blocked"}, folder)
+    assert cache.get_failure_from_cache("B0FAIL", folder) == {"error": "blocked"}
+
+    monkeypatch.setattr(cache, "NEGATIVE_CACHE_SECONDS", -1)
+    cache.save_failure_to_cache("B0FAIL", {"error": "blocked"}, folder)
+    assert cache.get_failure_from_cache("B0FAIL", folder) is None
+
+
+def test_migrate_imports_legacy_json_files(tmp_path):
+    folder = str(tmp_path)
+    record = {"asin": "B0LEGACY", "title": "Old", "timestamp": int(time.time())}
+    (tmp_path / "B0LEGACY.json").write_text(json.dumps(record, indent=2))
+    (tmp_path / "broken.json").write_text("{not json")
+
+    assert cache.get_from_cache("B0LEGACY", folder) is None
+    assert cache.migrate_cache(folder) == 1
+    assert cache.get_from_cache("B0LEGACY", folder)["title"] == "Old"
+
+
+def test_compact_removes_expired_entries(tmp_path):
+    folder = str(tmp_path)
+    now = int(time.time())
+    cache.save_to_cache("FRESH", {"timestamp": now}, folder)
+    cache.save_to_cache("STALE", {"timestamp": now - cache.CACHE_RETENTION_SECONDS - 10}, folder)
+
+    assert cache.compact_cache(folder) == 1
+    assert cache.get_cache_backend(folder).keys() == ["FRESH"]
+    # Only the purged entry leaves the memory tier
+    assert (folder, "FRESH") in dict(cache._memory_cache.items())
+    assert (folder, "STALE") not in dict(cache._memory_cache.items())
+
+
+def test_async_saves_are_coalesced_and_readable_before_flush(tmp_path):
+    folder = str(tmp_path)
+    now = int(time.time())
+
+    async def run():
+        for version in range(3):
+            await cache.asave_to_cache("B0ASYNC", {"version": version, "timestamp": now}, folder)
+        cache._memory_cache.clear()
+        before_flush = await cache.aget_from_cache("B0ASYNC", folder)
+        await cache.flush_cache()
+        return before_flush
+
+    before_flush = asyncio.run(run())
+
+    assert before_flush["version"] == 2
+    assert json.loads(cache.get_cache_backend(folder).get("B0ASYNC"))["version"] == 2
+
+
+def test_queued_saves_survive_a_loop_that_ends_without_flushing(tmp_path):
+    folder = str(tmp_path)
+
+    async def run():
+        await cache.asave_to_cache("B0LATE", {"title": "Late", "timestamp": int(time.time())}, folder)
+
+    asyncio.run(run())
+
+    assert json.loads(cache.get_cache_backend(folder).get("B0LATE"))["title"] == "Late"
+
+
+def test_failed_writes_are_raised_from_flush(tmp_path, monkeypatch):
+    folder = str(tmp_path)
+
+    def broken_set_many(entries):
+        raise OSError("disk full")
+
+    async def run():
+        monkeypatch.setattr(cache.get_cache_backend(folder), "set_many", broken_set_many)
+        await cache.asave_to_cache("B0LOST", {"timestamp": int(time.time())}, folder)
+        with pytest.raises(OSError, match="disk full"):
+            await cache.flush_cache()
+        # The error is reported once
+        await cache.flush_cache()
+
+    asyncio.run(run())
+
+
+def test_backend_must_implement_the_storage_methods():
+    class PartialBackend(cache.CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialBackend()
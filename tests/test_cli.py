@@ -0,0 +1,29 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from mcp_amazon_asin import cli
+from mcp_amazon_asin.utils import dp
+
+
+def test_batch_streams_one_json_line_per_distinct_asin(monkeypatch, capsys):
+    async def fake_extract_dp(asin, cache_folder=None, engine="auto", rate_limiter=None):
+        if asin == "B0BAD":
+            raise ValueError("blocked")
+        return {"asin": asin, "title": f"Product {asin}"}
+
+    monkeypatch.setattr(dp, "extract_dp", fake_extract_dp)
+    input_file = io.StringIO("# nightly list\nB0AAA\n\nb0aaa\nB0BAD\nB0CCC\n")
+
+    with pytest.raises(SystemExit) as exit_info:
+        asyncio.run(cli.batch.callback(input_file, "product", 2, None, 100, "http", "none"))
+
+    captured = capsys.readouterr()
+    entries = {entry["asin"]: entry for entry in map(json.loads, captured.out.splitlines())}
+    assert exit_info.value.code == 1
+    assert sorted(entries) == ["B0AAA", "B0BAD", "B0CCC"]
+    assert entries["B0AAA"]["product"]["title"] == "Product B0AAA"
+    assert entries["B0BAD"]["error"] == "blocked"
+    assert "Processed 3 items, 1 failed" in captured.err
@@ -0,0 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from mcp_amazon_asin.utils import dp
+from mcp_amazon_asin.utils.fields import PRODUCT_FIELD_SELECTORS
+
+
+def test_field_script_reads_every_field_in_one_pass(run_page_script):
+    fixture = {
+        PRODUCT_FIELD_SELECTORS["title"].selector: [{"text": " Acme Widget "}],
+        PRODUCT_FIELD_SELECTORS["price"].selector: [{"text": "$19.99"}, {"text": "$5.00"}],
+        PRODUCT_FIELD_SELECTORS["features"].selector: [{"text": "Sturdy"}, {"text": "Blue"}],
+        PRODUCT_FIELD_SELECTORS["image"].selector: [{"attrs": {"src": "https://img/1.jpg"}}],
+    }
+
+    raw = run_page_script(dp._EXTRACT_FIELDS_JS, fixture, dp._FIELD_SELECTOR_SPECS)
+
+    assert raw["title"] == " Acme Widget "
+    assert raw["price"] == "$19.99"
+    assert raw["features"] == ["Sturdy", "Blue"]
+    assert raw["image"] == "https://img/1.jpg"
+    # Missing elements come back as null instead of waiting for them
+    assert raw["rating"] is None
+    assert raw["sold_by"] is None
+
+
+def test_browser_engine_reads_requested_fields_in_one_round_trip(monkeypatch):
+    calls = []
+
+    class FakePool:
+        @asynccontextmanager
+        async def page(self, blocking_profile=None):
+            class Page:
+                async def goto(self, url, timeout=None):
+                    pass
+
+                async def evaluate(self, script, arg=None):
+                    calls.append((script, arg))
+                    return {field: f"raw {field}" for field in arg}
+
+            yield Page()
+
+    async def no_wait(page, name):
+        return 0.0
+
+    monkeypatch.setattr(dp, "get_browser_pool", FakePool)
+    monkeypatch.setattr(dp, "wait_until_ready", no_wait)
+
+    raw = asyncio.run(dp._scrape_dp_browser("https://www.amazon.com/dp/X", ["price", "sold_by"]))
+
+    assert raw == {"price": "raw price", "sold_by": "raw sold_by"}
+    assert len(calls) == 1
+    assert calls[0][0] is dp._EXTRACT_FIELDS_JS
+    assert set(calls[0][1]) == {"price", "sold_by"}
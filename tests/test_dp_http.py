@@ -0,0 +1,280 @@
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from aiohttp import web
+
+from mcp_amazon_asin.utils import dp
+from mcp_amazon_asin.utils.cache import (
+    close_cache_backends,
+    flush_cache,
+    get_cache_backend,
+    save_to_cache,
+)
+from mcp_amazon_asin.utils.fetch import close_http_session
+from mcp_amazon_asin.utils.htmlparse import parse_html, select_each
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+@asynccontextmanager
+async def serve_fixtures():
+    """Serve tests/fixtures/dp_<name>.html at /dp/<name> on a local port"""
+
+    async def handle(request):
+        path = FIXTURES_DIR / f"dp_{request.match_info['name']}.html"
+        if not path.exists():
+            raise web.HTTPNotFound()
+        return web.Response(text=path.read_text(encoding="utf-8"), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/dp/{name}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await close_http_session()
+        await runner.cleanup()
+
+
+def test_parse_dp_html_reads_all_fields():
+    raw = dp.parse_dp_html((FIXTURES_DIR / "dp_complete.html").read_text(encoding="utf-8"))
+    product = dp._build_product_data("complete", "url", raw)
+
+    assert product["title"] == "Example Wireless Headphones, Noise Cancelling & 40H Battery"
+    assert product["price"] == "$59.99"
+    assert product["rating"] == "4.5 out of 5 stars"
+    assert product["features"] == [
+        "Active noise cancelling blocks outside sound",
+        "40 hours of playtimeon a single charge",
+    ]
+    assert product["image"] == "https://m.media-amazon.com/images/I/example.jpg"
+    assert product["sold_by"] == "Example Audio Store"
+    assert product["delivery_date"] == "FREE delivery Friday, October 20"
+    assert product["delivering_to"] == "Delivering to Seattle 98101"
+
+
+def test_selectors_matched_in_one_walk_agree_with_separate_walks():
+    root = parse_html((FIXTURES_DIR / "dp_complete.html").read_text(encoding="utf-8"))
+    selectors = dict(dp._COMPILED_FIELD_SELECTORS)
+
+    matches = select_each(root, selectors)
+    first = select_each(root, selectors, first_only=selectors)
+
+    for field, selector in selectors.items():
+        assert matches[field] == selector.select(root)
+        assert first[field] == selector.select(root)[:1]
+
+
+def test_http_engine_parses_off_the_event_loop(monkeypatch):
+    parse_threads = []
+
+    async def fake_fetch_html(url):
+        return "<html></html>"
+
+    def fake_parse(html, fields=None):
+        parse_threads.append(threading.get_ident())
+        return {}
+
+    monkeypatch.setattr(dp, "fetch_html", fake_fetch_html)
+    monkeypatch.setattr(dp, "parse_dp_html", fake_parse)
+    asyncio.run(dp._scrape_dp_http("url"))
+
+    assert parse_threads and parse_threads[0] != threading.get_ident()
+
+
+def test_extract_dp_http_engine_caches_result(monkeypatch, tmp_path):
+    async def run():
+        async with serve_fixtures() as base_url:
+            monkeypatch.setattr(dp, "get_amazon_detail_page_url", lambda asin: f"{base_url}/dp/{asin}")
+            product = await dp.extract_dp("complete", cache_folder=str(tmp_path), engine="http")
+            await flush_cache()
+            return product
+
+    product = asyncio.run(run())
+
+    assert product["title"].startswith("Example Wireless Headphones")
+    cached = json.loads(get_cache_backend(str(tmp_path)).get("complete"))
+    assert cached["price"] == "$59.99"
+    close_cache_backends()
+
+
+def test_extract_dp_auto_engine_falls_back_to_browser(monkeypatch, tmp_path):
+    browser_calls = []
+
+    async def fake_browser_scrape(url, fields=None):
+        browser_calls.append(url)
+        return {"title": "Rendered title", "price": "$1.00", "rating": "5 out of 5 stars",
+                "features": ["One"], "image": "https://example.com/i.jpg"}
+
+    async def run():
+        async with serve_fixtures() as base_url:
+            monkeypatch.setattr(dp, "get_amazon_detail_page_url", lambda asin: f"{base_url}/dp/{asin}")
+            monkeypatch.setattr(dp, "_scrape_dp_browser", fake_browser_scrape)
+            complete = await dp.extract_dp("complete", cache_folder=None, engine="auto")
+            captcha = await dp.extract_dp("captcha", cache_folder=None, engine="auto")
+            return complete, captcha
+
+    complete, captcha = asyncio.run(run())
+
+    assert complete["price"] == "$59.99"
+    assert captcha["title"] == "Rendered title"
+    assert len(browser_calls) == 1 and browser_calls[0].endswith("/dp/captcha")
+
+
+def test_extract_dp_serves_stale_volatile_fields_while_refreshing(monkeypatch, tmp_path):
+    scrapes = []
+
+    async def fake_scrape(asin, url, engine, rate_limiter=None, fields=None):
+        scrapes.append(fields)
+        return dp._build_product_data(asin, url, {"price": "$2.00"})
+
+    stale_at = int(dp.time.time()) - dp.PRODUCT_FIELD_TTL_SECONDS["volatile"] - 10
+    record = {"asin": "stale", "title": "Cached title", "price": "$1.00", "rating": "4 out of 5 stars",
+              "features": ["One"], "image": "https://example.com/i.jpg", "url": "url",
+              "timestamp": stale_at,
+              "field_timestamps": {"stable": int(dp.time.time()), "volatile": stale_at}}
+
+    async def run():
+        monkeypatch.setattr(dp, "_scrape_dp", fake_scrape)
+        save_to_cache("stale", record, str(tmp_path))
+        served = await dp.extract_dp("stale", cache_folder=str(tmp_path))
+        await dp.wait_for_background_refreshes()
+        refreshed = await dp.extract_dp("stale", cache_folder=str(tmp_path))
+        await flush_cache()
+        return served, refreshed
+
+    served, refreshed = asyncio.run(run())
+    close_cache_backends()
+
+    assert served["price"] == "$1.00"
+    assert refreshed["price"] == "$2.00" and refreshed["title"] == "Cached title"
+    assert scrapes == [dp.VOLATILE_PRODUCT_FIELDS]
+
+
+def test_extract_dp_many_reports_each_asin(monkeypatch):
+    calls = []
+
+    async def fake_extract_dp(asin, cache_folder=None, engine="auto", rate_limiter=None):
+        calls.append(asin)
+        if asin == "BAD":
+            raise ValueError("blocked")
+        return {"asin": asin}
+
+    monkeypatch.setattr(dp, "extract_dp", fake_extract_dp)
+    outcomes = asyncio.run(dp.extract_dp_many(["b1", "BAD", "B1", "B2"], concurrency=2))
+
+    assert sorted(calls) == ["B1", "B2", "BAD"]
+    assert outcomes == [
+        {"asin": "B1", "product": {"asin": "B1"}},
+        {"asin": "BAD", "error": "blocked"},
+        {"asin": "B2", "product": {"asin": "B2"}},
+    ]
+
+
+def test_background_refreshes_are_bounded(monkeypatch, tmp_path):
+    running = []
+    peak = 0
+
+    async def fake_scrape(asin, url, engine, rate_limiter=None, fields=None):
+        nonlocal peak
+        running.append(asin)
+        peak = max(peak, len(running))
+        await asyncio.sleep(0.01)
+        running.remove(asin)
+        return dp._build_product_data(asin, url, {"price": "$2.00"})
+
+    now = int(dp.time.time())
+    stale_at = now - dp.PRODUCT_FIELD_TTL_SECONDS["volatile"] - 10
+    asins = [f"STALE{i}" for i in range(6)]
+
+    async def run():
+        monkeypatch.setattr(dp, "_scrape_dp", fake_scrape)
+        for asin in asins:
+            save_to_cache(asin, {"asin": asin, "title": "Cached", "price": "$1.00",
+                                 "rating": "4 out of 5 stars", "features": ["One"],
+                                 "image": "https://example.com/i.jpg", "url": "url",
+                                 "timestamp": stale_at,
+                                 "field_timestamps": {"stable": now, "volatile": stale_at}},
+                          str(tmp_path))
+        served = [await dp.extract_dp(asin, cache_folder=str(tmp_path)) for asin in asins]
+        await dp.wait_for_background_refreshes()
+        await flush_cache()
+        return served
+
+    served = asyncio.run(run())
+    close_cache_backends()
+
+    assert all(product["price"] == "$1.00" for product in served)
+    assert peak == dp.BACKGROUND_REFRESH_CONCURRENCY
+
+
+def test_failure_cache_can_be_bypassed_by_retrying_callers(monkeypatch, tmp_path):
+    scrapes = []
+
+    async def fake_scrape(asin, url, engine, rate_limiter=None, fields=None):
+        scrapes.append(asin)
+        if len(scrapes) == 1:
+            raise ValueError("blocked")
+        return dp._build_product_data(asin, url, {"title": "Recovered"})
+
+    async def attempt(**options):
+        try:
+            return await dp.extract_dp("B0RETRY", cache_folder=str(tmp_path), **options)
+        except ValueError as e:
+            return str(e)
+
+    async def run():
+        monkeypatch.setattr(dp, "_scrape_dp", fake_scrape)
+        first = await attempt()
+        cached = await attempt()
+        retried = await attempt(use_failure_cache=False)
+        await flush_cache()
+        return first, cached, retried
+
+    first, cached, retried = asyncio.run(run())
+    close_cache_backends()
+
+    assert "blocked" in first and "blocked" in cached
+    assert retried["title"] == "Recovered"
+    assert len(scrapes) == 2
+
+
+def test_repeated_stale_lookups_refresh_each_product_once(monkeypatch, tmp_path):
+    scrapes = []
+
+    async def fake_scrape(asin, url, engine, rate_limiter=None, fields=None):
+        scrapes.append(asin)
+        await asyncio.sleep(0.01)
+        return dp._build_product_data(asin, url, {"price": "$2.00"})
+
+    now = int(dp.time.time())
+    stale_at = now - dp.PRODUCT_FIELD_TTL_SECONDS["volatile"] - 10
+
+    async def run():
+        monkeypatch.setattr(dp, "_scrape_dp", fake_scrape)
+        monkeypatch.setattr(dp, "BACKGROUND_REFRESH_CONCURRENCY", 1)
+        for asin in ("A", "B"):
+            save_to_cache(asin, {"asin": asin, "title": "Cached", "price": "$1.00",
+                                 "rating": "4 out of 5 stars", "features": ["One"],
+                                 "image": "https://example.com/i.jpg", "url": "url",
+                                 "timestamp": stale_at,
+                                 "field_timestamps": {"stable": now, "volatile": stale_at}},
+                          str(tmp_path))
+        for asin in ("A", "B", "A", "B", "B", "A"):
+            await dp.extract_dp(asin, cache_folder=str(tmp_path))
+            await asyncio.sleep(0)
+        await dp.wait_for_background_refreshes()
+        await flush_cache()
+
+    asyncio.run(run())
+    close_cache_backends()
+
+    assert sorted(scrapes) == ["A", "B"]
+    assert not dp._pending_refreshes
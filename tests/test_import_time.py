@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import budgets in microseconds, with headroom for slow machines
+IMPORT_BUDGETS_US = {
+    "mcp_amazon_asin.cli": 250_000,
+    # Dominated by the mcp package itself
+    "mcp_amazon_asin.server": 2_000_000,
+}
+
+# Engines that must only be imported when a command or tool uses them
+LAZY_MODULES = ("playwright.async_api", "aiohttp", "mcp_amazon_asin.utils.dp")
+
+
+def import_times(module):
+    """Cumulative import time per module from `python -X importtime`"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_US))
+def test_entry_point_import_stays_lazy_and_within_budget(module):
+    times = import_times(module)
+
+    assert [name for name in LAZY_MODULES if name in times] == []
+    assert times[module] < IMPORT_BUDGETS_US[module]
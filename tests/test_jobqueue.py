@@ -0,0 +1,158 @@
+import asyncio
+
+from mcp_amazon_asin.utils import dp, search, worker
+from mcp_amazon_asin.utils.fields import REQUIRED_PRODUCT_FIELDS
+from mcp_amazon_asin.utils.jobqueue import SqliteJobQueue
+from mcp_amazon_asin.utils.worker import enqueue_jobs, run_worker
+
+
+def test_pending_jobs_are_deduplicated_and_leased_once(tmp_path):
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"))
+    other = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"))
+
+    assert enqueue_jobs(queue, "product", ["B0AAA", "b0aaa", "B0BBB"]) == (2, 1)
+
+    first = queue.lease("worker-1", limit=1)
+    second = other.lease("worker-2", limit=5)
+    assert [job.key for job in first] == ["B0AAA"]
+    assert [job.key for job in second] == ["B0BBB"]
+    assert other.lease("worker-2") == []
+
+    # Only the lease holder can finish a job; a finished job can be queued again
+    assert not other.complete(first[0].id, "worker-2")
+    assert queue.complete(first[0].id, "worker-1")
+    assert queue.enqueue("product", "B0AAA", {"asin": "B0AAA"})[1]
+    assert queue.counts() == {"queued": 1, "leased": 1, "done": 1, "failed": 0}
+    queue.close()
+    other.close()
+
+
+def test_expired_leases_and_failures_are_retried_until_the_last_attempt(tmp_path):
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), retry_backoff=0)
+    queue.enqueue("product", "B0AAA", {"asin": "B0AAA"}, max_attempts=3)
+
+    # A worker that dies holding the job loses it when the lease expires
+    [abandoned] = queue.lease("crashed", lease_seconds=0)
+    [retried] = queue.lease("worker-1")
+    assert retried.id == abandoned.id
+    assert retried.attempts == 2
+    assert not queue.fail(retried.id, "crashed", "too late")
+
+    assert queue.fail(retried.id, "worker-1", "blocked")
+    [last] = queue.lease("worker-1")
+    assert last.attempts == 3
+    assert queue.fail(last.id, "worker-1", "blocked again")
+    assert queue.lease("worker-1") == []
+    assert queue.counts()["failed"] == 1
+    queue.close()
+
+
+def complete_product(asin):
+    return {**dict.fromkeys(REQUIRED_PRODUCT_FIELDS, "value"), "asin": asin}
+
+
+def test_worker_drains_the_queue_and_retries_failed_jobs(tmp_path, monkeypatch):
+    attempts = {}
+
+    async def fake_extract_dp(
+        asin, cache_folder="cache", engine="auto", rate_limiter=None, use_failure_cache=True
+    ):
+        attempts[asin] = attempts.get(asin, 0) + 1
+        if asin == "B0FLAKY" and attempts[asin] == 1:
+            raise ValueError("blocked")
+        return complete_product(asin)
+
+    monkeypatch.setattr(dp, "extract_dp", fake_extract_dp)
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), retry_backoff=0)
+    enqueue_jobs(queue, "product", ["B0AAA", "B0FLAKY", "B0CCC"])
+
+    stats = asyncio.run(
+        run_worker(queue, str(tmp_path), concurrency=2, drain=True, poll_seconds=0.01)
+    )
+
+    assert stats == {"done": 3, "errors": 1}
+    assert attempts == {"B0AAA": 1, "B0FLAKY": 2, "B0CCC": 1}
+    assert queue.counts() == {"queued": 0, "leased": 0, "done": 3, "failed": 0}
+    queue.close()
+
+
+def test_incomplete_products_and_empty_searches_are_retried(tmp_path, monkeypatch):
+    attempts = {}
+
+    async def fake_extract_dp(
+        asin, cache_folder="cache", engine="auto", rate_limiter=None, use_failure_cache=True
+    ):
+        attempts[asin] = attempts.get(asin, 0) + 1
+        # A captcha page comes back without raising, with required fields missing
+        if attempts[asin] == 1:
+            return {"asin": asin, "title": None}
+        return complete_product(asin)
+
+    async def fake_extract_search_asin(query, limit, cache_folder, rate_limit=None):
+        attempts[query] = attempts.get(query, 0) + 1
+        return []
+
+    monkeypatch.setattr(dp, "extract_dp", fake_extract_dp)
+    monkeypatch.setattr(search, "extract_search_asin", fake_extract_search_asin)
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), retry_backoff=0)
+    enqueue_jobs(queue, "product", ["B0CAPTCHA"])
+    enqueue_jobs(queue, "search", ["blocked query"])
+
+    stats = asyncio.run(run_worker(queue, str(tmp_path), drain=True, poll_seconds=0.01))
+
+    assert stats == {"done": 1, "errors": 4}
+    assert attempts == {"B0CAPTCHA": 2, "blocked query": 3}
+    assert queue.counts() == {"queued": 0, "leased": 0, "done": 1, "failed": 1}
+    queue.close()
+
+
+def test_running_jobs_keep_their_lease(tmp_path, monkeypatch):
+    path = str(tmp_path / "jobs.sqlite3")
+    stolen = []
+
+    async def slow_extract_dp(
+        asin, cache_folder="cache", engine="auto", rate_limiter=None, use_failure_cache=True
+    ):
+        # Outlive the lease several times while another worker keeps asking for work
+        other = SqliteJobQueue(path)
+        for _ in range(5):
+            await asyncio.sleep(0.1)
+            for job in other.lease("other-worker"):
+                stolen.append(job)
+                other.complete(job.id, "other-worker")
+        other.close()
+        return complete_product(asin)
+
+    monkeypatch.setattr(dp, "extract_dp", slow_extract_dp)
+    queue = SqliteJobQueue(path)
+    enqueue_jobs(queue, "product", ["B0SLOW"])
+
+    stats = asyncio.run(
+        run_worker(queue, str(tmp_path), drain=True, lease_seconds=0.15, poll_seconds=0.01)
+    )
+
+    assert stolen == []
+    assert stats == {"done": 1, "errors": 0}
+    assert queue.counts()["done"] == 1
+    queue.close()
+
+
+def test_jobs_whose_result_is_not_persisted_are_not_completed(tmp_path, monkeypatch):
+    async def fake_extract_dp(
+        asin, cache_folder="cache", engine="auto", rate_limiter=None, use_failure_cache=True
+    ):
+        return complete_product(asin)
+
+    async def failing_flush():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(dp, "extract_dp", fake_extract_dp)
+    monkeypatch.setattr(worker, "flush_cache", failing_flush)
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite3"), retry_backoff=0)
+    enqueue_jobs(queue, "product", ["B0DISK"])
+
+    stats = asyncio.run(run_worker(queue, str(tmp_path), drain=True, poll_seconds=0.01))
+
+    assert stats == {"done": 0, "errors": 3}
+    assert queue.counts()["failed"] == 1
+    queue.close()
@@ -0,0 +1,103 @@
+import asyncio
+
+from aiohttp import web
+
+from mcp_amazon_asin.config import GeminiConfig
+from mcp_amazon_asin.utils import prompt
+from mcp_amazon_asin.utils.cache import close_cache_backends, flush_cache
+from mcp_amazon_asin.utils.prompt import GeminiClient
+
+
+async def serve_gemini(statuses):
+    """Answer generateContent with the given statuses in turn, then succeed"""
+    calls = []
+
+    async def handle(request):
+        calls.append((request.match_info["model"], request.query["key"], await request.json()))
+        status = statuses[len(calls) - 1] if len(calls) <= len(statuses) else 200
+        if status != 200:
+            return web.Response(status=status, text="busy")
+        return web.json_response({"candidates": [{"content": {"parts": [{"text": "Hello"}]}}]})
+
+    app = web.Application()
+    app.router.add_post("/v1/models/{model}:generateContent", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v1", calls
+
+
+def test_gemini_client_retries_rate_limits_and_reuses_its_session():
+    async def run():
+        runner, url, calls = await serve_gemini([429, 503])
+        client = GeminiClient(GeminiConfig("test-key", url, "test-model"), backoff_base=0.01)
+        try:
+            first = await client.generate("Hi")
+            session = client._get_session()
+            second = await client.generate("Hi again")
+            return first, second, session is client._get_session(), calls
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    first, second, same_session, calls = asyncio.run(run())
+
+    assert first == second == "Hello"
+    assert same_session
+    assert len(calls) == 4
+    assert calls[0][:2] == ("test-model", "test-key")
+    assert calls[0][2]["contents"][0]["parts"][0]["text"] == "Hi"
+
+
+def test_gemini_client_gives_up_on_client_errors():
+    async def run():
+        runner, url, calls = await serve_gemini([400])
+        client = GeminiClient(GeminiConfig("test-key", url, "test-model"), backoff_base=0.01)
+        try:
+            await client.generate("Hi")
+        except ValueError as e:
+            return str(e), calls
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    error, calls = asyncio.run(run())
+
+    assert "status 400" in error
+    assert len(calls) == 1
+
+
+def test_identical_prompts_are_answered_from_the_response_cache(monkeypatch, tmp_path):
+    class FakeClient:
+        config = GeminiConfig("test-key", "http://unused", "test-model")
+
+        def __init__(self):
+            self.prompts = []
+
+        async def generate(self, text):
+            self.prompts.append(text)
+            return f"Answer to {text}"
+
+    client = FakeClient()
+    monkeypatch.setattr(prompt, "get_gemini_client", lambda: client)
+
+    async def run():
+        first, again = await asyncio.gather(
+            prompt.chat_with_gemini("Same prompt", str(tmp_path)),
+            prompt.chat_with_gemini("Same prompt", str(tmp_path)),
+        )
+        later = await prompt.chat_with_gemini("Same prompt", str(tmp_path))
+        other = await prompt.chat_with_gemini("Other prompt", str(tmp_path))
+        uncached = await prompt.chat_with_gemini("Same prompt", "none")
+        await flush_cache()
+        return first, again, later, other, uncached
+
+    first, again, later, other, uncached = asyncio.run(run())
+    close_cache_backends()
+
+    assert first == again == later == uncached == "Answer to Same prompt"
+    assert other == "Answer to Other prompt"
+    assert client.prompts == ["Same prompt", "Other prompt", "Same prompt"]
+    assert prompt.response_cache_key("a", "p") != prompt.response_cache_key("b", "p")
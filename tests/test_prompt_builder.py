@@ -0,0 +1,49 @@
+from mcp_amazon_asin.utils.prompt_builder import (
+    build_prompt,
+    estimate_tokens,
+    format_products,
+    format_refinements,
+)
+
+PRODUCT = {
+    "asin": "B000000001",
+    "title": "Wireless   Headphones | Black",
+    "price": "$59.99",
+    "rating": "4.5 out of 5 stars",
+    "features": ["Noise cancelling", "40 hours", "USB-C", "Foldable"],
+    "image": "https://example.com/i.jpg",
+    "url": "https://www.amazon.com/dp/B000000001",
+    "sold_by": None,
+    "delivering_to": "Seattle 98101",
+    "timestamp": 1700000000,
+}
+
+
+def test_products_are_projected_to_a_compact_table():
+    table = format_products([PRODUCT])
+
+    assert table.splitlines() == [
+        "asin|title|price|rating|sold_by|features",
+        "B000000001|Wireless Headphones / Black|$59.99|4.5/5|-|Noise cancelling; 40 hours; USB-C",
+    ]
+
+
+def test_refinements_are_deduplicated():
+    refinements = [
+        {"type": "brands", "refinements": ["Brand", "Sony", "sony", "Bose", "See more"]},
+        {"type": "brands_dup", "refinements": ["Brand", "Bose", "Sony"]},
+        {"type": "empty", "refinements": ["See less"]},
+    ]
+
+    assert format_refinements(refinements) == "brands: Brand, Sony, Bose"
+
+
+def test_token_budget_drops_lowest_ranked_products():
+    template = "Q: {query}\n{refinements_str}\n{products_str}"
+    products = [dict(PRODUCT, asin=f"B{i:09d}") for i in range(50)]
+
+    prompt = build_prompt(template, "headphones", products, [], token_budget=500)
+
+    assert estimate_tokens(prompt) <= 500
+    assert "B000000000" in prompt
+    assert "B000000049" not in prompt
@@ -0,0 +1,46 @@
+import asyncio
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from mcp_amazon_asin.utils.readiness import BLOCKED_PAGE_SELECTOR, wait_until_ready
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.first = self
+        page.selectors.append(selector)
+
+    async def wait_for(self, state, timeout):
+        self.page.timeouts.append(timeout)
+        if self.page.ready_after is None:
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+        await asyncio.sleep(self.page.ready_after)
+
+
+class FakePage:
+    def __init__(self, ready_after):
+        self.ready_after = ready_after
+        self.selectors = []
+        self.timeouts = []
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+def test_wait_returns_once_the_extractor_selector_is_attached():
+    page = FakePage(ready_after=0.01)
+
+    elapsed = asyncio.run(wait_until_ready(page, "dp"))
+
+    assert 0.01 <= elapsed < 1
+    assert page.selectors == [f"#productTitle, {BLOCKED_PAGE_SELECTOR}"]
+
+
+def test_wait_falls_back_to_extracting_after_the_timeout():
+    page = FakePage(ready_after=None)
+
+    elapsed = asyncio.run(wait_until_ready(page, "search"))
+
+    assert elapsed < 1
+    assert page.timeouts == [10000]
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+
+from mcp_amazon_asin.utils.scheduler import (
+    AdmissionLimiter,
+    HostRateLimiter,
+    ProgressTracker,
+    run_concurrently,
+)
+
+
+def test_run_concurrently_yields_in_completion_order_with_bounded_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def worker(delay):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(delay)
+        in_flight -= 1
+        if delay == 0.02:
+            raise ValueError("boom")
+        return delay * 2
+
+    async def run():
+        return [job async for job in run_concurrently([0.2, 0.01, 0.02, 0.03], worker, 2)]
+
+    jobs = asyncio.run(run())
+
+    assert peak == 2
+    # The slow first job does not hold back the others
+    assert [job.item for job in jobs] == [0.01, 0.02, 0.03, 0.2]
+    assert isinstance(jobs[1].error, ValueError)
+    assert jobs[3].result == 0.4
+
+
+def test_host_rate_limiter_spaces_requests_per_host():
+    limiter = HostRateLimiter(requests_per_second=20)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*[limiter.wait("https://www.amazon.com/dp/X") for _ in range(3)])
+        same_host = time.monotonic() - start
+
+        start = time.monotonic()
+        await limiter.wait("https://example.com/")
+        other_host = time.monotonic() - start
+        return same_host, other_host
+
+    same_host, other_host = asyncio.run(run())
+
+    assert same_host >= 0.09
+    assert other_host < 0.05
+
+
+def test_progress_tracker_survives_a_failing_callback():
+    updates = []
+
+    async def on_progress(completed, total, message, partial):
+        updates.append((completed, total, message, partial))
+        if completed == 1:
+            raise RuntimeError("client went away")
+
+    async def run():
+        progress = ProgressTracker(on_progress, total=2)
+        await progress.advance("first")
+        await progress.advance("second", {"asin": "X"})
+        await ProgressTracker().advance("ignored")
+
+    asyncio.run(run())
+
+    assert updates == [(1, 2, "first", None), (2, 2, "second", {"asin": "X"})]
+
+
+def test_admission_limiter_bounds_in_flight_and_rejects_after_timeout():
+    limiter = AdmissionLimiter(limit=2, timeout=0.05)
+    peak = 0
+
+    async def job(delay):
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(delay)
+
+    async def run():
+        await asyncio.gather(job(0.01), job(0.01), job(0.01))
+        with pytest.raises(RuntimeError, match="Server busy"):
+            await asyncio.gather(job(0.2), job(0.2), job(0))
+
+    asyncio.run(run())
+
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.waiting == 0
@@ -0,0 +1,159 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from mcp_amazon_asin.utils import normalize_query, search
+from mcp_amazon_asin.utils.cache import close_cache_backends, flush_cache
+from mcp_amazon_asin.utils.scheduler import HostRateLimiter
+
+RESULTS = [{"asin": f"A{i}", "index": i, "title": f"Item {i}", "sponsored": False} for i in range(3)]
+REFINEMENTS = [{"type": "brandsRefinements", "refinements": ["Brand", "Acme"]}]
+
+
+def page_results(url):
+    """Page 1 serves RESULTS; later pages repeat A0 (a sponsored card) plus two new ASINs"""
+    page = int(url.split("&page=")[1]) if "&page=" in url else 1
+    if page == 1:
+        return RESULTS
+    return [RESULTS[0], *({"asin": f"P{page}-{i}", "index": i} for i in range(2))]
+
+
+class FakePool:
+    """Serves pages whose evaluate() answers the search extraction scripts"""
+
+    def __init__(self, page_count=1):
+        self.page_count = page_count
+        self.loads = []
+
+    @asynccontextmanager
+    async def page(self, blocking_profile=None):
+        pool = self
+
+        class Page:
+            async def goto(self, url, timeout=None):
+                pool.loads.append(url)
+                self.url = url
+
+            async def evaluate(self, script, arg=None):
+                if script is search._EXTRACT_REFINEMENTS_JS:
+                    return REFINEMENTS
+                if script is search._EXTRACT_PAGE_COUNT_JS:
+                    return pool.page_count
+                return [dict(result) for result in page_results(self.url)]
+
+        yield Page()
+
+
+async def no_wait(page, name):
+    return 0.0
+
+
+def test_normalize_query_options():
+    assert normalize_query("  Red   SHOES ") == "red shoes"
+    assert normalize_query("shoes red", sort_tokens=True) == normalize_query("Red Shoes", sort_tokens=True)
+
+
+def test_search_views_share_one_cached_page_load(monkeypatch, tmp_path):
+    pool = FakePool()
+    monkeypatch.setattr(search, "get_browser_pool", lambda: pool)
+    monkeypatch.setattr(search, "wait_until_ready", no_wait)
+
+    async def run():
+        # Both views of the same page load concurrently share one navigation
+        first, refinements = await asyncio.gather(
+            search.extract_search_asin("Red Shoes", limit=2, cache_folder=str(tmp_path)),
+            search.extract_refinements("red shoes", cache_folder=str(tmp_path)),
+        )
+        more = await search.extract_search_asin(" red  shoes", limit=10, cache_folder=str(tmp_path))
+        await flush_cache()
+        return first, refinements, more
+
+    first, refinements, more = asyncio.run(run())
+    close_cache_backends()
+
+    assert [r["asin"] for r in first] == ["A0", "A1"]
+    assert refinements == REFINEMENTS
+    assert len(more) == 3
+    assert len(pool.loads) == 1
+
+
+def test_in_flight_loads_share_the_cache_key_normalization(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(search, "get_browser_pool", lambda: pool)
+    monkeypatch.setattr(search, "wait_until_ready", no_wait)
+    monkeypatch.setattr(search, "_search_cache_sort_tokens", lambda: True)
+
+    async def run():
+        return await asyncio.gather(
+            search.extract_search_page("red shoes", cache_folder="none"),
+            search.extract_search_page("Shoes Red", cache_folder="none"),
+        )
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    assert len(pool.loads) == 1
+
+
+def test_pagination_dedups_and_stops_at_limit(monkeypatch):
+    pool = FakePool(page_count=4)
+    monkeypatch.setattr(search, "get_browser_pool", lambda: pool)
+    monkeypatch.setattr(search, "wait_until_ready", no_wait)
+
+    five = asyncio.run(search.extract_search_asin("desk", limit=5, cache_folder="none"))
+    loads_for_five = len(pool.loads)
+    everything = asyncio.run(search.extract_search_asin("lamp", limit=100, cache_folder="none"))
+
+    assert [r["asin"] for r in five] == ["A0", "A1", "A2", "P2-0", "P2-1"]
+    assert loads_for_five == 2
+    assert len(everything) == 9
+    assert len({r["asin"] for r in everything}) == 9
+    assert [r["page"] for r in everything][-2:] == [4, 4]
+
+
+def test_every_page_load_waits_for_the_rate_limiter(monkeypatch):
+    pool = FakePool(page_count=4)
+    monkeypatch.setattr(search, "get_browser_pool", lambda: pool)
+    monkeypatch.setattr(search, "wait_until_ready", no_wait)
+    waited = []
+
+    class RecordingLimiter(HostRateLimiter):
+        async def wait(self, url):
+            waited.append(url)
+
+    limiter = RecordingLimiter()
+    results = asyncio.run(
+        search.extract_search_asin("desk", limit=7, cache_folder="none", rate_limit=limiter)
+    )
+
+    assert len(results) == 7
+    assert sorted(waited) == sorted(pool.loads)
+    assert len(waited) == 3
+
+
+def test_themed_products_stream_in_completion_order_and_collect_in_rank_order(monkeypatch):
+    delays = {"A0": 0.03, "A1": 0.01, "A2": 0.02}
+
+    async def fake_themed_asins(query, limit, cache_folder, rate_limiter):
+        return list(delays)
+
+    async def fake_extract_dp(asin, cache_folder=None, rate_limiter=None):
+        await asyncio.sleep(delays[asin])
+        return {"asin": asin}
+
+    monkeypatch.setattr(search, "_themed_asins", fake_themed_asins)
+    monkeypatch.setattr(search, "extract_dp", fake_extract_dp)
+    updates = []
+
+    async def on_progress(completed, total, message, partial):
+        updates.append((completed, total))
+
+    async def run():
+        streamed = [p["asin"] async for p in search.iter_themed_products("hub", concurrency=3)]
+        collected = await search.extract_themed_products("hub", concurrency=3, on_progress=on_progress)
+        return streamed, [p["asin"] for p in collected]
+
+    streamed, collected = asyncio.run(run())
+
+    assert streamed == ["A1", "A2", "A0"]
+    assert collected == ["A0", "A1", "A2"]
+    assert updates == [(1, 4), (2, 4), (3, 4), (4, 4)]
@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from mcp_amazon_asin.utils import search
+from mcp_amazon_asin.utils.cache import close_cache_backends, flush_cache
+
+CARD_SELECTOR = "div.s-main-slot div[data-asin][data-index][role='listitem']"
+SPONSOR_SELECTOR = "span.a-declarative span, span.a-declarative"
+
+
+def card(asin, index, title=None, sponsor_text=None, rect=None):
+    children = {}
+    if title:
+        children["a h2 span"] = [{"text": f"  {title} "}]
+    if sponsor_text:
+        children[SPONSOR_SELECTOR] = [{"text": sponsor_text}]
+    return {"attrs": {"data-asin": asin, "data-index": str(index)}, "children": children, "rect": rect}
+
+
+def test_results_script_reads_every_card_in_one_pass(run_page_script):
+    fixture = {
+        CARD_SELECTOR: [
+            card("B0AAA", 1, "Acme Hub", rect={"left": 5, "top": 10, "width": 200, "height": 300}),
+            # Placeholder cards without an ASIN are skipped
+            card("  ", 2, "Ad slot"),
+            card("B0BBB", 3, "Zenith Hub", sponsor_text=" Sponsored "),
+        ]
+    }
+
+    plain = run_page_script(search._EXTRACT_RESULTS_JS, fixture, {"withRects": False})
+    with_rects = run_page_script(search._EXTRACT_RESULTS_JS, fixture, {"withRects": True})
+
+    assert plain == [
+        {"asin": "B0AAA", "index": 1, "title": "Acme Hub", "sponsored": False},
+        {"asin": "B0BBB", "index": 3, "title": "Zenith Hub", "sponsored": True},
+    ]
+    assert with_rects[0]["rect"] == {"x": 5, "y": 10, "width": 200, "height": 300}
+
+
+def test_refinements_script_reads_each_sidebar_section(run_page_script):
+    fixture = {
+        "#s-refinements": [
+            {
+                "children": {
+                    ".a-section.a-spacing-double-large > div": [
+                        {"id": "brandsRefinements", "text": "Brand\n  Acme \n\nZenith\n"},
+                        {"id": "priceRefinements", "text": "Price\nUp to $25"},
+                        # Untitled and empty sections are skipped
+                        {"id": "", "text": "Unlabelled"},
+                        {"id": "reviewsRefinements", "text": "   "},
+                    ]
+                }
+            }
+        ]
+    }
+
+    assert run_page_script(search._EXTRACT_REFINEMENTS_JS, fixture) == [
+        {"type": "brandsRefinements", "refinements": ["Brand", "Acme", "Zenith"]},
+        {"type": "priceRefinements", "refinements": ["Price", "Up to $25"]},
+    ]
+    assert run_page_script(search._EXTRACT_REFINEMENTS_JS, {}) == []
+
+
+def test_page_count_script_reads_the_highest_page_number(run_page_script):
+    items = [{"text": text} for text in ("Previous", "1", "2", "...", " 7 ", "Next")]
+    fixture = {".s-pagination-strip .s-pagination-item": items}
+
+    assert run_page_script(search._EXTRACT_PAGE_COUNT_JS, fixture) == 7
+    assert run_page_script(search._EXTRACT_PAGE_COUNT_JS, {}) == 1
+
+
+def test_screenshots_clip_cards_from_the_same_page_load(monkeypatch, tmp_path):
+    shots = []
+    evaluated = []
+
+    class FakePool:
+        @asynccontextmanager
+        async def page(self, blocking_profile=None):
+            class Page:
+                async def goto(self, url, timeout=None):
+                    pass
+
+                async def evaluate(self, script, arg=None):
+                    evaluated.append(script)
+                    if script is search._EXTRACT_RESULTS_JS:
+                        rect = {"x": 0, "y": 0, "width": 10, "height": 10}
+                        return [
+                            {"asin": "B0AAA", "index": 1, "rect": dict(rect)},
+                            {"asin": "B0BBB", "index": 2, "rect": dict(rect)},
+                        ]
+                    return [] if script is search._EXTRACT_REFINEMENTS_JS else 1
+
+                async def screenshot(self, path, clip, full_page):
+                    shots.append(path)
+
+            yield Page()
+
+    async def no_wait(page, name):
+        return 0.0
+
+    monkeypatch.setattr(search, "get_browser_pool", FakePool)
+    monkeypatch.setattr(search, "wait_until_ready", no_wait)
+
+    async def run():
+        result = await search._scrape_search_page("hub", 1, str(tmp_path), True, 1)
+        await flush_cache()
+        return result
+
+    result = asyncio.run(run())
+    close_cache_backends()
+
+    assert evaluated.count(search._EXTRACT_RESULTS_JS) == 1
+    assert [path.rsplit("/", 1)[1] for path in shots] == ["B0AAA.png"]
+    assert all("rect" not in r for r in result["results"])
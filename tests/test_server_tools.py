@@ -0,0 +1,111 @@
+import asyncio
+import socket
+
+import uvicorn
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from mcp_amazon_asin import server as mcp_server
+from mcp_amazon_asin.utils import dp
+from mcp_amazon_asin.utils.scheduler import AdmissionLimiter
+
+
+def test_batch_lookup_reports_progress_per_asin(monkeypatch):
+    async def fake_extract_dp_many(asins, concurrency=10, rate_limit=None, on_progress=None):
+        outcomes = []
+        for completed, asin in enumerate(asins, start=1):
+            outcome = {"asin": asin, "error": "blocked"}
+            outcomes.append(outcome)
+            await on_progress(completed, len(asins), f"Failed to fetch product {asin}", outcome)
+        return outcomes
+
+    monkeypatch.setattr(dp, "extract_dp_many", fake_extract_dp_many)
+    updates = []
+
+    async def on_progress(progress, total, message):
+        updates.append((progress, total, message.splitlines()))
+
+    async def run():
+        async with create_connected_server_and_client_session(mcp_server.server) as client:
+            return await client.call_tool(
+                "get_products_from_asins", {"asins": ["A1", "B2"]}, progress_callback=on_progress
+            )
+
+    result = asyncio.run(run())
+
+    assert "Fetched 0 of 2 products" in result.content[0].text
+    assert updates == [
+        (1, 2, ["Failed to fetch product A1", '{"asin":"A1","error":"blocked"}']),
+        (2, 2, ["Failed to fetch product B2", '{"asin":"B2","error":"blocked"}']),
+    ]
+
+
+def test_progress_partials_are_summarized_and_capped():
+    product = {"asin": "B1", "title": "Hub", "price": "$9", "features": ["x" * 5000]}
+
+    assert mcp_server._summarize_partial({"asin": "B1", "product": product}) == (
+        '{"asin":"B1","title":"Hub","price":"$9"}'
+    )
+    huge = {"categories": [{"type": "brands", "refinements": ["y" * 5000]}]}
+    assert mcp_server._summarize_partial(huge) is None
+    assert mcp_server._summarize_partial(None) is None
+
+
+def test_http_transport_serves_concurrent_clients_through_admission(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_extract_dp(asin, rate_limiter=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return {
+            "asin": asin,
+            "title": f"Product {asin}",
+            "price": None,
+            "rating": None,
+            "url": f"https://www.amazon.com/dp/{asin}",
+            "sold_by": None,
+            "delivery_date": None,
+            "delivering_to": None,
+            "features": [],
+            "image": None,
+        }
+
+    monkeypatch.setattr(dp, "extract_dp", fake_extract_dp)
+    monkeypatch.setattr(mcp_server, "_admission", AdmissionLimiter(limit=1))
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    async def call_from_new_client(asin):
+        url = f"http://127.0.0.1:{port}{mcp_server.HTTP_ENDPOINT_PATH}/"
+        async with streamablehttp_client(url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as client:
+                await client.initialize()
+                return await client.call_tool("get_product_info_from_asin", {"asin": asin})
+
+    async def run():
+        config = uvicorn.Config(mcp_server.create_http_app(), port=port, log_level="warning")
+        http_server = uvicorn.Server(config)
+        serving = asyncio.create_task(http_server.serve())
+        while not http_server.started:
+            await asyncio.sleep(0.01)
+        try:
+            return await asyncio.gather(*(call_from_new_client(asin) for asin in ("A1", "B2", "C3")))
+        finally:
+            http_server.should_exit = True
+            await serving
+
+    results = asyncio.run(run())
+
+    assert [result.content[0].text.splitlines()[0] for result in results] == [
+        "**Product Information for ASIN: A1**",
+        "**Product Information for ASIN: B2**",
+        "**Product Information for ASIN: C3**",
+    ]
+    assert peak == 1
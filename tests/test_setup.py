@@ -0,0 +1,26 @@
+import json
+from pathlib import Path
+
+import playwright
+
+from mcp_amazon_asin.utils.setup import chromium_installed
+
+
+def test_chromium_probe_looks_for_the_expected_build(monkeypatch, tmp_path):
+    manifest = Path(playwright.__file__).parent / "driver" / "package" / "browsers.json"
+    revisions = {b["name"]: b["revision"] for b in json.loads(manifest.read_text())["browsers"]}
+    monkeypatch.setenv("PLAYWRIGHT_BROWSERS_PATH", str(tmp_path))
+
+    chromium_installed.cache_clear()
+    try:
+        assert not chromium_installed()
+
+        folder = tmp_path / f"chromium_headless_shell-{revisions['chromium-headless-shell']}"
+        folder.mkdir()
+        (folder / "INSTALLATION_COMPLETE").touch()
+        # The answer is cached until explicitly cleared
+        assert not chromium_installed()
+        chromium_installed.cache_clear()
+        assert chromium_installed()
+    finally:
+        chromium_installed.cache_clear()
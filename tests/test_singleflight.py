@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from mcp_amazon_asin.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def scrape(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return {"asin": key}
+
+    async def run():
+        return await asyncio.gather(
+            *[flight.do(key, lambda key=key: scrape(key)) for key in ["A", "A", "B", "A"]]
+        )
+
+    results = asyncio.run(run())
+
+    assert sorted(calls) == ["A", "B"]
+    assert results[0] is results[1] is results[3]
+    assert flight.in_flight() == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flight = SingleFlight()
+    attempts = 0
+
+    async def failing():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("blocked")
+
+    async def run():
+        first = await asyncio.gather(
+            flight.do("A", failing), flight.do("A", failing), return_exceptions=True
+        )
+        with pytest.raises(ValueError):
+            await flight.do("A", failing)
+        return first
+
+    first = asyncio.run(run())
+
+    assert all(isinstance(error, ValueError) for error in first)
+    assert attempts == 2